@@ -22,13 +22,33 @@ class Config:
 
     # --- File System ---
     TEMP_DIR = "./temp_repos"
-    LOCAL_MODEL_DIR = "/Users/iyeonglag/PycharmProjects/2025-2-CSC4004-1-3-Fithub/models/RepoGraph"
+    CACHE_DIR = os.getenv("FITHUB_CACHE_DIR", "./cache")
+    LOCAL_MODEL_DIR = os.getenv("LOCAL_MODEL_DIR", "./models/RepoGraph") # RepoGraph checkout (선택)
 
     # [Retry Strategy]
     MAX_RETRIES = 1
     RETRY_DELAY = 1.0 # seconds
     MAX_ANALYSIS_FILES = 50 # Reduced for testing (was 10000)
 
+    # [File Selection] .gitignore/.fithubignore + size/binary/generated filters
+    MAX_FILE_SIZE_BYTES = int(os.getenv("MAX_FILE_SIZE_BYTES", 512 * 1024))
+
+    # [Analysis Budget] 요약/임베딩 스테이지가 공유하는 중요도 기반 파일 선택
+    # MAX_ANALYSIS_FILES는 상한선으로만 사용되고, 실제 선택은 예상 소요 시간(초) 예산을 따릅니다.
+    ANALYSIS_EXTENSIONS = {'.py', '.js', '.ts', '.java', '.go', '.cpp', '.c', '.cs', '.rs'}
+    ANALYSIS_TIME_BUDGET = float(os.getenv("ANALYSIS_TIME_BUDGET", 300.0))
+
+    # [Tree-sitter] 구조 분석/임베딩 공용 문법 (language pack 우선, 없으면 직접 빌드한 라이브러리)
+    USE_TREE_SITTER = os.getenv("USE_TREE_SITTER", "true").lower() == "true"
+    TREE_SITTER_LIB_PATH = os.getenv("TREE_SITTER_LIB_PATH", "build/my-languages.so")
+
+    # [Regex Fallback Parser] 파일당 정규식 스캔 시간 상한 (초)
+    REGEX_PARSE_TIME_LIMIT = float(os.getenv("REGEX_PARSE_TIME_LIMIT", 2.0))
+
+    # [AST Linearization] 임베딩 입력의 구조 문자열 예산 (생략할 노드 타입은 tree_sitter_utils.DEFAULT_SKIP_TYPES)
+    EMBED_AST_MAX_CHARS = 512
+    EMBED_AST_NAMED_ONLY = False # True면 괄호/구두점 같은 익명 노드 생략 (같은 예산에 더 많은 구조)
+
     # --- Settings ---
     TIMEOUT = 60.0
 
@@ -61,3 +81,69 @@ class Config:
     USE_LOCAL_LLM = True # Force Local Mistral/Gemma
     USE_LOCAL_SUMMARIZER = True # Force Local CodeT5
     USE_ROLE_BASED_ENSEMBLE = False # Disable API-heavy features
+    USE_HIERARCHICAL_SUMMARY = True # 함수/클래스 청크 요약 -> 요약의 요약 (긴 파일 전체 커버)
+
+    # [Hierarchical Summary] 청크 하나의 최대 길이(문자)와 로컬 모델 배치 크기
+    SUMMARY_CHUNK_CHARS = 1500
+    SUMMARY_BATCH_SIZE = 8
+
+    # [Summary Cache] (hash(code), model_id, prompt_type, prompt_version) 키, LRU + TTL
+    USE_SUMMARY_CACHE = True
+    SUMMARY_CACHE_PATH = os.path.join(CACHE_DIR, "summaries.sqlite")
+    SUMMARY_CACHE_MAX_ENTRIES = 200_000
+    SUMMARY_CACHE_TTL = 30 * 24 * 3600 # seconds
+
+    # [Chunked Embedding] 함수/클래스 청크별 벡터 + Pooled 파일 벡터
+    USE_CHUNKED_EMBEDDING = True
+    EMBED_CHUNK_CHARS = 1000
+    EMBED_BATCH_SIZE = 8
+
+    # [Embedding Circuit Breaker] 연속 실패 N회면 COOLDOWN초 동안 API 호출 없이 hashing 폴백 (이후 1건으로 재시도)
+    EMBED_BREAKER_FAILURES = 3
+    EMBED_BREAKER_COOLDOWN = 30.0 # seconds
+
+    # [Embedding Cache] 콘텐츠 해시 키, 메모리 LRU + 디스크 float32 저장소
+    USE_EMBED_CACHE = True
+    EMBED_CACHE_PATH = os.path.join(CACHE_DIR, "embeddings.sqlite")
+    EMBED_CACHE_MAX_ENTRIES = 500_000
+    EMBED_CACHE_MEMORY_ENTRIES = 20_000
+
+    # [Graph Cache] RepoGraph 파일별 태그 + 파일 해시 매니페스트별 코드 그래프/PageRank
+    USE_GRAPH_CACHE = True
+    GRAPH_CACHE_PATH = os.path.join(CACHE_DIR, "repograph.sqlite")
+    GRAPH_CACHE_MAX_ENTRIES = 200_000
+
+    # [PageRank] SciPy CSR 엔진 (이전 실행 벡터로 warm start), 진입점 시드 personalized PageRank 여부
+    PAGERANK_TOL = 1.0e-6
+    PAGERANK_MAX_ITER = 100
+    PAGERANK_SEED_ENTRY_POINTS = os.getenv("PAGERANK_SEED_ENTRY_POINTS", "false").lower() == "true"
+
+    # [Importance] 구조 그래프(imports + calls) 기반 내장 중요도, RepoGraph는 있으면 보정용으로만 혼합
+    IMPORTANCE_PAGERANK_WEIGHT = 0.7 # PageRank vs 가중 진입 차수
+    USE_REPOGRAPH = os.getenv("USE_REPOGRAPH", "true").lower() == "true"
+    REPOGRAPH_IMPORTANCE_WEIGHT = 0.5 # 내장 점수와 RepoGraph 점수의 혼합 비율
+
+    # [Layout] 서버 측 좌표 사전 계산 (방사형 트리 + NumPy force 보정), 이전 좌표는 그래프 캐시에 저장
+    USE_SERVER_LAYOUT = os.getenv("USE_SERVER_LAYOUT", "true").lower() == "true"
+    LAYOUT_MAX_ITER = 100
+    LAYOUT_REPULSION_WINDOW = 8 # 근거리 반발력 이웃 창 크기
+
+    # [LOD] 대형 저장소용 디렉토리 계층 클러스터 뷰: 첫 응답은 노드 수가 이 값 이하인 가장 깊은 레벨
+    LOD_MAX_NODES = 300
+
+    # [Result API] 하위 리소스 커서 페이지네이션 크기, 응답 압축 최소 크기 (bytes)
+    RESULT_PAGE_SIZE = 500
+    RESULT_MAX_PAGE_SIZE = 5000
+    RESPONSE_COMPRESS_MIN_SIZE = 1024
+
+    # [Artifact] 도구가 저장하는 최종 결과 형식: json (indent=2) / compact.json / msgpack (문자열 사전 + 열 저장 그래프)
+    ARTIFACT_FORMAT = os.getenv("ARTIFACT_FORMAT", "json").lower()
+
+    # [Diff] 저장소별 최신 아티팩트를 보관하고, 재분석 시 변경분(diff)만 적용/기록
+    TRACK_ARTIFACT_DIFFS = os.getenv("TRACK_ARTIFACT_DIFFS", "true").lower() == "true"
+    ARTIFACT_STORE_DIR = os.getenv("ARTIFACT_STORE_DIR", "results/repos")
+    DIFF_IMPORTANCE_THRESHOLD = 0.05 # 보고할 최소 importance 변화량
+
+    # [Logical Edges] 규칙 기반 계층 판별 + 같은 stem 파일 간 계층 엣지 규칙 (프리셋: default, spring - Java/Spring 저장소는 "default,spring")
+    LAYER_RULE_PRESETS = [p.strip() for p in os.getenv("LAYER_RULE_PRESETS", "default").split(",") if p.strip()]
+    LAYER_RULES_FILE = os.getenv("LAYER_RULES_FILE") # 추가/덮어쓰기 규칙 JSON (layers, patterns, stem_extensions, stem_suffixes, flows)
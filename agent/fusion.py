@@ -3,27 +3,43 @@ agent/fusion.py
 Data Fusion Logic: Combines Text, Vector, and Structure.
 """
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
+
+from shared.graph_utils import CompactGraph
 
 logger = logging.getLogger(__name__)
 
 def fuse_data(
     summaries: List[Dict[str, Any]],
     embeddings: List[Dict[str, Any]],
-    raw_graph: Dict[str, Any]
+    raw_graph: Union[CompactGraph, Dict[str, Any]]
 ) -> Dict[str, Any]:
     """
     3가지 소스를 하나로 합쳐서 '강화된 노드 데이터'를 생성합니다.
+
+    구조 엣지는 dict로 풀지 않고 CompactGraph의 EdgeTable을 그대로 전달합니다
+    (GraphBuilder가 직접 순회, dict 변환은 최종 직렬화 시점에만).
     """
     try:
+        graph = CompactGraph.from_dict(raw_graph)
         fused_nodes = []
 
         # 1. 빠른 검색을 위한 매핑 (ID 기준)
-        # embeddings는 [{"id":..., "vector":...}] 형태
+        # embeddings는 [{"id":..., "embedding":..., "embedding_backend":...}] 형태
         embed_map = {item['id']: item['embedding'] for item in embeddings if 'id' in item}
-
-        # raw_graph['nodes']는 AST에서 나온 파일/함수 정보
-        ast_nodes_map = {node['id']: node for node in raw_graph.get('nodes', [])}
+        # 벡터를 만든 백엔드 ("unixcoder" | "hashing") - hashing 벡터는 하위 단계에서 제외/감쇠
+        backend_map = {item['id']: item.get('embedding_backend') for item in embeddings if 'id' in item}
+
+        # graph.nodes는 AST에서 나온 파일/함수 정보 (ID -> NodeRecord)
+        ast_nodes_map = graph.nodes
+
+        # [Hierarchical Summary] 파일 요약의 청크 요약 (file::name -> summary)
+        child_summary_map = {
+            child['code_id']: child
+            for item in summaries
+            for child in item.get('children', [])
+            if child.get('code_id')
+        }
 
         # 2. Summaries를 기준으로 메인 루프 (요약된 파일이 핵심이므로)
         for summary_item in summaries:
@@ -43,9 +59,12 @@ def fuse_data(
 
                 # Vector Info (Numbers) - GNN Input
                 "embedding": embed_map.get(node_id, []),
+                "embedding_backend": backend_map.get(node_id),
 
                 # Structural Info (AST)
                 "complexity": ast_info.get('complexity', 0),
+                "nesting_depth": ast_info.get('nesting_depth', 0),
+                "loc": ast_info.get('loc', 0),
                 "label": ast_info.get('label', node_id.split('/')[-1]),
 
                 # Meta Info (Placeholders for next phases)
@@ -59,18 +78,27 @@ def fuse_data(
         # 이미 추가된 파일 노드는 제외하고, 하위 노드만 추가
         existing_ids = {n['id'] for n in fused_nodes}
         
-        for ast_node in raw_graph.get('nodes', []):
-            nid = ast_node['id']
+        for ast_node in graph.nodes.values():
+            nid = ast_node.id
             if nid not in existing_ids:
-                # [NEW] Hybrid Analysis for Functions (Static > Local SLM > Mock)
+                # [NEW] Hybrid Analysis for Functions (Hierarchical > Static > Local SLM > Mock)
                 func_name = ast_node.get('label', nid.split('::')[-1])
                 docstring = ast_node.get('docstring', '').strip()
                 args = ast_node.get('args', [])
                 
                 summary_details = {}
                 summary_text = ""
+                child_summary = child_summary_map.get(nid)
 
-                if docstring:
+                if child_summary:
+                    # 0. Hierarchical Summary (실제 코드 청크를 요약한 결과 재사용)
+                    summary_text = child_summary.get('text', '')
+                    summary_details = {
+                        "logic": summary_text,
+                        "intent": docstring or "Derived from the hierarchical file summary.",
+                        "structure": f"Arguments: {', '.join(args) if args else 'None'}"
+                    }
+                elif docstring:
                     # 1. Static Analysis (Docstring)
                     summary_text = f"[Docstring] {docstring}"
                     summary_details = {
@@ -128,28 +156,24 @@ def fuse_data(
                     "summary_text": summary_text,
                     "summary_details": summary_details,
                     "embedding": embed_map.get(nid, []), # 임베딩이 있다면 매핑
+                    "embedding_backend": backend_map.get(nid),
                     "complexity": ast_node.get('complexity', 1),
+                    "nesting_depth": ast_node.get('nesting_depth', 0),
                     "layer": "Unknown", # 나중에 부모 파일의 레이어를 상속받거나 별도 분석
                     "tags": []
                 })
 
-        # 4. 엣지 데이터 정제 (AST Raw Edges)
-        formatted_edges = []
-        for edge in raw_graph.get('edges', []):
-            formatted_edges.append({
-                "source": edge['source'],
-                "target": edge['target'],
-                "type": edge.get('relation', 'related')
-            })
+        # 4. 엣지 데이터 (AST Raw Edges, 관계 이름은 GraphBuilder에서 type으로 사용)
+        edges = graph.edges
 
-        logger.info(f"Fused {len(fused_nodes)} nodes and {len(formatted_edges)} edges.")
+        logger.info(f"Fused {len(fused_nodes)} nodes and {len(edges)} edges.")
 
         return {
             "nodes": fused_nodes,
-            "edges": formatted_edges,
+            "edges": edges,
             "metadata": {
                 "total_files": len(fused_nodes),
-                "total_edges": len(formatted_edges)
+                "total_edges": len(edges)
             }
         }
     except Exception as e:
@@ -7,13 +7,17 @@ import uuid
 import shutil
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any
-from fastapi import FastAPI, BackgroundTasks, HTTPException
+from typing import Dict, Any, List, Optional
+from fastapi import FastAPI, BackgroundTasks, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
 
 from .state import AgentState
 from .schemas import AnalyzeRequest, AnalyzeResponse, ResultResponse
 from .workflow import get_workflow
 from .config import Config
+from .result_views import (
+    InvalidCursor, edges_for_nodes, etag_matches, filter_nodes, make_etag, paginate
+)
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -29,8 +33,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# 응답 압축: brotli-asgi가 있으면 Brotli (gzip 폴백 포함), 없으면 gzip
+try:
+    from brotli_asgi import BrotliMiddleware
+    app.add_middleware(BrotliMiddleware, minimum_size=Config.RESPONSE_COMPRESS_MIN_SIZE)
+except ImportError:
+    from fastapi.middleware.gzip import GZipMiddleware
+    app.add_middleware(GZipMiddleware, minimum_size=Config.RESPONSE_COMPRESS_MIN_SIZE)
+
 @app.on_event("startup")
 async def startup_event():
     import os
@@ -123,15 +136,49 @@ async def analyze(request: AnalyzeRequest, bg_tasks: BackgroundTasks):
 
     return AnalyzeResponse(run_id=run_id, status="queued")
 
+def _etag(request: Request, run_id: str) -> str:
+    """실행 버전(updated_at) + 경로 + 쿼리로 만든 ETag (본문을 만들기 전에 비교)"""
+    info = execution_store[run_id]
+    query = sorted(request.query_params.multi_items())
+    return make_etag(run_id, info["status"], info.get("updated_at"), request.url.path, query)
+
+def _conditional_json(request: Request, run_id: str, build) -> Response:
+    """If-None-Match가 맞으면 304, 아니면 build()의 결과를 그대로 JSON 응답 (pydantic 검증 생략)"""
+    etag = _etag(request, run_id)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(build(), headers=headers)
+
+def _completed_info(run_id: str) -> Dict[str, Any]:
+    if run_id not in execution_store:
+        raise HTTPException(status_code=404, detail="Run ID not found")
+
+    info = execution_store[run_id]
+    if info["status"] != "completed" or not info.get("result"):
+        raise HTTPException(status_code=409, detail=f"Run is {info['status']}")
+    return info
+
+def _page(items: List[Any], cursor: Optional[str], limit: Optional[int]) -> Dict[str, Any]:
+    limit = min(limit or Config.RESULT_PAGE_SIZE, Config.RESULT_MAX_PAGE_SIZE)
+    try:
+        return paginate(items, cursor, limit)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.get("/result/{run_id}", response_model=ResultResponse)
-async def get_result(run_id: str):
+async def get_result(run_id: str, request: Request, response: Response):
     """
-    실행 결과를 조회합니다.
+    실행 결과를 조회합니다. (전체 아티팩트, 큰 저장소는 하위 리소스 사용 권장)
     """
     if run_id not in execution_store:
         raise HTTPException(status_code=404, detail="Run ID not found")
 
     info = execution_store[run_id]
+    etag = _etag(request, run_id)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
 
     return ResultResponse(
         run_id=run_id,
@@ -142,6 +189,121 @@ async def get_result(run_id: str):
         updated_at=info.get("updated_at")
     )
 
+@app.get("/result/{run_id}/nodes")
+async def get_result_nodes(
+    run_id: str,
+    request: Request,
+    directory: Optional[str] = None,
+    node_type: Optional[str] = Query(None, alias="type"),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+):
+    """
+    그래프 노드를 디렉토리(하위 경로 포함)/타입으로 걸러 페이지 단위로 조회합니다.
+    """
+    graph = _completed_info(run_id)["result"].get("graph") or {}
+    return _conditional_json(
+        request, run_id, lambda: _page(filter_nodes(graph, directory, node_type), cursor, limit)
+    )
+
+@app.get("/result/{run_id}/edges")
+async def get_result_edges(
+    run_id: str,
+    request: Request,
+    node: Optional[List[str]] = Query(None),
+    relation: Optional[str] = None,
+    both_ends: bool = False,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+):
+    """
+    노드 집합(node=... 반복)에 닿는 엣지를 페이지 단위로 조회합니다. both_ends=true면 부분 그래프 엣지만.
+    """
+    graph = _completed_info(run_id)["result"].get("graph") or {}
+    return _conditional_json(
+        request, run_id, lambda: _page(edges_for_nodes(graph, node, relation, both_ends), cursor, limit)
+    )
+
+@app.get("/result/{run_id}/recommendations")
+async def get_result_recommendations(run_id: str, request: Request):
+    """
+    추천 작업만 조회합니다.
+    """
+    result = _completed_info(run_id)["result"]
+    return _conditional_json(request, run_id, lambda: {"recommendations": result.get("recommendations") or []})
+
+@app.get("/result/{run_id}/metrics")
+async def get_result_metrics(run_id: str, request: Request):
+    """
+    실행 지표(커버리지 등)만 조회합니다.
+    """
+    result = _completed_info(run_id)["result"]
+    return _conditional_json(request, run_id, lambda: {"metrics": result.get("metrics") or {}})
+
+@app.get("/result/{run_id}/artifact")
+async def get_result_artifact(run_id: str, request: Request, format: Optional[str] = None):
+    """
+    최종 결과를 압축 형식(문자열 사전 + 열 저장 그래프)으로 조회합니다. format: msgpack | json
+    (미지정 시 msgpack, msgpack이 설치되지 않은 서버는 json)
+    """
+    from shared.artifact_utils import MSGPACK_AVAILABLE, MSGPACK_MEDIA_TYPE, dumps_msgpack, encode_artifact
+
+    result = _completed_info(run_id)["result"]
+    if format is None:
+        format = "msgpack" if MSGPACK_AVAILABLE else "json"
+    if format == "json":
+        return _conditional_json(request, run_id, lambda: encode_artifact(result))
+    if format != "msgpack":
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+    if not MSGPACK_AVAILABLE:
+        raise HTTPException(status_code=501, detail="msgpack is not installed on the server")
+
+    etag = _etag(request, run_id)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=dumps_msgpack(result), media_type=MSGPACK_MEDIA_TYPE, headers=headers)
+
+@app.get("/result/{run_id}/diff")
+async def get_result_diff(run_id: str, request: Request, base: str, importance_threshold: Optional[float] = None):
+    """
+    base 실행 대비 변경분(노드/엣지/중요도/추천)을 조회합니다.
+    """
+    from shared.diff_utils import diff_artifacts
+
+    result = _completed_info(run_id)["result"]
+    base_result = _completed_info(base)["result"]
+    threshold = Config.DIFF_IMPORTANCE_THRESHOLD if importance_threshold is None else importance_threshold
+    return _conditional_json(
+        request, run_id, lambda: {"run_id": run_id, "base_run_id": base, **diff_artifacts(base_result, result, threshold)}
+    )
+
+def _get_lod(run_id: str):
+    """완료된 실행의 LOD 인덱스 (첫 요청 시 구축 후 실행 스토어에 보관)"""
+    info = _completed_info(run_id)
+    if "lod" not in info:
+        from mcp.graph_analysis.lod import GraphLOD
+        info["lod"] = GraphLOD(info["result"].get("graph") or {}, max_nodes=Config.LOD_MAX_NODES)
+    return info["lod"]
+
+@app.get("/result/{run_id}/graph")
+async def get_graph_view(run_id: str, request: Request, level: Optional[int] = None):
+    """
+    디렉토리 계층으로 접힌 그래프 뷰를 조회합니다. (level 생략 시 coarse 레벨)
+    """
+    lod = _get_lod(run_id)
+    return _conditional_json(request, run_id, lambda: lod.view(level))
+
+@app.get("/result/{run_id}/graph/expand")
+async def expand_graph_node(run_id: str, request: Request, node: str, level: Optional[int] = None):
+    """
+    클러스터 노드를 한 단계 펼칩니다. level은 클라이언트가 보고 있는 뷰의 레벨입니다.
+    """
+    lod = _get_lod(run_id)
+    if node not in lod.nodes:
+        raise HTTPException(status_code=404, detail=f"Node not found: {node}")
+    return _conditional_json(request, run_id, lambda: lod.expand(node, level))
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "timestamp": datetime.utcnow()}
@@ -14,7 +14,8 @@ from sklearn.metrics.pairwise import cosine_similarity
 from .state import AgentState, log_node_execution
 from .config import Config
 from .fusion import fuse_data
-from .utils import save_mcp_result
+from .utils import save_mcp_result, update_repo_artifact
+from shared.budget_utils import plan_analysis
 
 logger = logging.getLogger(__name__)
 
@@ -53,7 +54,7 @@ async def fetch_from_backend_node(state: AgentState) -> Dict[str, Any]:
                     ignore=shutil.ignore_patterns('.git', '.venv', '__pycache__', '*.pyc', '.DS_Store', 'temp_repos', 'brain')
                 )
                 log_node_execution(state, "ingest", "success", time.time() - start_time)
-                return {"repo_path": str(temp_dir)}
+                return {"repo_path": str(temp_dir), "analysis_plan": _plan_analysis(state, temp_dir)}
             else:
                 logger.warning(f"Provided local_path {local_path} does not exist. Falling back to mock.")
 
@@ -84,12 +85,31 @@ async def fetch_from_backend_node(state: AgentState) -> Dict[str, Any]:
                 file.write(f['content'])
 
         log_node_execution(state, "ingest", "success", time.time() - start_time)
-        return {"repo_path": str(temp_dir)}
+        return {"repo_path": str(temp_dir), "analysis_plan": _plan_analysis(state, temp_dir)}
 
     except Exception as e:
         logger.error(f"Ingest failed: {e}")
         return {"error_message": str(e)}
 
+def _plan_analysis(state: AgentState, repo_path: Path) -> Dict[str, Any]:
+    """[Budget Plan] 요약/임베딩 스테이지가 공유할 파일 집합을 한 번만 결정합니다."""
+    options = state.get("options", {}) or {}
+    budget = float(options.get("time_budget", Config.ANALYSIS_TIME_BUDGET))
+    max_files = options.get("max_files", Config.MAX_ANALYSIS_FILES)
+    try:
+        return plan_analysis(str(repo_path), Config.ANALYSIS_EXTENSIONS, budget,
+                             max_files=max_files, max_file_size=Config.MAX_FILE_SIZE_BYTES)
+    except Exception as e:
+        logger.warning(f"Budget planning failed: {e}. Stages will plan independently.")
+        return {}
+
+def _planned_files(state: AgentState) -> List[str]:
+    """Ingest 단계의 계획이 없으면(직접 호출 등) 여기서 계획합니다."""
+    plan = state.get("analysis_plan") or {}
+    if "files" not in plan:
+        plan = _plan_analysis(state, Path(state["repo_path"]))
+    return plan.get("files", [])
+
 def _get_mock_files():
     """테스트용 가상 파일 데이터"""
     return [
@@ -119,7 +139,7 @@ async def summarize_node(state: AgentState) -> Dict[str, Any]:
         # [Selective Retry Logic]
         target_ids = state.get("target_files") # Orchestrator가 지정한 재분석 리스트
         
-        res = summ.summarize_repository(state["repo_path"], target_ids=target_ids)
+        res = summ.summarize_repository(state["repo_path"], target_ids=target_ids, planned_ids=_planned_files(state))
 
         summaries = res.get("file_summaries", [])
         save_mcp_result(state.get("run_id", "default"), "summarization", summaries)
@@ -151,14 +171,15 @@ async def embed_code_node(state: AgentState) -> Dict[str, Any]:
         repo_path = Path(state.get("repo_path"))
         snippets = []
 
-        # 실제 파일 읽기 (Config 제한 적용)
-        py_files = list(repo_path.rglob("*.py"))[:Config.MAX_ANALYSIS_FILES]
-        for py_file in py_files:
+        # 실제 파일 읽기 (요약 스테이지와 동일한 예산 계획 적용)
+        for file_id in _planned_files(state):
             try:
-                with open(py_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    code = f.read()[:1000] # 너무 긴 코드는 자름
+                with open(repo_path / file_id, 'r', encoding='utf-8', errors='ignore') as f:
+                    code = f.read()
+                    if not Config.USE_CHUNKED_EMBEDDING:
+                        code = code[:1000] # 너무 긴 코드는 자름
                     snippets.append({
-                        "id": str(py_file.relative_to(repo_path)).replace("\\", "/"),
+                        "id": file_id,
                         "code": code
                     })
             except Exception:
@@ -167,14 +188,15 @@ async def embed_code_node(state: AgentState) -> Dict[str, Any]:
         if not snippets:
             return {"embeddings": []}
 
-        # API 호출
-        results = embedder.batch_embed(snippets, model_name="graphcodebert")
+        # API 호출 (Chunked: 청크별 벡터 + Pooled 파일 벡터)
+        if Config.USE_CHUNKED_EMBEDDING:
+            results = embedder.batch_embed_chunked(snippets)
+        else:
+            results = embedder.batch_embed(snippets, model_name="graphcodebert")
 
         # 결과 포맷팅
-        embeddings = []
-        for r in results:
-            if r.get("embedding"):
-                embeddings.append({"id": r["id"], "embedding": r["embedding"]})
+        embeddings = [r for r in results if r.get("embedding")]
+        logger.info(f"Embedding cache: {embedder.cache_stats()}")
 
         log_node_execution(state, "embed_code", "success", time.time() - start_time)
         save_mcp_result(state.get("run_id", "default"), "embedding", embeddings)
@@ -212,22 +234,31 @@ async def evaluate_node(state: AgentState) -> Dict[str, Any]:
         # 1. 평가를 위한 기본 점수 계산 (Cosine Sim) - 기존 로직 유지
         # (Orchestrator 내부에서 할 수도 있지만, 여기서 계산해서 넘겨주는 구조가 데이터 흐름상 깔끔함)
         from mcp.semantic_embedding.embedder import create_embedder
+        from mcp.semantic_embedding.hashing import HASHING_BACKEND
         try:
             embedder = create_embedder(device="cpu")
-            total_sim = 0
-            count = 0
+            scorable = []
             for node in nodes:
                 summary = node.get("summary_text", "")
                 code_vec = node.get("embedding", [])
                 
                 if summary and code_vec and len(summary) > 5:
-                    sum_vec = embedder._generate_embedding(summary, "graphcodebert")
-                    sim = cosine_similarity([code_vec], [sum_vec])[0][0]
-                    node['quality_score'] = float(sim)
-                    total_sim += sim
-                    count += 1
+                    scorable.append(node)
                 else:
                     node['quality_score'] = 0.5
+
+            # 요약 임베딩은 한 번에 배치 처리 (변경 없는 요약은 refine 루프에서 캐시 적중)
+            if scorable:
+                sum_vecs = embedder.embed_texts([n["summary_text"] for n in scorable], with_backend=True)
+                for node, (sum_vec, sum_backend) in zip(scorable, sum_vecs):
+                    if node.get("embedding_backend") == HASHING_BACKEND or sum_backend == HASHING_BACKEND:
+                        # Degraded mode 벡터의 유사도는 의미가 없으므로 중립 점수 (Orchestrator가 제외)
+                        node['quality_score'] = 0.5
+                        node['quality_scored'] = False
+                        continue
+                    sim = cosine_similarity([node["embedding"]], [sum_vec])[0][0]
+                    node['quality_score'] = float(sim)
+                    node['quality_scored'] = True
         except Exception as e:
             logger.warning(f"Score calculation failed (skipping): {e}")
 
@@ -294,7 +325,8 @@ async def generate_graph_node(state: AgentState) -> Dict[str, Any]:
 
         visualizer = create_visualizer()
         # Visualizer MCP가 RepoGraph 중요도 계산 및 색상/크기 로직을 전담함
-        graph_json = visualizer.build_graph(nodes, edges, ctx, repo_path=repo_path)
+        repo_id = state.get("repo_input", {}).get("repo_id") # 캐시(레이아웃/PageRank) 실행 간 공유 키
+        graph_json = visualizer.build_graph(nodes, edges, ctx, repo_path=repo_path, repo_id=repo_id)
 
         log_node_execution(state, "generate_graph", "success", time.time() - start_time)
         return {"final_graph_json": graph_json}
@@ -339,6 +371,13 @@ async def synthesize_node(state: AgentState) -> Dict[str, Any]:
             }
         }
 
+        # 증분 재분석: 저장소별 최신 아티팩트에 변경분만 적용하고 변경 요약을 첨부
+        repo_id = state.get("repo_input", {}).get("repo_id")
+        if Config.TRACK_ARTIFACT_DIFFS and repo_id:
+            changes = update_repo_artifact(repo_id, state.get("run_id", "default"), final_artifact)
+            if changes:
+                final_artifact["changes"] = changes
+
         log_node_execution(state, "synthesize", "success", time.time() - start_time)
         return {"final_artifact": final_artifact, "status": "completed"}
 
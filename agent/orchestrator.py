@@ -32,6 +32,13 @@ class Orchestrator:
             return {"decision": "refine", "retry_mode": "partial", "target_files": missing_ids}
 
         # 2. Calculate Metrics & Systemic Check
+        # Degraded mode(hashing) 벡터로 계산된 점수는 품질 신호가 아니므로 제외
+        scored_nodes = [n for n in nodes if n.get("quality_scored", True)]
+        if not scored_nodes:
+            logger.warning("Embedding model unavailable for all nodes; skipping similarity quality gate.")
+            return {"decision": "pass", "retry_mode": "none", "reason": "Degraded embeddings only."}
+        nodes = scored_nodes
+
         avg_score = self._calculate_average_score(nodes)
         state["metrics"]["consistency_score"] = avg_score
 
@@ -0,0 +1,117 @@
+"""
+agent/result_views.py
+Sub-resource views over a completed final_artifact: filtered nodes/edges, cursor pagination, ETags.
+
+GET /result/{run_id}가 아티팩트 전체를 한 번에 직렬화하지 않도록,
+필요한 부분만 잘라서 반환하기 위한 순수 함수 모음입니다 (FastAPI 의존 없음).
+"""
+import base64
+from typing import Any, Dict, Iterable, List, Optional
+
+from shared.cache_utils import content_hash
+
+
+class InvalidCursor(ValueError):
+    """잘못된 페이지네이션 커서"""
+
+
+def encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(f"o:{offset}".encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        prefix, offset = raw.split(":", 1)
+        if prefix != "o" or int(offset) < 0:
+            raise ValueError(raw)
+        return int(offset)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def paginate(items: List[Any], cursor: Optional[str] = None, limit: int = 500) -> Dict[str, Any]:
+    """
+    커서 기반 페이지네이션.
+
+    결과가 완료 후 바뀌지 않으므로 커서는 필터링된 목록의 오프셋을 감싼 불투명 토큰입니다.
+
+    Returns:
+        {"items", "total", "next_cursor"} (마지막 페이지면 next_cursor는 None)
+    """
+    offset = decode_cursor(cursor)
+    limit = max(1, limit)
+    page = items[offset:offset + limit]
+    end = offset + len(page)
+    return {
+        "items": page,
+        "total": len(items),
+        "next_cursor": encode_cursor(end) if end < len(items) else None,
+    }
+
+
+def _in_directory(node_id: str, directory: str) -> bool:
+    path = node_id.split("::")[0]
+    return path == directory or path.startswith(directory + "/")
+
+
+def filter_nodes(
+    graph: Dict[str, Any],
+    directory: Optional[str] = None,
+    node_type: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    디렉토리(하위 경로 포함)/노드 타입으로 노드를 거릅니다.
+
+    Args:
+        directory: "agent" 또는 "mcp/graph_analysis" 같은 경로 접두사
+        node_type: "file", "function", "class", "directory" 등
+    """
+    directory = directory.strip("/") if directory else None
+    nodes = graph.get("nodes") or []
+    return [
+        node for node in nodes
+        if (not node_type or node.get("type") == node_type)
+        and (not directory or _in_directory(node["id"], directory))
+    ]
+
+
+def edges_for_nodes(
+    graph: Dict[str, Any],
+    node_ids: Optional[Iterable[str]] = None,
+    relation: Optional[str] = None,
+    both_ends: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    노드 집합에 닿는 엣지를 반환합니다.
+
+    Args:
+        node_ids: 노드 ID 집합 (None이면 전체)
+        relation: 관계 필터 ("imports", "calls", "structure" 등, 병합 엣지는 relations 중 하나와 일치)
+        both_ends: True면 양 끝이 모두 집합 안에 있는 엣지만 (부분 그래프)
+    """
+    selected = set(node_ids) if node_ids is not None else None
+    result = []
+    for edge in graph.get("edges") or []:
+        if relation and relation not in (edge.get("relations") or (edge.get("type"),)):
+            continue
+        if selected is not None:
+            hits = (edge.get("source") in selected) + (edge.get("target") in selected)
+            if hits < (2 if both_ends else 1):
+                continue
+        result.append(edge)
+    return result
+
+
+def make_etag(*parts: Any) -> str:
+    """결과 버전 + 요청 파라미터로 만든 강한 ETag (본문 직렬화 전에 비교 가능)"""
+    return '"' + content_hash(*(str(part) for part in parts))[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
@@ -10,11 +10,12 @@ class AgentState(TypedDict, total=False):
     repo_path: str              # Ingest 노드가 채워줄 경로
     options: Dict[str, Any]
     retry_count: int
+    analysis_plan: Dict[str, Any]  # [Budget Plan] 요약/임베딩 공통 파일 집합 (Ingest에서 결정)
 
     # --- Phase 1: Parallel Results ---
     initial_summaries: List[Dict]
     embeddings: List[Dict]
-    code_graph_raw: Dict        # AST 결과
+    code_graph_raw: Any         # AST 결과 (shared.graph_utils.CompactGraph)
 
     # --- Phase 2: Fused ---
     fused_data_package: Dict    # [New] Fusion 결과물
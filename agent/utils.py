@@ -1,8 +1,10 @@
 import json
 import os
+import re
 import logging
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from .config import Config
 
 logger = logging.getLogger(__name__)
@@ -14,9 +16,13 @@ def save_mcp_result(run_id: str, component: str, data: Any) -> None:
     Args:
         run_id: The unique ID of the current analysis run.
         component: The name of the component (e.g., 'summarization', 'structural').
-        data: The data to save (usually a dict or list).
+        data: The data to save (usually a dict or list, or a CompactGraph).
     """
     try:
+        # 압축 그래프 컨테이너는 저장 시점에만 dict로 변환
+        if hasattr(data, "to_dict"):
+            data = data.to_dict()
+
         # Define result directory: project_root/results/{run_id}
         # Assuming Config.TEMP_DIR or similar is available, or just use a 'results' dir in root
         result_dir = Path("results") / run_id
@@ -31,3 +37,57 @@ def save_mcp_result(run_id: str, component: str, data: Any) -> None:
         
     except Exception as e:
         logger.error(f"Failed to save {component} result: {e}")
+
+def update_repo_artifact(repo_id: str, run_id: str, artifact: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    저장소별 최신 아티팩트를 증분 갱신합니다.
+
+    새 아티팩트를 latest.*에 그대로 쓰고, 이전 아티팩트가 있으면 diff를 diffs/{run_id}.json에 기록으로 남깁니다.
+    변경이 없으면 아무것도 쓰지 않습니다.
+
+    Returns:
+        {"base_run_id", "summary"} 변경 요약 (첫 실행이거나 실패하면 None)
+    """
+    from shared.artifact_utils import save_artifact
+    from shared.diff_utils import diff_artifacts, load_run
+
+    try:
+        repo_dir = Path(Config.ARTIFACT_STORE_DIR) / re.sub(r"[^A-Za-z0-9._-]", "_", repo_id)
+        repo_dir.mkdir(parents=True, exist_ok=True)
+        meta_path = repo_dir / "latest.meta.json"
+        latest_path = repo_dir / f"latest.{Config.ARTIFACT_FORMAT}"
+        meta = json.loads(meta_path.read_text(encoding="utf-8")) if meta_path.exists() else {}
+
+        try:
+            previous = load_run(repo_dir)
+        except FileNotFoundError:
+            previous = None
+
+        changes = None
+        if previous is None:
+            save_artifact(latest_path, artifact)
+        else:
+            diff = diff_artifacts(previous, artifact, Config.DIFF_IMPORTANCE_THRESHOLD)
+            changes = {"base_run_id": meta.get("run_id"), "summary": diff["summary"]}
+            if diff["summary"]["unchanged"]:
+                logger.info(f"[{run_id}] Artifact unchanged since run {meta.get('run_id')}.")
+                return changes
+
+            for stale in repo_dir.glob("latest.*"):  # ARTIFACT_FORMAT이 바뀐 경우 이전 형식 파일 정리
+                if stale not in (latest_path, meta_path):
+                    stale.unlink()
+            save_artifact(latest_path, artifact)
+            diff_path = repo_dir / "diffs" / f"{run_id}.json"
+            diff_path.parent.mkdir(exist_ok=True)
+            with open(diff_path, "w", encoding="utf-8") as f:
+                json.dump({"base_run_id": meta.get("run_id"), **diff}, f, ensure_ascii=False, default=str)
+            logger.info(f"[{run_id}] Updated stored artifact: {diff['summary']}")
+
+        meta_path.write_text(
+            json.dumps({"run_id": run_id, "updated_at": datetime.utcnow().isoformat()}), encoding="utf-8"
+        )
+        return changes
+
+    except Exception as e:
+        logger.error(f"Failed to update stored artifact for {repo_id}: {e}")
+        return None
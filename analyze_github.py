@@ -5,10 +5,11 @@ import time
 import uuid
 import subprocess
 from pathlib import Path
-import json
 
+from agent.config import Config
 from agent.workflow import get_workflow
 from agent.state import AgentState
+from shared.artifact_utils import save_artifact
 
 TEMP_BASE = Path("temp_repos")
 
@@ -65,10 +66,8 @@ async def analyze_repo(repo_url: str):
     if result:
         output_dir = Path("results")
         output_dir.mkdir(exist_ok=True)
-        output_path = output_dir / f"{repo_name}_result.json"
-        
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        output_path = output_dir / f"{repo_name}_result.{Config.ARTIFACT_FORMAT}"
+        save_artifact(output_path, result)
         
         print(f"✅ Analysis Complete! Result saved to: {output_path}")
         
@@ -24,6 +24,11 @@ const CodeGraph = ({ data, onNodeClick, focusNode }) => {
     return () => window.removeEventListener("resize", updateDimensions);
   }, []);
 
+  const precomputedLayout = useMemo(() => {
+    const rawNodes = data?.graph?.nodes || [];
+    return rawNodes.length > 0 && rawNodes.every(node => typeof node.x === 'number' && typeof node.y === 'number');
+  }, [data]);
+
   const graphData = useMemo(() => {
     // 1. 데이터 존재 여부 확인
     if (!data || !data.graph) return { nodes: [], links: [] };
@@ -34,9 +39,11 @@ const CodeGraph = ({ data, onNodeClick, focusNode }) => {
     const rawLinks = data.graph.edges || data.graph.links || []; 
 
     // 2. 데이터 가공
+    // 서버에서 좌표(x, y)를 미리 계산했으면 고정 (브라우저 force simulation 생략)
     const nodes = rawNodes.map(node => ({ 
       ...node, 
-      val: node.size ? Math.sqrt(node.size) / 2 : 5 
+      val: node.size ? Math.sqrt(node.size) / 2 : 5,
+      ...(precomputedLayout ? { fx: node.x, fy: node.y } : {})
     }));
     
     const links = rawLinks.map(edge => ({ ...edge }));
@@ -55,7 +62,7 @@ const CodeGraph = ({ data, onNodeClick, focusNode }) => {
       node.neighbors = neighbors.get(node.id) || [];
     });
     return { nodes, links };
-  }, [data]);
+  }, [data, precomputedLayout]);
 
   // 검색 줌인
   useEffect(() => {
@@ -96,7 +103,8 @@ const CodeGraph = ({ data, onNodeClick, focusNode }) => {
         graphData={graphData}
 
         d3VelocityDecay={0.3}
-        warmupTicks={100}
+        warmupTicks={precomputedLayout ? 0 : 100}
+        cooldownTicks={precomputedLayout ? 0 : Infinity}
 
         backgroundColor="#1a1a1a"
         
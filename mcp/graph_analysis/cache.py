@@ -0,0 +1,190 @@
+"""
+mcp/graph_analysis/cache.py
+Persistent RepoGraph cache: per-file tags + per-manifest code graph / PageRank + last layout.
+
+- 파일 태그: (저장소 식별자, 상대 경로, 내용 해시) 키 -> 바뀐 파일만 다시 태깅
+- 그래프 결과: (저장소 식별자, 파일 해시 매니페스트) 키 -> 저장소가 그대로면 그래프 구축/PageRank 전체 생략
+- 코드 그래프: (저장소 식별자, 파일 해시 매니페스트) 키 -> PageRank 설정만 바뀌었거나 결과 항목이 밀려난 경우 그래프 재구축 생략
+- 마지막 PageRank: 저장소 식별자 키 -> 일부 파일만 바뀐 경우 warm start
+- 마지막 레이아웃: 저장소 식별자 키 -> 기존 노드 좌표 유지, 새 노드만 배치
+
+ingest는 실행마다 새 임시 폴더(TEMP_DIR/run_id)에 저장소를 복사하므로, 실행 간 공유되는 항목은
+repo_identity()(repo_id 우선)로 키를 만듭니다. 태그/그래프 노드의 절대 경로(fname)는 읽을 때 현재 저장소 경로 기준으로 다시 씁니다.
+"""
+import hashlib
+import logging
+import os
+import pickle
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from agent.config import Config
+from shared.cache_utils import PersistentCache, content_hash
+
+logger = logging.getLogger(__name__)
+
+# 태그 추출/그래프 구성 방식이 바뀌면 올려서 기존 캐시를 무효화합니다.
+GRAPH_CACHE_VERSION = "1"
+
+
+def file_digest(path: str) -> Optional[str]:
+    """파일 내용의 SHA-1 (읽을 수 없으면 None)"""
+    h = hashlib.sha1()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 16), b""):
+                h.update(block)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+def build_manifest(files: Iterable[str], repo_path: str) -> List[Tuple[str, str]]:
+    """[(상대 경로, 내용 해시)] 정렬 목록 (저장소 리비전 식별자)"""
+    manifest = []
+    for fname in files:
+        digest = file_digest(fname)
+        if digest is not None:
+            rel = os.path.relpath(fname, repo_path).replace("\\", "/")
+            manifest.append((rel, digest))
+    manifest.sort()
+    return manifest
+
+
+def repo_identity(repo_path: str, repo_id: Optional[str] = None) -> str:
+    """실행 간에 같은 저장소를 가리키는 키 (repo_id가 없으면 저장소 절대 경로)"""
+    return f"repo:{repo_id}" if repo_id else os.path.abspath(repo_path)
+
+
+def _relocate(tag: Any, fname: str) -> Any:
+    """태그(RepoGraph Tag namedtuple 또는 dict)의 절대 경로를 현재 실행 경로로 교체"""
+    if hasattr(tag, "_replace") and hasattr(tag, "fname"):
+        return tag._replace(fname=fname)
+    if isinstance(tag, dict) and "fname" in tag:
+        return {**tag, "fname": fname}
+    return tag
+
+
+class GraphCache:
+    """RepoGraph 태그/그래프/PageRank 디스크 캐시 (값은 pickle)"""
+
+    def __init__(self, path: str = None, max_entries: int = None):
+        self.store = PersistentCache(
+            path or Config.GRAPH_CACHE_PATH,
+            max_entries=max_entries or Config.GRAPH_CACHE_MAX_ENTRIES,
+        )
+
+    def _get(self, key: str) -> Optional[Any]:
+        raw = self.store.get(key)
+        if raw is None:
+            return None
+        try:
+            return pickle.loads(raw)
+        except Exception as e:
+            logger.warning(f"Corrupt graph cache entry ignored: {e}")
+            return None
+
+    def _put(self, key: str, value: Any) -> None:
+        try:
+            self.store.put(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception as e:
+            logger.warning(f"Graph cache write failed: {e}")
+
+    @staticmethod
+    def manifest_key(repo: str, manifest: List[Tuple[str, str]], variant: str = "") -> str:
+        """
+        Args:
+            repo: repo_identity() 키
+            variant: 결과에 영향을 주는 설정 (예: PageRank personalization 방식)
+        """
+        return content_hash(
+            "manifest", GRAPH_CACHE_VERSION, repo, variant,
+            *(f"{rel}:{digest}" for rel, digest in manifest)
+        )
+
+    @staticmethod
+    def _tags_key(repo: str, rel_fname: str, digest: str) -> str:
+        return content_hash("tags", GRAPH_CACHE_VERSION, repo, rel_fname, digest)
+
+    def get_tags(self, repo: str, rel_fname: str, digest: str, repo_path: Optional[str] = None) -> Optional[list]:
+        """
+        Args:
+            repo: repo_identity() 키
+            repo_path: 현재 실행의 저장소 경로 (주어지면 태그의 fname을 join(repo_path, rel_fname)으로 교체)
+        """
+        tags = self._get(self._tags_key(repo, rel_fname, digest))
+        if tags is None or not repo_path:
+            return tags
+        fname = os.path.join(repo_path, rel_fname)
+        return [_relocate(tag, fname) for tag in tags]
+
+    def put_tags(self, repo: str, rel_fname: str, digest: str, tags: list) -> None:
+        self._put(self._tags_key(repo, rel_fname, digest), tags)
+
+    def get_result(self, manifest_key: str) -> Optional[Dict[str, Any]]:
+        """{"pagerank": {노드: 점수}, "file_importance": {상대 경로: 0~1}}"""
+        return self._get(content_hash("result", manifest_key))
+
+    def put_result(self, manifest_key: str, result: Dict[str, Any]) -> None:
+        self._put(content_hash("result", manifest_key), result)
+
+    def get_graph(self, repo: str, manifest: List[Tuple[str, str]], repo_path: Optional[str] = None):
+        """
+        매니페스트별 코드 그래프 (PageRank 설정과 무관한 키).
+
+        Args:
+            repo_path: 현재 실행의 저장소 경로 (주어지면 노드 fname을 join(repo_path, 상대 경로)로 복원)
+        """
+        G = self._get(content_hash("graph", self.manifest_key(repo, manifest)))
+        if G is not None and repo_path:
+            for _, data in G.nodes(data=True):
+                if data.get("fname"):
+                    data["fname"] = os.path.join(repo_path, data["fname"])
+        return G
+
+    def put_graph(self, repo: str, manifest: List[Tuple[str, str]], G, repo_path: str) -> None:
+        """노드 fname을 repo_path 기준 상대 경로로 바꾼 사본을 저장합니다 (실행마다 저장소 폴더가 다름)."""
+        stored = G.copy()
+        for _, data in stored.nodes(data=True):
+            if data.get("fname"):
+                data["fname"] = os.path.relpath(data["fname"], repo_path).replace("\\", "/")
+        self._put(content_hash("graph", self.manifest_key(repo, manifest)), stored)
+
+    def get_last_pagerank(self, repo: str) -> Optional[Dict[Any, float]]:
+        """저장소(repo_identity 키)의 마지막 PageRank 벡터 (증분 분석 warm start용)"""
+        return self._get(content_hash("last_pagerank", GRAPH_CACHE_VERSION, repo))
+
+    def put_last_pagerank(self, repo: str, pagerank: Dict[Any, float]) -> None:
+        self._put(content_hash("last_pagerank", GRAPH_CACHE_VERSION, repo), pagerank)
+
+    def get_layout(self, repo: str) -> Optional[Dict[str, Tuple[float, float]]]:
+        """저장소(repo_identity 키)의 마지막 노드 좌표 {node_id: (x, y)}"""
+        return self._get(content_hash("layout", GRAPH_CACHE_VERSION, repo))
+
+    def put_layout(self, repo: str, layout: Dict[str, Tuple[float, float]]) -> None:
+        self._put(content_hash("layout", GRAPH_CACHE_VERSION, repo), layout)
+
+    def stats(self):
+        return self.store.stats()
+
+
+# 글로벌 그래프 캐시 (GraphBuilder 인스턴스 간 공유)
+_graph_cache: Optional[GraphCache] = None
+
+
+def get_graph_cache() -> Optional[GraphCache]:
+    """
+    글로벌 그래프 캐시를 가져옵니다.
+
+    Returns:
+        GraphCache 인스턴스 (비활성화되었거나 열 수 없으면 None)
+    """
+    global _graph_cache
+
+    if _graph_cache is None and Config.USE_GRAPH_CACHE:
+        try:
+            _graph_cache = GraphCache()
+        except Exception as e:
+            logger.warning(f"Graph cache unavailable: {e}")
+            return None
+
+    return _graph_cache
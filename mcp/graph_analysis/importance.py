@@ -0,0 +1,92 @@
+"""
+mcp/graph_analysis/importance.py
+Built-in importance scoring from the structural graph (imports + calls).
+
+RepoGraph 없이도 노드 크기에 의미가 있도록, 구조 분석 단계에서 이미 만든 그래프만으로
+중심성(가중 진입 차수 + PageRank)을 계산합니다. 외부 파서/모델을 쓰지 않으므로
+큰 저장소에서도 CSR PageRank 두 번의 비용(엣지 수에 선형)만 듭니다.
+
+  - 파일 점수: import 엣지 + 함수 호출을 파일 단위로 올린 엣지 (호출 지점 수 가중치)
+  - 함수/클래스 점수: calls 엣지
+"""
+import logging
+from typing import Dict, Iterable, Tuple
+
+from shared.file_utils import PathSuffixIndex
+from shared.pagerank_utils import PageRankEngine
+
+logger = logging.getLogger(__name__)
+
+IMPORTANCE_RELATIONS = ("imports", "calls")
+
+
+def _normalize(values: Dict[str, float]) -> Dict[str, float]:
+    top = max(values.values(), default=0.0)
+    if top <= 0:
+        return {k: 0.0 for k in values}
+    return {k: v / top for k, v in values.items()}
+
+
+def _centrality(nodes: Iterable[str], edges: Dict[Tuple[str, str], float], pagerank_weight: float) -> Dict[str, float]:
+    """정규화된 PageRank와 가중 진입 차수의 가중 평균 (0~1)"""
+    in_degree = {node: 0.0 for node in nodes}
+    for (_, target), weight in edges.items():
+        in_degree[target] += weight
+
+    engine = PageRankEngine().build(in_degree, ((s, t, w) for (s, t), w in edges.items()))
+    pagerank = _normalize(engine.run())
+    in_degree = _normalize(in_degree)
+    return {
+        node: pagerank_weight * pagerank[node] + (1 - pagerank_weight) * in_degree[node]
+        for node in in_degree
+    }
+
+
+def compute_importance(
+    node_ids: Iterable[str],
+    edges: Iterable[Tuple[str, str, str, float]],
+    pagerank_weight: float = 0.7,
+) -> Dict[str, float]:
+    """
+    구조 그래프에서 노드 중요도(0~1)를 계산합니다.
+
+    Args:
+        node_ids: 그래프 노드 ID (파일: "path", 함수/클래스: "path::name")
+        edges: (source, target, relation, weight) 튜플 (EdgeTable 순회 형식)
+        pagerank_weight: PageRank와 진입 차수의 혼합 비율
+
+    Returns:
+        {node_id: score}. import/calls 신호가 전혀 없으면 빈 dict (호출 측 기본값 사용)
+    """
+    node_ids = list(dict.fromkeys(node_ids))
+    known = set(node_ids)
+    file_ids = [nid for nid in node_ids if "::" not in nid]
+    file_set = set(file_ids)
+    # import 대상은 "utils.py", "/src/a.ts" 같은 힌트이므로 파일 ID에 경로 접미사로 맞춤
+    file_index = PathSuffixIndex({fid: fid for fid in file_ids})
+
+    file_edges: Dict[Tuple[str, str], float] = {}
+    def_edges: Dict[Tuple[str, str], float] = {}
+    for source, target, relation, weight in edges:
+        if relation not in IMPORTANCE_RELATIONS:
+            continue
+        if relation == "calls" and "::" in source and "::" in target and source in known and target in known:
+            def_edges[(source, target)] = def_edges.get((source, target), 0.0) + weight
+
+        src_file = source.split("::")[0]
+        tgt_file = target.split("::")[0]
+        if tgt_file not in file_set:
+            tgt_file = file_index.lookup(tgt_file)
+        if src_file != tgt_file and src_file in file_set and tgt_file in file_set:
+            file_edges[(src_file, tgt_file)] = file_edges.get((src_file, tgt_file), 0.0) + weight
+
+    if not file_edges and not def_edges:
+        return {}
+
+    scores = _centrality(file_ids, file_edges, pagerank_weight)
+    def_ids = [nid for nid in node_ids if "::" in nid]
+    if def_ids:
+        scores.update(_centrality(def_ids, def_edges, pagerank_weight))
+
+    logger.info(f"Built-in importance: {len(file_edges)} file edges, {len(def_edges)} call edges.")
+    return scores
@@ -0,0 +1,306 @@
+"""
+mcp/graph_analysis/layout.py
+Server-side graph layout: radial tree for the directory hierarchy + force-directed refinement.
+
+브라우저가 매번 수천 개 노드의 force simulation을 돌리지 않도록 좌표(x, y)를 미리 계산합니다.
+
+  1. 방사형 트리 배치 (O(n)): ROOT/디렉토리/파일을 parent 관계로 배치, 서브트리 리프 수에 비례한 각도 구간
+  2. 함수/클래스는 parent 파일 주위의 작은 궤도에 배치
+  3. Force-directed 보정 (NumPy, 반복 상한): 디렉토리/ROOT는 고정
+     - 앵커 스프링: 각 노드를 트리 배치 위치로 당김 (구조 유지, 붕괴 방지)
+     - 엣지 스프링: parent 관계 + 코드 엣지 (imports/calls 등, 관련 파일끼리 가까워짐)
+     - 근거리 반발력: 격자 셀 순서로 정렬한 이웃 창 안에서만 계산 (O(n * window))
+  4. 증분 실행: 이전 좌표가 있는 노드는 고정, 새 노드만 배치 (사용자의 공간 기억 유지)
+
+NumPy가 없으면 1~2단계(트리/궤도 배치)만 적용합니다.
+"""
+import logging
+import math
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+FIXED_TYPES = frozenset({"root", "directory"})
+ORBIT_TYPES = frozenset({"function", "class", "method", "code_entity"})
+STRUCTURE_EDGE = "structure"
+
+LEAF_SPACING = 40.0      # 바깥 고리에서 리프 사이 최소 호 길이
+ORBIT_RADIUS = 15.0      # 파일 주위 함수/클래스 궤도 기본 반지름
+PARENT_SPRING = 0.05     # parent 관계 스프링 계수
+CODE_SPRING = 0.02       # 코드 엣지 스프링 계수 (가중치는 로그로 완화)
+ANCHOR_SPRING = 0.1      # 트리 배치 위치로 당기는 스프링 계수
+
+
+def tree_layout(
+    nodes: List[Dict[str, Any]],
+    leaf_weight: Optional[Dict[str, float]] = None,
+    leaf_spacing: float = LEAF_SPACING,
+) -> Dict[str, Tuple[float, float]]:
+    """
+    parent 관계로 방사형 트리 좌표를 계산합니다.
+
+    고리 간격은 가장 바깥 고리에 모든 리프를 leaf_spacing 간격으로 놓을 수 있도록 정합니다.
+
+    Args:
+        nodes: {"id", "parent"} 를 가진 노드 목록
+        leaf_weight: 리프가 차지하는 각도 비중 (기본 1, 큰 궤도를 가진 파일은 더 넓게)
+        leaf_spacing: 리프 사이 최소 호 길이
+    """
+    leaf_weight = leaf_weight or {}
+    ids = [node["id"] for node in nodes]
+    known = set(ids)
+
+    children: Dict[str, List[str]] = defaultdict(list)
+    roots: List[str] = []
+    for node in nodes:
+        parent = node.get("parent")
+        if parent and parent in known and parent != node["id"]:
+            children[parent].append(node["id"])
+        else:
+            roots.append(node["id"])
+    for child_ids in children.values():
+        child_ids.sort()
+    roots.sort()
+    single = len(roots) == 1  # 루트가 하나면 원점, 여러 개면 가상 루트 아래 첫 번째 고리
+
+    # 서브트리 리프 비중 (반복 후위 순회, 순환 parent 관계는 방문 표시로 차단)
+    leaves: Dict[str, float] = {}
+    order: List[str] = []
+    max_depth = 1
+    stack = [(nid, 0 if single else 1) for nid in roots]
+    while stack:
+        nid, depth = stack.pop()
+        if nid in leaves:
+            continue
+        leaves[nid] = 0.0
+        order.append(nid)
+        max_depth = max(max_depth, depth)
+        stack.extend((child, depth + 1) for child in children.get(nid, ()))
+    for nid in reversed(order):
+        leaves[nid] = sum(leaves[c] for c in children.get(nid, ()) if leaves.get(c)) or leaf_weight.get(nid, 1.0)
+
+    total = sum(leaves[nid] for nid in roots if nid in leaves)
+    ring_gap = max(80.0, total * leaf_spacing / (2 * math.pi * max_depth))
+
+    positions: Dict[str, Tuple[float, float]] = {}
+    stack = [(nid, start, span, 0 if single else 1) for nid, start, span in _spans(roots, leaves, 0.0, 2 * math.pi)]
+    while stack:
+        nid, start, span, depth = stack.pop()
+        if nid in positions:
+            continue
+        angle = start + span / 2
+        radius = depth * ring_gap
+        positions[nid] = (radius * math.cos(angle), radius * math.sin(angle))
+        for child, c_start, c_span in _spans(children.get(nid, ()), leaves, start, span):
+            stack.append((child, c_start, c_span, depth + 1))
+
+    # parent 순환으로 도달하지 못한 노드는 바깥 고리에 배치
+    missing = [nid for nid in ids if nid not in positions]
+    if missing:
+        radius = max((math.hypot(*p) for p in positions.values()), default=0.0) + ring_gap
+        for i, nid in enumerate(missing):
+            angle = 2 * math.pi * i / len(missing)
+            positions[nid] = (radius * math.cos(angle), radius * math.sin(angle))
+    return positions
+
+
+def _spans(ids: Iterable[str], leaves: Dict[str, float], start: float, span: float):
+    ids = [nid for nid in ids if nid in leaves]
+    total = sum(leaves[nid] for nid in ids) or 1.0
+    for nid in ids:
+        share = span * leaves[nid] / total
+        yield nid, start, share
+        start += share
+
+
+def _orbit_radius(count: int) -> float:
+    """궤도 위 노드 사이 호 길이가 최소 8이 되도록"""
+    return max(ORBIT_RADIUS, 8.0 * count / (2 * math.pi))
+
+
+def force_refine(
+    positions,
+    edges,
+    weights,
+    fixed,
+    anchor_parent=None,
+    anchor_offset=None,
+    iterations: int = 100,
+    min_distance: float = 20.0,
+    window: int = 8,
+):
+    """
+    앵커/엣지 스프링 + 근거리 반발력의 벡터화 보정.
+
+    전역 반발력(O(n^2))을 쓰지 않는 대신 초기 배치 위치로 당기는 앵커 스프링이 전체 구조를 유지합니다.
+
+    Args:
+        positions: (n, 2) 초기 좌표 (앵커 위치)
+        edges: (m, 2) 노드 인덱스 쌍
+        weights: (m,) 스프링 계수
+        fixed: (n,) 고정 노드 마스크
+        anchor_parent: (n,) 앵커 기준 노드 인덱스 (-1이면 초기 좌표에 고정된 앵커)
+        anchor_offset: (n, 2) 기준 노드로부터의 앵커 오프셋 (궤도 노드가 파일을 따라 움직이도록)
+        iterations: 반복 상한
+        min_distance: 이 거리 안의 노드끼리만 밀어냄
+        window: 근거리 반발력 이웃 창 크기
+    """
+    pos = np.array(positions, dtype=float)
+    n = len(pos)
+    if n < 2 or fixed.all() or iterations <= 0:
+        return pos
+
+    anchors = pos.copy()
+    if anchor_parent is None:
+        anchor_parent = np.full(n, -1)
+        anchor_offset = np.zeros_like(pos)
+    relative = anchor_parent >= 0
+    src, tgt = (edges[:, 0], edges[:, 1]) if len(edges) else (np.empty(0, int), np.empty(0, int))
+    md2 = min_distance * min_distance
+    temperature = min_distance
+    cooling = temperature / iterations
+
+    for _ in range(iterations):
+        # 앵커 스프링: 궤도 노드의 앵커는 현재 parent 위치 + 오프셋
+        target = anchors.copy()
+        target[relative] = pos[anchor_parent[relative]] + anchor_offset[relative]
+        disp = (target - pos) * ANCHOR_SPRING
+
+        # 근거리 반발력: 같은/인접 격자 셀의 노드가 정렬 순서상 가까이 오도록 정렬 후 창 안에서만 계산
+        cell = np.floor(pos / min_distance).astype(np.int64)
+        order = np.argsort(cell[:, 1] * 2_000_003 + cell[:, 0], kind="stable")
+        for offset in range(1, min(window, n - 1) + 1):
+            a, b = order[:-offset], order[offset:]
+            delta = pos[a] - pos[b]
+            dist2 = np.einsum("ij,ij->i", delta, delta) + 1e-2
+            push = delta * np.maximum(md2 / dist2 - 1.0, 0.0)[:, None] * 0.5
+            np.add.at(disp, a, push)
+            np.subtract.at(disp, b, push)
+
+        # 엣지 스프링: 연결된 노드를 서로 당김 (먼 노드끼리 구조를 무너뜨리지 않도록 엣지당 min_distance로 상한)
+        if len(src):
+            delta = pos[src] - pos[tgt]
+            dist = np.sqrt(np.einsum("ij,ij->i", delta, delta)) + 1e-9
+            pull = delta * (np.minimum(dist * weights, min_distance) / dist)[:, None]
+            np.subtract.at(disp, src, pull)
+            np.add.at(disp, tgt, pull)
+
+        disp[fixed] = 0.0
+        length = np.sqrt(np.einsum("ij,ij->i", disp, disp)) + 1e-9
+        pos += disp * (np.minimum(length, temperature) / length)[:, None]
+        temperature = max(temperature - cooling, 0.05 * min_distance)
+
+    return pos
+
+
+def compute_layout(
+    nodes: List[Dict[str, Any]],
+    edges: List[Dict[str, Any]],
+    previous: Optional[Dict[str, Tuple[float, float]]] = None,
+    iterations: int = 100,
+    window: int = 8,
+) -> Dict[str, Tuple[float, float]]:
+    """
+    최종 그래프 노드의 좌표를 계산합니다.
+
+    Args:
+        nodes: final_graph_json 노드 ({"id", "parent", "type"})
+        edges: final_graph_json 엣지 ({"source", "target", "type", "weight"})
+        previous: 이전 실행의 좌표 (있는 노드는 고정, 새 노드만 배치)
+        iterations: force 보정 반복 상한 (0이면 트리/궤도 배치만)
+        window: 근거리 반발력 이웃 창 크기
+
+    Returns:
+        {node_id: (x, y)}
+    """
+    previous = previous or {}
+    ids = [node["id"] for node in nodes]
+    if previous and all(nid in previous for nid in ids):
+        return {nid: tuple(previous[nid]) for nid in ids}  # 새 노드 없음: 그대로 재사용
+
+    known = set(ids)
+    parent_of = {node["id"]: node.get("parent") for node in nodes}
+    orbiting: Dict[str, List[str]] = defaultdict(list)
+    tree_nodes = []
+    for node in nodes:
+        parent = node.get("parent")
+        if node.get("type") in ORBIT_TYPES and parent in known and parent != node["id"]:
+            orbiting[parent].append(node["id"])
+        else:
+            tree_nodes.append(node)
+
+    # 1. 트리 배치: 궤도가 큰 파일은 더 넓은 각도를 차지
+    leaf_weight = {
+        pid: max(1.0, 2 * _orbit_radius(len(children)) / LEAF_SPACING)
+        for pid, children in orbiting.items()
+    }
+    initial = tree_layout(tree_nodes, leaf_weight)
+
+    # 2. 궤도 배치 (메서드 -> 클래스 -> 파일처럼 중첩될 수 있으므로 배치된 parent부터 BFS)
+    offsets: Dict[str, Tuple[float, float]] = {}
+    queue = [pid for pid in orbiting if pid in initial]
+    while queue:
+        pid = queue.pop()
+        children = sorted(orbiting.pop(pid, ()))
+        radius = _orbit_radius(len(children))
+        px, py = initial[pid]
+        base = math.atan2(py, px)  # 바깥쪽부터 시작해 부모 쪽과 겹치지 않게
+        for i, nid in enumerate(children):
+            angle = base + 2 * math.pi * i / len(children)
+            offsets[nid] = (radius * math.cos(angle), radius * math.sin(angle))
+            initial[nid] = (px + offsets[nid][0], py + offsets[nid][1])
+            if nid in orbiting:
+                queue.append(nid)
+    # parent 순환 등으로 남은 노드는 parent 없이 바깥 고리에
+    for nid in ids:
+        if nid not in initial:
+            initial[nid] = tree_layout([{"id": nid}])[nid]
+
+    # 3. 증분: 이전 좌표 재사용, 새 노드는 기존 parent 근처에서 시작 (트리 좌표계가 달라졌을 수 있음)
+    for nid in ids:
+        if nid in previous:
+            initial[nid] = tuple(previous[nid])
+        elif previous and parent_of.get(nid) in previous:
+            px, py = previous[parent_of[nid]]
+            angle = (zlib.crc32(nid.encode("utf-8")) % 360) * math.pi / 180
+            radius = math.hypot(*offsets.get(nid, (ORBIT_RADIUS, 0.0)))
+            initial[nid] = (px + radius * math.cos(angle), py + radius * math.sin(angle))
+
+    if not NUMPY_AVAILABLE or iterations <= 0:
+        return {nid: (round(initial[nid][0], 1), round(initial[nid][1], 1)) for nid in ids}
+
+    index = {nid: i for i, nid in enumerate(ids)}
+    pairs, weights = [], []
+    for edge in edges:
+        if edge.get("type") == STRUCTURE_EDGE:
+            continue  # parent 관계는 앵커(트리/궤도)로 이미 반영
+        s, t = index.get(edge["source"]), index.get(edge["target"])
+        if s is None or t is None or s == t:
+            continue
+        pairs.append((s, t))
+        weights.append(CODE_SPRING * (1 + math.log1p(float(edge.get("weight", 1.0) or 1.0))))
+
+    fixed = np.array([nid in previous or node.get("type") in FIXED_TYPES for nid, node in zip(ids, nodes)], dtype=bool)
+    anchor_parent = np.array([index[parent_of[nid]] if nid in offsets else -1 for nid in ids], dtype=int)
+    anchor_offset = np.array([offsets.get(nid, (0.0, 0.0)) for nid in ids], dtype=float)
+
+    refined = force_refine(
+        np.array([initial[nid] for nid in ids], dtype=float),
+        np.array(pairs, dtype=int).reshape(-1, 2),
+        np.array(weights, dtype=float),
+        fixed,
+        anchor_parent,
+        anchor_offset,
+        iterations=iterations,
+        window=window,
+    )
+    return {nid: (round(float(x), 1), round(float(y), 1)) for nid, (x, y) in zip(ids, refined)}
@@ -0,0 +1,240 @@
+"""
+mcp/graph_analysis/lod.py
+Level-of-detail (LOD) views of the final graph: directory-based clustering at every tree depth.
+
+build_graph 결과(ROOT -> 디렉토리 -> 파일 -> 함수/클래스)는 수천 노드를 넘으면 한 번에 그릴 수 없으므로
+parent 계층의 깊이별로 접힌(clustered) 뷰를 미리 계산합니다.
+
+  - 레벨 L 뷰: 깊이 <= L 인 노드만 표시, 더 깊은 노드는 깊이 L 조상(클러스터)에 합침
+  - 클러스터 노드: 숨겨진 하위 노드 수 / 최대 중요도 / 복잡도 합계 + 디렉토리 집계
+    (파일 수 / 줄 수 / 중요도 합계 / 주 도메인, GraphBuilder가 계산한 값 우선)
+  - 코드 엣지(imports/calls 등): 양 끝을 대표 노드로 올려 (source, target)별 가중치/개수 합산
+  - expand(): 클러스터 하나를 한 단계 펼친 자식 노드 + 현재 뷰 기준 엣지 (필요할 때만)
+"""
+import logging
+import math
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STRUCTURE_EDGE = "structure"
+# GraphBuilder가 디렉토리 노드에 미리 붙이는 집계 (DirectoryTree.aggregate)
+DIRECTORY_AGGREGATES = ("file_count", "loc", "importance_sum", "dominant_domain")
+
+
+class GraphLOD:
+    """
+    final_graph_json의 깊이별 클러스터 뷰.
+
+    Attributes:
+        max_depth: 가장 깊은 노드의 깊이
+        level_sizes: 레벨별 표시 노드 수
+        coarse_level: 표시 노드 수가 max_nodes 이하인 가장 깊은 레벨 (첫 응답용)
+    """
+
+    def __init__(self, graph: Dict[str, Any], max_nodes: int = 300):
+        nodes = graph.get("nodes") or []
+        self.nodes: Dict[str, Dict[str, Any]] = {node["id"]: node for node in nodes}
+        self.children: Dict[str, List[str]] = defaultdict(list)
+        roots = []
+        for nid, node in self.nodes.items():
+            parent = node.get("parent")
+            if parent in self.nodes and parent != nid:
+                self.children[parent].append(nid)
+            else:
+                roots.append(nid)
+
+        # 루트부터의 조상 경로 (깊이 d의 대표 노드 = path[d])
+        self._path: Dict[str, Tuple[str, ...]] = {}
+        order: List[str] = []
+        stack = [(nid, (nid,)) for nid in sorted(roots)]
+        while stack:
+            nid, path = stack.pop()
+            if nid in self._path:
+                continue  # parent 순환 차단
+            self._path[nid] = path
+            order.append(nid)
+            stack.extend((child, path + (child,)) for child in self.children.get(nid, ()))
+        for nid in self.nodes:
+            self._path.setdefault(nid, (nid,))  # 순환으로 도달하지 못한 노드는 루트 취급
+
+        self.max_depth = max((len(p) - 1 for p in self._path.values()), default=0)
+        self._aggregates = self._aggregate(order)
+
+        # (source, target, 코드 관계들, 가중치) - 병합된 엣지는 relations에서 structure만 제외
+        self._code_edges: List[Tuple[str, str, Tuple[str, ...], float]] = []
+        for edge in graph.get("edges") or []:
+            relations = tuple(
+                relation for relation in edge.get("relations") or (edge.get("type", "physical"),)
+                if relation != STRUCTURE_EDGE
+            )
+            source, target = edge.get("source"), edge.get("target")
+            if not relations or source not in self.nodes or target not in self.nodes:
+                continue
+            self._code_edges.append((source, target, relations, float(edge.get("weight", 1.0) or 1.0)))
+
+        # 레벨별 뷰 사전 계산 (엣지 집계는 레벨마다 O(E))
+        depth_counts = defaultdict(int)
+        for path in self._path.values():
+            depth_counts[len(path) - 1] += 1
+        self.level_sizes: List[int] = []
+        running = 0
+        for depth in range(self.max_depth + 1):
+            running += depth_counts[depth]
+            self.level_sizes.append(running)
+        self._edges_by_level = [
+            self._aggregate_edges(lambda nid, level=level: self.representative(nid, level))
+            for level in range(self.max_depth + 1)
+        ]
+        self.coarse_level = self._pick_coarse_level(max_nodes)
+        logger.info(f"LOD levels: {self.level_sizes} nodes, coarse level {self.coarse_level}.")
+
+    def _pick_coarse_level(self, max_nodes: int) -> int:
+        coarse = min(1, self.max_depth)
+        for level, size in enumerate(self.level_sizes):
+            if size <= max_nodes:
+                coarse = max(coarse, level)
+        return coarse
+
+    def _aggregate(self, order: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        후위 순회로 서브트리 집계 (자신 제외 하위 노드 수, 최대 중요도, 복잡도 합계 +
+        파일 수/줄 수/중요도 합계/주 도메인).
+
+        디렉토리 노드에 GraphBuilder가 미리 계산한 집계(DIRECTORY_AGGREGATES)가 있으면 그 값을 그대로 쓰고,
+        없을 때(이전 아티팩트)만 하위 노드에서 합산합니다.
+        """
+        aggregates = {}
+        for nid in reversed(list(order)):
+            node = self.nodes[nid]
+            is_file = node.get("type") == "file"
+            importance = float(node.get("importance", 0.0) or 0.0)
+            agg = {
+                "member_count": 0,
+                "file_count": 1 if is_file else 0,
+                "loc": int(node.get("loc", 0) or 0) if is_file else 0,
+                "importance_sum": importance if is_file else 0.0,
+                "dominant_domain": node.get("domain") if is_file else None,
+                "importance": importance,
+                "complexity": int(node.get("complexity", 0) or 0),
+            }
+            dominant_files = 0
+            for child in self.children.get(nid, ()):
+                child_agg = aggregates.get(child)
+                if child_agg is None:
+                    continue
+                agg["member_count"] += child_agg["member_count"] + 1
+                agg["file_count"] += child_agg["file_count"]
+                agg["loc"] += child_agg["loc"]
+                agg["importance_sum"] += child_agg["importance_sum"]
+                agg["importance"] = max(agg["importance"], child_agg["importance"])
+                agg["complexity"] += child_agg["complexity"]
+                if not is_file and child_agg["file_count"] > dominant_files and child_agg["dominant_domain"]:
+                    # 근사: 파일이 가장 많은 하위 클러스터의 도메인
+                    dominant_files = child_agg["file_count"]
+                    agg["dominant_domain"] = child_agg["dominant_domain"]
+            if "file_count" in node:
+                agg.update({key: node.get(key) for key in DIRECTORY_AGGREGATES})
+            aggregates[nid] = agg
+        return aggregates
+
+    def depth(self, node_id: str) -> int:
+        return len(self._path[node_id]) - 1
+
+    def representative(self, node_id: str, level: int) -> str:
+        """레벨 뷰에서 node_id를 대신하는 노드 (자신 또는 깊이 level의 조상)"""
+        path = self._path[node_id]
+        return path[min(level, len(path) - 1)]
+
+    def _aggregate_edges(self, rep) -> List[Dict[str, Any]]:
+        merged: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for source, target, relations, weight in self._code_edges:
+            rs, rt = rep(source), rep(target)
+            if rs is None or rt is None or rs == rt:
+                continue
+            entry = merged.get((rs, rt))
+            if entry is None:
+                entry = merged[(rs, rt)] = {"source": rs, "target": rt, "weight": 0.0, "count": 0, "relation_counts": {}}
+            entry["weight"] += weight
+            entry["count"] += 1
+            counts = entry["relation_counts"]
+            for relation in relations:
+                counts[relation] = counts.get(relation, 0) + 1
+        for entry in merged.values():
+            counts = entry["relation_counts"]
+            # 최종 그래프 엣지와 같은 형식 (type + 정렬된 relations 목록)
+            entry["type"] = next(iter(counts)) if len(counts) == 1 else "aggregated"
+            entry["relations"] = sorted(counts)
+        return list(merged.values())
+
+    def _view_node(self, node_id: str, level: int) -> Dict[str, Any]:
+        node = dict(self.nodes[node_id])
+        collapsed = self.depth(node_id) >= level and bool(self.children.get(node_id))
+        node["collapsed"] = collapsed
+        if collapsed:
+            agg = self._aggregates[node_id]
+            node.update(agg)
+            # 클러스터 크기는 숨겨진 노드 수에 따라 로그 스케일로 키움
+            node["size"] = float(node.get("size", 15) or 15) + 10 * math.log1p(agg["member_count"])
+        return node
+
+    def _structure_edges(self, node_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        node_ids = list(node_ids)
+        visible = set(node_ids)
+        return [
+            {"source": self.nodes[nid]["parent"], "target": nid, "type": STRUCTURE_EDGE}
+            for nid in node_ids
+            if self.nodes[nid].get("parent") in visible and self.nodes[nid]["parent"] != nid
+        ]
+
+    def view(self, level: Optional[int] = None) -> Dict[str, Any]:
+        """
+        레벨 뷰를 반환합니다.
+
+        Args:
+            level: 표시할 최대 깊이 (None이면 coarse_level)
+        """
+        level = self.coarse_level if level is None else max(0, min(level, self.max_depth))
+        visible = [nid for nid, path in self._path.items() if len(path) - 1 <= level]
+        return {
+            "level": level,
+            "levels": self.level_sizes,
+            "nodes": [self._view_node(nid, level) for nid in visible],
+            "edges": self._structure_edges(visible) + self._edges_by_level[level],
+        }
+
+    def expand(self, node_id: str, level: Optional[int] = None) -> Dict[str, Any]:
+        """
+        클러스터를 한 단계 펼칩니다.
+
+        Args:
+            node_id: 펼칠 클러스터 노드
+            level: 클라이언트가 보고 있는 뷰의 레벨 (서브트리 밖 엣지 끝점을 이 레벨 대표 노드로 올림)
+
+        Returns:
+            {"node", "nodes": 자식 노드(각각 접힌 상태), "edges": structure + 자식 기준 코드 엣지}
+            node_id가 없으면 KeyError
+        """
+        if node_id not in self.nodes:
+            raise KeyError(node_id)
+        level = self.coarse_level if level is None else max(0, min(level, self.max_depth))
+        child_level = self.depth(node_id) + 1
+        children = sorted(self.children.get(node_id, ()))
+
+        def rep(nid):
+            path = self._path[nid]
+            if len(path) > child_level - 1 and path[child_level - 1] == node_id:
+                return path[min(child_level, len(path) - 1)]
+            return self.representative(nid, level)
+
+        edges = [
+            edge for edge in self._aggregate_edges(rep)
+            if edge["source"] in children or edge["target"] in children
+        ]
+        return {
+            "node": node_id,
+            "level": child_level,
+            "nodes": [self._view_node(child, child_level) for child in children],
+            "edges": self._structure_edges([node_id, *children]) + edges,
+        }
@@ -1,6 +1,6 @@
 """
 mcp/graph_analysis/visualizer.py
-Local Graph Model Adapter (Uses RepoGraph for detailed analysis).
+Local Graph Model Adapter (built-in structural importance, optional RepoGraph refinement).
 """
 import sys
 import os
@@ -8,11 +8,17 @@ import logging
 import networkx as nx
 import torch
 from agent.config import Config
+from .cache import GraphCache, build_manifest, get_graph_cache, repo_identity
+from .importance import compute_importance
+from .layout import compute_layout
+from shared.file_utils import DirectoryTree, PathSuffixIndex
+from shared.graph_utils import EdgeMerger, EdgeTable
+from shared.pagerank_utils import PageRankEngine, entry_point_seeds
 
 logger = logging.getLogger(__name__)
 
-# Add local model directory to path
-if Config.LOCAL_MODEL_DIR and os.path.exists(Config.LOCAL_MODEL_DIR):
+# Add local model directory to path (RepoGraph는 선택 사항: 없으면 내장 중요도만 사용)
+if Config.USE_REPOGRAPH and Config.LOCAL_MODEL_DIR and os.path.exists(Config.LOCAL_MODEL_DIR):
     sys.path.append(Config.LOCAL_MODEL_DIR)
     # Also add the subpackage directory in case of absolute imports inside RepoGraph
     sys.path.append(os.path.join(Config.LOCAL_MODEL_DIR, "repograph"))
@@ -23,7 +29,7 @@ if Config.LOCAL_MODEL_DIR and os.path.exists(Config.LOCAL_MODEL_DIR):
         logger.error(f"Failed to import RepoGraph: {e}")
         CodeGraph = None
 else:
-    logger.warning(f"LOCAL_MODEL_DIR not found: {Config.LOCAL_MODEL_DIR}")
+    logger.info(f"RepoGraph not available ({Config.LOCAL_MODEL_DIR}); using built-in importance only.")
     CodeGraph = None
 
 
@@ -31,61 +37,138 @@ class RepoGraphPredictor:
     def __init__(self):
         self.enabled = CodeGraph is not None
 
-    def calculate_importance(self, repo_path: str) -> dict:
+    def calculate_importance(self, repo_path: str, repo_id: str = None) -> dict:
         """
         RepoGraph를 사용하여 상세 호출 그래프를 생성하고, PageRank로 중요도를 계산합니다.
+
+        파일 해시 매니페스트가 같으면 캐시된 결과를 그대로 사용하고,
+        일부 파일만 바뀌었으면 그 파일들의 태그만 다시 추출합니다.
+        repo_id: 실행 간 캐시 공유용 저장소 식별자 (repo_path는 실행마다 임시 폴더)
         """
         if not self.enabled or not repo_path:
             return {}
 
         try:
-            # 1. RepoGraph 초기화 및 그래프 생성
+            # 1. RepoGraph 초기화 및 파일 목록
             cg = CodeGraph(root=repo_path, verbose=False)
             files = cg.find_files([repo_path])
-            tags, G = cg.get_code_graph(files)
-            
-            if not G or len(G.nodes) == 0:
-                return {}
 
-            # 2. PageRank 계산
-            importance_scores = nx.pagerank(G, weight='weight')
-            
-            # 3. 파일 단위로 점수 집계 (Aggregation)
+            cache = get_graph_cache()
+            repo = repo_identity(repo_path, repo_id)
+            manifest, manifest_key = [], None
+            if cache is not None:
+                manifest = build_manifest(files, repo_path)
+                variant = "entry_points" if Config.PAGERANK_SEED_ENTRY_POINTS else "uniform"
+                manifest_key = GraphCache.manifest_key(repo, manifest, variant)
+                cached = cache.get_result(manifest_key)
+                if cached is not None:
+                    logger.info("RepoGraph cache hit: repository unchanged, reusing graph and PageRank.")
+                    return cached["file_importance"]
+
+            # 2. 그래프 생성 (같은 매니페스트의 그래프가 있으면 재사용) + PageRank 계산
+            G = cache.get_graph(repo, manifest, repo_path) if cache is not None else None
+            if G is not None:
+                logger.info("RepoGraph cache hit: reusing code graph, recomputing PageRank.")
+            else:
+                G = self._build_code_graph(cg, files, repo_path, repo, manifest, cache)
+                if cache is not None and G is not None:
+                    cache.put_graph(repo, manifest, G, repo_path)
+            importance_scores = {}
             file_importance = {}
-            
-            for node_id in G.nodes:
-                node_data = G.nodes[node_id]
-                fname = node_data.get('fname') # 절대 경로
-                
-                if fname:
-                    # 절대 경로를 상대 경로로 변환하여 저장
-                    # 이렇게 해야 build_graph에서 node['id']와 매칭하기 쉬움
-                    try:
-                        rel_path = os.path.relpath(fname, repo_path)
-                    except ValueError:
-                        rel_path = fname # 경로가 안 맞으면 그냥 절대 경로 사용
-
-                    file_importance[rel_path] = file_importance.get(rel_path, 0) + importance_scores.get(node_id, 0)
-
-            # 정규화 (0~1)
-            if file_importance:
-                max_score = max(file_importance.values())
-                if max_score > 0:
-                    for k in file_importance:
-                        file_importance[k] /= max_score
-            
+            if G and len(G.nodes) > 0:
+                warm_start = cache.get_last_pagerank(repo) if cache is not None else None
+                importance_scores = self._pagerank(G, warm_start)
+                file_importance = self._aggregate_by_file(G, importance_scores, repo_path)
+
+            if cache is not None:
+                if importance_scores:
+                    cache.put_last_pagerank(repo, importance_scores)
+                cache.put_result(manifest_key, {
+                    "pagerank": importance_scores,
+                    "file_importance": file_importance
+                })
             return file_importance
 
         except Exception as e:
             logger.error(f"RepoGraph analysis failed: {e}")
             return {}
 
+    @staticmethod
+    def _pagerank(G, warm_start=None) -> dict:
+        """CSR PageRank (nx.pagerank(G, weight='weight')와 동일 정의, 이전 벡터로 warm start)"""
+        engine = PageRankEngine(tol=Config.PAGERANK_TOL, max_iter=Config.PAGERANK_MAX_ITER).build(
+            G.nodes,
+            ((u, v, d.get('weight', 1)) for u, v, d in G.edges(data=True))
+        )
+
+        personalization = None
+        if Config.PAGERANK_SEED_ENTRY_POINTS:
+            personalization = entry_point_seeds({n: d.get('fname') for n, d in G.nodes(data=True)}) or None
+
+        scores = engine.run(personalization=personalization, warm_start=warm_start)
+        logger.info(
+            f"PageRank: {len(engine.nodes)} nodes, {engine.iterations} iterations"
+            f"{' (warm start)' if warm_start else ''}."
+        )
+        return scores
+
+    def _build_code_graph(self, cg, files, repo_path, repo, manifest, cache):
+        """태그를 파일 해시별로 캐시하여 바뀐 파일만 다시 태깅한 뒤 그래프를 구성합니다."""
+        if cache is None or not (hasattr(cg, "get_tags") and hasattr(cg, "tag_to_graph")):
+            _, G = cg.get_code_graph(files)
+            return G
+
+        digests = dict(manifest)
+        tags = []
+        retagged = 0
+        for fname in files:
+            rel_fname = os.path.relpath(fname, repo_path).replace("\\", "/")
+            digest = digests.get(rel_fname)
+            file_tags = cache.get_tags(repo, rel_fname, digest, repo_path) if digest else None
+            if file_tags is None:
+                file_tags = list(cg.get_tags(fname, rel_fname) or [])
+                retagged += 1
+                if digest:
+                    cache.put_tags(repo, rel_fname, digest, file_tags)
+            tags.extend(file_tags)
+
+        logger.info(f"RepoGraph tags: {retagged}/{len(files)} files re-tagged.")
+        return cg.tag_to_graph(tags)
+
+    @staticmethod
+    def _aggregate_by_file(G, importance_scores, repo_path) -> dict:
+        """노드 PageRank를 파일 단위로 합산하고 0~1로 정규화합니다."""
+        file_importance = {}
+
+        for node_id in G.nodes:
+            node_data = G.nodes[node_id]
+            fname = node_data.get('fname') # 절대 경로
+
+            if fname:
+                # 절대 경로를 상대 경로로 변환하여 저장
+                # 이렇게 해야 build_graph에서 node['id']와 매칭하기 쉬움
+                try:
+                    rel_path = os.path.relpath(fname, repo_path)
+                except ValueError:
+                    rel_path = fname # 경로가 안 맞으면 그냥 절대 경로 사용
+
+                file_importance[rel_path] = file_importance.get(rel_path, 0) + importance_scores.get(node_id, 0)
+
+        # 정규화 (0~1)
+        if file_importance:
+            max_score = max(file_importance.values())
+            if max_score > 0:
+                for k in file_importance:
+                    file_importance[k] /= max_score
+
+        return file_importance
+
 
 class GraphBuilder:
     def __init__(self):
         self.predictor = RepoGraphPredictor()
 
-    def build_graph(self, nodes, edges, context_metadata, repo_path=None):
+    def build_graph(self, nodes, edges, context_metadata, repo_path=None, repo_id=None):
         """
         Phase 3: Graph Construction
         """
@@ -93,36 +176,51 @@ class GraphBuilder:
         if not isinstance(nodes, list):
             logger.error(f"Invalid nodes format: {type(nodes)}. Expected list.")
             nodes = []
-        if not isinstance(edges, list):
-            logger.error(f"Invalid edges format: {type(edges)}. Expected list.")
-            edges = []
+        if isinstance(edges, EdgeTable):
+            edge_rows = edges  # (source, target, relation, weight) 튜플 순회
+        elif isinstance(edges, list):
+            edge_rows = [
+                (e['source'], e['target'], e.get('type', 'physical'), e.get('weight', 1.0))
+                for e in edges
+            ]
+        else:
+            logger.error(f"Invalid edges format: {type(edges)}. Expected list or EdgeTable.")
+            edge_rows = []
         
         G = nx.DiGraph()
         
-        # 1. RepoGraph 중요도 계산
+        # 1. 중요도 계산: 구조 그래프 기반 내장 점수 + (선택) RepoGraph 보정
+        builtin_importance = compute_importance(
+            (node['id'] for node in nodes), edge_rows, Config.IMPORTANCE_PAGERANK_WEIGHT
+        )
+        logger.info(f"Calculated built-in importance for {len(builtin_importance)} nodes.")
+
         importance_map = {}
         if repo_path and self.predictor.enabled:
-            importance_map = self.predictor.calculate_importance(repo_path)
+            importance_map = self.predictor.calculate_importance(repo_path, repo_id)
             logger.info(f"Calculated importance for {len(importance_map)} files using RepoGraph.")
 
+        # 접미사 인덱스는 한 번만 구축 (노드마다 전체 맵을 훑지 않도록)
+        importance_index = PathSuffixIndex(importance_map) if importance_map else None
+        repograph_weight = Config.REPOGRAPH_IMPORTANCE_WEIGHT
+
         # 2. 노드 추가 (Context 주입)
         for node in nodes:
             nid = node['id'] # 보통 상대 경로 (e.g., "mcp/analyzer.py")
             meta = context_metadata.get('file_metadata', {}).get(nid, {})
             
-            # 중요도 매핑 (Robust Matching)
-            score = 0.5 # 기본값
-            
-            # 1차 시도: 정확한 키 매칭 (상대 경로)
-            if nid in importance_map:
-                score = importance_map[nid]
-            else:
-                # 2차 시도: 경로 끝부분 매칭 (파일명 등)
-                # importance_map의 키가 절대 경로일 수도 있고, nid가 일부만 있을 수도 있음
-                for path, val in importance_map.items():
-                    if str(path).endswith(nid) or nid.endswith(str(path)):
-                        score = val
-                        break
+            # 중요도 매핑: 내장 점수 (신호가 없으면 기본값 0.5)
+            score = builtin_importance.get(nid, 0.5)
+
+            # RepoGraph 점수가 있으면 혼합 (정확한 키 -> 경로 접미사 매칭)
+            repo_score = importance_map.get(nid)
+            if repo_score is None and importance_index is not None:
+                repo_score = importance_index.lookup(nid)
+            if repo_score is not None:
+                if nid in builtin_importance:
+                    score = (1 - repograph_weight) * score + repograph_weight * repo_score
+                else:
+                    score = repo_score
             
             # Context Hint가 있으면 가중치 부여
             if meta.get('importance_hint') == 'High':
@@ -134,27 +232,40 @@ class GraphBuilder:
                        layer=meta.get('layer', 'Module'),  # Layout
                        summary_text=node.get('summary_text', ''),
                        summary_details=node.get('summary_details', {}),
-                       type=node.get('type', 'file')
+                       type=node.get('type', 'file'),
+                       complexity=node.get('complexity', 0),
+                       nesting_depth=node.get('nesting_depth', 0),
+                       loc=node.get('loc', 0)
                        )
             
             # 노드 속성에 점수 저장 (나중에 시각화용)
             G.nodes[nid]['importance'] = score
 
-        # 3. 엣지 추가
-        for edge in edges:
-            G.add_edge(edge['source'], edge['target'], type=edge.get('type', 'physical'))
-
-        for logic in context_metadata.get('logical_edges', []):
-            G.add_edge(logic['source'], logic['target'], type='logical')
+        # 3. 엣지 추가 ((source, target)별 하나로 병합: 관계 집합 + 합산 가중치)
+        edge_merger = EdgeMerger()
+        logical_rows = (
+            (logic['source'], logic['target'], 'logical', logic.get('weight', 1.0))
+            for logic in context_metadata.get('logical_edges', [])
+        )
+        for rows in (edge_rows, logical_rows):
+            for source, target, relation, weight in rows:
+                # 노드 목록에 없는 끝점(import 힌트 등)도 노드로 유지 (기존 DiGraph.add_edge 동작)
+                if source not in G:
+                    G.add_node(source)
+                if target not in G:
+                    G.add_node(target)
+                edge_merger.add(source, target, relation, weight)
 
         # [NEW] Pre-process edges to find parent-child relationships for subgraphs (Defines)
         parent_map = {}
-        for edge in edges:
-            if edge.get('type') == 'defines':
-                parent_map[edge['target']] = edge['source']
+        for source, target, relation, _ in edge_rows:
+            if relation == 'defines':
+                parent_map[target] = source
 
         # 4. 최종 JSON 변환 + Directory Hierarchy Creation
         final_nodes_map = {}
+        # 파일 경로 트라이: 파일마다 경로를 한 번만 훑어 디렉토리 계층과 집계를 함께 만듦
+        directory_tree = DirectoryTree("ROOT")
         
         # 4.1. Process existing nodes (Files, Classes, Functions)
         for nid in G.nodes:
@@ -164,7 +275,6 @@ class GraphBuilder:
             color = self._get_color(meta.get('domain', 'General'))
             
             # Size Decision
-            base_size = 20
             if meta.get('type') == 'file':
                 size = 20 + (meta.get('importance', 0.5) * 80) 
             else:
@@ -178,16 +288,14 @@ class GraphBuilder:
             # If no code-level parent (e.g., file), assign Directory Parent
             if not parent_id:
                 if node_type == 'file':
-                    # e.g., "agent/fusion.py" -> parent "agent"
-                    parts = nid.split('/')
-                    if len(parts) > 1:
-                        parent_id = "/".join(parts[:-1])
-                    else:
-                        parent_id = "ROOT"
+                    # e.g., "agent/fusion.py" -> parent "agent" (최상위 파일은 "ROOT")
+                    parent_id = directory_tree.add_file(
+                        nid, meta.get('loc', 0), meta.get('importance', 0.5), meta.get('domain', 'General')
+                    )
                 elif '::' in nid:
                      # [FIX] Force parent for functions/classes if 'defines' edge missed
                      # e.g., "server.py::do_GET" -> parent "server.py"
-                     parent_id = nid.split('::')[0]
+                     parent_id = nid.partition('::')[0]
 
             final_nodes_map[nid] = {
                 "id": nid,
@@ -200,84 +308,78 @@ class GraphBuilder:
                 "summary": meta.get('summary_text', ''),
                 "summary_details": meta.get('summary_details', {}),
                 "domain": meta.get('domain', 'General'),
-                "importance": meta.get('importance', 0.5)
+                "importance": meta.get('importance', 0.5),
+                "complexity": meta.get('complexity', 0),
+                "nesting_depth": meta.get('nesting_depth', 0)
             }
+            if node_type == 'file':
+                final_nodes_map[nid]["loc"] = meta.get('loc', 0)
             
-        # 4.2. Create Directory Nodes Recursively
-        # We need to ensure all parent directories mentioned exist
-        existing_ids = set(final_nodes_map.keys())
-        dirs_to_create = set()
-        
-        # Collect needed directories from parents
-        for node in final_nodes_map.values():
-            pid = node.get('parent')
-            if pid and pid != "ROOT" and pid not in existing_ids:
-                dirs_to_create.add(pid)
-        
-        # Recursively add missing parents of directories
-        # Use a list to iterate and append new needed parents
-        queue = list(dirs_to_create)
-        processed_dirs = set()
-        
-        while queue:
-            current_dir = queue.pop(0)
-            if current_dir in processed_dirs or current_dir in existing_ids or current_dir == "ROOT":
+        # 4.2. Create Directory Nodes (트라이 전위 순회 한 번, 부모가 먼저 생성됨)
+        # 디렉토리 집계(file_count, loc, importance_sum, dominant_domain)는 LOD 뷰/프론트엔드가 그대로 사용
+        for directory, aggregates in directory_tree.aggregate():
+            if directory.id == "ROOT":
+                # User wanted "ROOT" explicitly.
+                if "ROOT" not in final_nodes_map:
+                    final_nodes_map["ROOT"] = {
+                        "id": "ROOT",
+                        "label": "Fithub",
+                        "size": 30,
+                        "color": "#000000",
+                        "group": "Root",
+                        "type": "directory",
+                        "parent": None,
+                        **aggregates
+                    }
                 continue
-            
-            processed_dirs.add(current_dir)
-            
-            # Create Node
-            final_nodes_map[current_dir] = {
-                "id": current_dir,
-                "label": current_dir.split('/')[-1],
+            if directory.id in final_nodes_map:
+                continue
+            final_nodes_map[directory.id] = {
+                "id": directory.id,
+                "label": directory.label,
                 "size": 15,
                 "color": "#333333",
                 "group": "Directory",
                 "type": "directory",
-                "parent": "ROOT" # Default, update below
-            }
-            
-            # Determine Parent of this directory
-            parts = current_dir.split('/')
-            if len(parts) > 1:
-                parent_dir = "/".join(parts[:-1])
-                final_nodes_map[current_dir]["parent"] = parent_dir
-                if parent_dir not in existing_ids and parent_dir not in processed_dirs:
-                    queue.append(parent_dir)
-            else:
-                final_nodes_map[current_dir]["parent"] = "ROOT"
-
-        # 4.3. Add ROOT Node explicitly? 
-        # User wanted "ROOT" explicitly.
-        if "ROOT" not in existing_ids:
-             final_nodes_map["ROOT"] = {
-                "id": "ROOT",
-                "label": "Fithub",
-                "size": 30,
-                "color": "#000000",
-                "group": "Root",
-                "type": "directory",
-                "parent": None
+                "parent": directory.parent,
+                **aggregates
             }
             
         final_nodes = list(final_nodes_map.values())
         
         # Add 'structure' edges for new directory hierarchy
-        final_edges = [{"source": u, "target": v, "type": d.get("type", "physical")} for u, v, d in G.edges(data=True)]
-        
-        # Add edges for implicit parent-child relationships (that aren't in G)
+        # (defines 엣지가 이미 있는 부모-자식 쌍은 같은 엣지에 structure 관계만 추가됨)
         for node in final_nodes:
             if node['parent']:
-                # Ensure parent exists (it should by now)
-                # Avoid duplicates if G already had edge? G likely didn't have directory edges.
-                final_edges.append({
-                    "source": node['parent'],
-                    "target": node['id'],
-                    "type": "structure"
-                })
+                edge_merger.add(node['parent'], node['id'], "structure")
+        final_edges = edge_merger.to_dicts()
+
+        # 5. 좌표 사전 계산 (브라우저 force simulation 생략, 이전 실행 좌표 재사용)
+        if Config.USE_SERVER_LAYOUT:
+            self._apply_layout(final_nodes, final_edges, repo_path, repo_id)
 
         return {"nodes": final_nodes, "edges": final_edges}
 
+    def _apply_layout(self, final_nodes, final_edges, repo_path=None, repo_id=None):
+        cache = get_graph_cache() if (repo_path or repo_id) else None
+        repo = repo_identity(repo_path or "", repo_id)
+        previous = cache.get_layout(repo) if cache is not None else None
+        try:
+            layout = compute_layout(
+                final_nodes, final_edges, previous,
+                iterations=Config.LAYOUT_MAX_ITER, window=Config.LAYOUT_REPULSION_WINDOW,
+            )
+        except Exception as e:
+            logger.warning(f"Server-side layout failed; client will lay out the graph: {e}")
+            return
+
+        for node in final_nodes:
+            node["x"], node["y"] = layout[node["id"]]
+        if cache is not None:
+            cache.put_layout(repo, layout)
+        reused = sum(1 for nid in layout if previous and nid in previous)
+        logger.info(f"Computed layout for {len(layout)} nodes ({reused} reused from previous run).")
+
     def _get_color(self, domain):
         colors = {
             "Security": "#FF5733", "User": "#33FF57",
@@ -16,6 +16,8 @@ except ImportError:
     OpenAI = None
 
 from agent.config import Config
+from mcp.semantic_embedding.hashing import HASHING_BACKEND
+from .layer_rules import LayerRules
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +26,8 @@ class RepositoryAnalyzer:
         self.provider = Config.LLM_PROVIDER
         self.client = None
         self.model_id = None
+        # 규칙 기반 계층 판별/논리 엣지 규칙 표 (프리셋 + 선택 JSON 규칙 파일)
+        self.layer_rules = LayerRules.from_presets(Config.LAYER_RULE_PRESETS, Config.LAYER_RULES_FILE)
         
         if self.provider == "openai":
             api_key = Config.OPENAI_API_KEY
@@ -198,16 +202,8 @@ Return JSON format:
             elif any(k in node_id or k in summary for k in ['db', 'model', 'entity', 'schema']):
                 domain = "Database"
 
-            # --- Layer Analysis ---
-            layer = "Other"
-            if any(k in node_id for k in ["service", "manager", "business"]):
-                layer = "ServiceLayer"
-            elif any(k in node_id for k in ["repo", "dao", "store", "db"]):
-                layer = "RepositoryLayer"
-            elif any(k in node_id for k in ["controller", "route", "view", "api"]):
-                layer = "PresentationLayer"
-            elif any(k in node_id for k in ["model", "dto", "schema"]):
-                layer = "DomainLayer"
+            # --- Layer Analysis (규칙 표의 경로 키워드) ---
+            layer = self.layer_rules.classify(node_id)
 
             # --- Importance Hint ---
             importance = "Medium"
@@ -223,7 +219,7 @@ Return JSON format:
             # 논리적 엣지 계산을 위해 정보 모으기
             processed_nodes.append({
                 "id": node['id'],
-                "stem": self._extract_stem(node['id']),
+                "stem": self.layer_rules.stem(node['id']),
                 "layer": layer,
                 "domain": domain
             })
@@ -244,8 +240,12 @@ Return JSON format:
             logger.warning("No valid nodes provided for vector analysis.")
             return []
 
-        # 벡터가 있는 노드만 필터링
-        valid_nodes = [n for n in nodes if n.get("embedding") is not None]
+        # 벡터가 있는 노드만 필터링 (Degraded mode의 hashing 벡터는 모델 공간이 아니므로 제외)
+        valid_nodes = [
+            n for n in nodes
+            if n.get("embedding") is not None and len(n.get("embedding")) > 0
+            and n.get("embedding_backend") != HASHING_BACKEND
+        ]
         
         if len(valid_nodes) < 2:
             return []
@@ -298,30 +298,12 @@ Return JSON format:
             logger.error(f"Vector analysis failed: {e}")
             return []
 
-    def _extract_stem(self, filename: str) -> str:
-        base = filename.split('/')[-1].replace('.py', '').lower()
-        suffixes = ['_service', '_controller', '_repository', '_repo', '_model', '_dto', '_view', 'service', 'controller']
-        for suffix in suffixes:
-            if base.endswith(suffix):
-                return base.replace(suffix, '')
-        return base
-
     def _detect_logical_edges(self, nodes: List[Dict]) -> List[Dict]:
-        edges = []
-        for i, src in enumerate(nodes):
-            for j, tgt in enumerate(nodes):
-                if i == j: continue
-
-                # 규칙 1: 아키텍처 계층 연결
-                if src['stem'] == tgt['stem'] and len(src['stem']) > 2:
-                    if src['layer'] == "PresentationLayer" and tgt['layer'] == "ServiceLayer":
-                        edges.append(self._create_edge(src['id'], tgt['id'], "architectural_flow"))
-                    elif src['layer'] == "ServiceLayer" and tgt['layer'] == "RepositoryLayer":
-                        edges.append(self._create_edge(src['id'], tgt['id'], "data_access"))
-                    elif src['layer'] == "ServiceLayer" and tgt['layer'] == "DomainLayer":
-                        edges.append(self._create_edge(src['id'], tgt['id'], "uses_model"))
-
-        return edges
+        # 규칙 1: 아키텍처 계층 연결 (같은 stem 그룹 안에서만 비교, 계층 쌍 규칙은 layer_rules 표)
+        return [
+            self._create_edge(source, target, relation)
+            for source, target, relation in self.layer_rules.detect_edges(nodes)
+        ]
 
     def _create_edge(self, src: str, tgt: str, reason: str) -> Dict:
         return {
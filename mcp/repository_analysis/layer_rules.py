@@ -0,0 +1,183 @@
+"""
+mcp/repository_analysis/layer_rules.py
+Table-driven layer tagging and stem-grouped architectural edge detection.
+
+규칙 기반 분석의 계층 판별(경로 키워드), stem 추출(접미사), 계층 간 논리 엣지 규칙을 표로 관리합니다.
+
+  - 프리셋: default (기존 규칙 그대로), spring (Java/Spring: *ServiceImpl, *Mapper, *Entity ..., 선택)
+  - 규칙 파일(JSON)로 키워드/패턴/접미사/엣지 규칙을 추가하거나 같은 계층 쌍의 관계를 덮어쓸 수 있음
+  - 키워드는 호출자가 넘긴 ID에 그대로(부분 문자열) 비교하고, 패턴(정규식)은 경로 구간/파일명 끝에 고정해 씀
+  - detect_edges(): stem별로 노드를 묶은 뒤(해시 조인) 그룹 안에서만 규칙에 맞는 계층 쌍을 연결
+    -> 노드 수 + 출력 엣지 수에 선형 (기존 전체 쌍 비교 O(N²) 대체)
+
+규칙 파일 형식:
+    {
+      "layers": {"PresentationLayer": ["handler"]},
+      "patterns": {"RepositoryLayer": ["(^|/)mappers?/"]},
+      "stem_extensions": [".kt"],
+      "stem_suffixes": ["_handler"],
+      "flows": [["PresentationLayer", "ServiceLayer", "architectural_flow"]]
+    }
+"""
+import json
+import logging
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LAYER = "Other"
+MIN_STEM_LENGTH = 3  # 이보다 짧은 stem("ui", "db" 등)은 우연한 일치가 많아 연결하지 않음
+
+PRESETS: Dict[str, Dict[str, Any]] = {
+    "default": {
+        # 먼저 나온 계층이 우선 (경로에 키워드가 포함되면 해당 계층)
+        "layers": {
+            "ServiceLayer": ["service", "manager", "business"],
+            "RepositoryLayer": ["repo", "dao", "store", "db"],
+            "PresentationLayer": ["controller", "route", "view", "api"],
+            "DomainLayer": ["model", "dto", "schema"],
+        },
+        "stem_extensions": [".py"],
+        "stem_suffixes": [
+            "_service", "_controller", "_repository", "_repo", "_model", "_dto", "_view", "service", "controller",
+        ],
+        "flows": [
+            ["PresentationLayer", "ServiceLayer", "architectural_flow"],
+            ["ServiceLayer", "RepositoryLayer", "data_access"],
+            ["ServiceLayer", "DomainLayer", "uses_model"],
+        ],
+    },
+    "spring": {
+        # UserController / UserServiceImpl / UserRepository / UserMapper / UserEntity / UserDto
+        # (소문자 ID 기준, "identity.py"/"heatmapper.py"가 걸리지 않도록 디렉토리 구간 또는 JVM 파일명 끝에 고정)
+        "patterns": {
+            "RepositoryLayer": [r"(^|/)mappers?/", r"[a-z0-9_]{3,}mapper\.(java|kt)$"],
+            "DomainLayer": [r"(^|/)entit(y|ies)/", r"[a-z0-9_]{3,}entity\.(java|kt)$"],
+        },
+        "stem_extensions": [".java", ".kt"],
+        "stem_suffixes": [
+            "serviceimpl", "restcontroller", "repository", "mapper", "dao", "entity", "dto",
+        ],
+        "flows": [
+            ["RepositoryLayer", "DomainLayer", "persists"],
+            ["PresentationLayer", "DomainLayer", "binds_dto"],
+        ],
+    },
+}
+
+
+class LayerRules:
+    """
+    계층 키워드 / stem 접미사 / (source 계층, target 계층) -> 관계 표.
+
+    Attributes:
+        layers: [(계층, 키워드 튜플, 컴파일된 패턴 튜플)] - 판별 우선순위 순
+        stem_extensions: stem에서 지우는 확장자 (기존 규칙과 같이 replace)
+        stem_suffixes: 긴 접미사부터 검사 ("serviceimpl"이 "service"보다 먼저, default만 쓰면 기존 목록 순서와 같은 결과)
+        flows: {source 계층: [(target 계층, 관계)]}
+    """
+
+    def __init__(
+        self,
+        layers: Optional[Dict[str, Sequence[str]]] = None,
+        stem_suffixes: Iterable[str] = (),
+        flows: Iterable[Sequence[str]] = (),
+    ):
+        self.layers: List[Tuple[str, Tuple[str, ...], Tuple["re.Pattern", ...]]] = []
+        self.stem_extensions: Tuple[str, ...] = ()
+        self.stem_suffixes: Tuple[str, ...] = ()
+        self._pairs: Dict[Tuple[str, str], str] = {}
+        self.flows: Dict[str, List[Tuple[str, str]]] = {}
+        self.extend({"layers": layers or {}, "stem_suffixes": list(stem_suffixes), "flows": list(flows)})
+
+    def extend(self, table: Dict[str, Any]) -> None:
+        """규칙 표를 병합합니다 (새 계층은 뒤에 추가, 같은 계층 쌍의 관계는 덮어씀)."""
+        layers = {layer: (keywords, patterns) for layer, keywords, patterns in self.layers}
+        for layer, words in (table.get("layers") or {}).items():
+            keywords, patterns = layers.get(layer, ((), ()))
+            layers[layer] = (keywords + tuple(w for w in words if w not in keywords), patterns)
+        for layer, regexes in (table.get("patterns") or {}).items():
+            keywords, patterns = layers.get(layer, ((), ()))
+            layers[layer] = (keywords, patterns + tuple(re.compile(r) for r in regexes))
+        self.layers = [(layer, keywords, patterns) for layer, (keywords, patterns) in layers.items()]
+
+        extensions = list(self.stem_extensions)
+        extensions.extend(e for e in table.get("stem_extensions") or () if e not in extensions)
+        self.stem_extensions = tuple(extensions)
+
+        suffixes = list(self.stem_suffixes)
+        suffixes.extend(s.lower() for s in table.get("stem_suffixes") or () if s.lower() not in suffixes)
+        self.stem_suffixes = tuple(sorted(suffixes, key=len, reverse=True))
+
+        for source_layer, target_layer, relation in table.get("flows") or ():
+            self._pairs[(source_layer, target_layer)] = relation
+        self.flows = {}
+        for (source_layer, target_layer), relation in self._pairs.items():
+            self.flows.setdefault(source_layer, []).append((target_layer, relation))
+
+    @classmethod
+    def from_presets(cls, names: Iterable[str] = ("default",), rules_file: Optional[str] = None) -> "LayerRules":
+        """프리셋 이름 목록 + (선택) JSON 규칙 파일로 규칙 표를 만듭니다."""
+        rules = cls()
+        for name in names:
+            preset = PRESETS.get(name)
+            if preset is None:
+                logger.warning(f"Unknown layer rule preset '{name}'. Available: {', '.join(PRESETS)}")
+                continue
+            rules.extend(preset)
+        if rules_file:
+            try:
+                with open(rules_file, "r", encoding="utf-8") as f:
+                    rules.extend(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to load layer rules from {rules_file}: {e}")
+        return rules
+
+    def classify(self, node_id: str) -> str:
+        """
+        키워드(부분 문자열)/패턴으로 계층을 판별합니다.
+        대소문자를 바꾸지 않고 그대로 비교합니다 (규칙 기반 분석은 기존처럼 소문자 ID를 넘김).
+        """
+        for layer, keywords, patterns in self.layers:
+            if any(keyword in node_id for keyword in keywords) or any(p.search(node_id) for p in patterns):
+                return layer
+        return DEFAULT_LAYER
+
+    def stem(self, node_id: str) -> str:
+        """파일 이름에서 확장자와 계층 접미사를 뗀 stem ("user_service.py" -> "user", 기존 _extract_stem과 동일)"""
+        base = node_id.split("/")[-1]
+        for extension in self.stem_extensions:
+            base = base.replace(extension, "")
+        base = base.lower()
+        for suffix in self.stem_suffixes:
+            if base.endswith(suffix):
+                return base.replace(suffix, "")  # "service.py" -> "" (연결 대상 아님)
+        return base
+
+    def detect_edges(self, nodes: Iterable[Dict[str, Any]]) -> List[Tuple[str, str, str]]:
+        """
+        같은 stem 안에서 규칙에 맞는 계층 쌍을 (source, target, 관계)로 연결합니다.
+
+        Args:
+            nodes: {"id", "stem", "layer"} 목록 (source 순서대로 출력)
+        """
+        nodes = [node for node in nodes if len(node["stem"]) >= MIN_STEM_LENGTH]
+        groups: Dict[str, Dict[str, List[str]]] = defaultdict(lambda: defaultdict(list))
+        for node in nodes:
+            groups[node["stem"]][node["layer"]].append(node["id"])
+
+        edges = []
+        for node in nodes:
+            rules = self.flows.get(node["layer"])
+            if not rules:
+                continue
+            group = groups[node["stem"]]
+            for target_layer, relation in rules:
+                edges.extend(
+                    (node["id"], target, relation)
+                    for target in group.get(target_layer, ())
+                    if target != node["id"]
+                )
+        return edges
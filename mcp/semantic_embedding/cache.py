@@ -0,0 +1,114 @@
+"""
+mcp/semantic_embedding/cache.py
+Content-hash keyed embedding cache: in-memory LRU front + on-disk float32 store.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from agent.config import Config
+from shared.cache_utils import PersistentCache, content_hash
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    동일한 입력 텍스트의 재임베딩을 막는 2단 캐시.
+
+    - 메모리 LRU: 같은 실행 안의 반복 조회 (refine 루프의 evaluate 등), float32 배열로 보관
+    - 디스크 저장소: float32 바이트로 저장되어 실행/저장소 간에 공유
+
+    get()/put()은 list[float]를 주고받고, 변환은 이 경계에서만 합니다.
+    """
+
+    def __init__(self, path: str = None, memory_entries: int = None, max_entries: int = None):
+        self.store = PersistentCache(
+            path or Config.EMBED_CACHE_PATH,
+            max_entries=max_entries or Config.EMBED_CACHE_MAX_ENTRIES,
+        )
+        self.memory_entries = memory_entries or Config.EMBED_CACHE_MEMORY_ENTRIES
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(text: str, model_id: str) -> str:
+        return content_hash(text, model_id)
+
+    def get(self, text: str, model_id: str) -> Optional[List[float]]:
+        key = self.make_key(text, model_id)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return vector.tolist()
+
+        raw = self.store.get(key)
+        if raw is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        vector = np.frombuffer(raw, dtype=np.float32)  # 읽기 전용 (공유해도 안전)
+        with self._lock:
+            self.disk_hits += 1
+            self._remember_locked(key, vector)
+        return vector.tolist()
+
+    def put(self, text: str, model_id: str, vector: List[float]) -> None:
+        key = self.make_key(text, model_id)
+        array = np.array(vector, dtype=np.float32)
+        array.setflags(write=False)
+        with self._lock:
+            self._remember_locked(key, array)
+        try:
+            self.store.put(key, array.tobytes())
+        except Exception as e:
+            logger.warning(f"Embedding cache write failed: {e}")
+
+    def _remember_locked(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        total = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "memory_size": len(self._memory),
+        }
+
+
+# 글로벌 임베딩 캐시 (임베더 인스턴스 간 공유)
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """
+    글로벌 임베딩 캐시를 가져옵니다.
+
+    Returns:
+        EmbeddingCache 인스턴스 (비활성화되었거나 열 수 없으면 None)
+    """
+    global _embedding_cache
+
+    if _embedding_cache is None and Config.USE_EMBED_CACHE:
+        try:
+            _embedding_cache = EmbeddingCache()
+        except Exception as e:
+            logger.warning(f"Embedding cache unavailable: {e}")
+            return None
+
+    return _embedding_cache
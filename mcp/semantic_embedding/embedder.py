@@ -4,139 +4,283 @@ Universal Structural Embedding using Tree-sitter & UniXcoder.
 """
 import os
 import logging
+import threading
+import time
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from huggingface_hub import InferenceClient
 
-# Tree-sitter Optional Import (Mock if missing)
-try:
-    from tree_sitter import Language, Parser
-    TREE_SITTER_AVAILABLE = True
-except ImportError:
-    TREE_SITTER_AVAILABLE = False
-    class Parser:
-        def set_language(self, lang): pass
-        def parse(self, code): return None
-    class Language:
-        def __init__(self, path, name): pass
+from agent.config import Config
+from shared.ast_utils import split_code_chunks
+from shared.tree_sitter_utils import linearize_tree, parse_code
+from .cache import get_embedding_cache
+from .hashing import HASHING_BACKEND, hashed_embedding
 
 logger = logging.getLogger(__name__)
 
-# Tree-sitter 언어 라이브러리 경로 (미리 빌드 필요)
-LIB_PATH = 'build/my-languages.so'
+# Tree-sitter 언어 라이브러리 경로 (language pack이 없을 때 사용, 미리 빌드 필요)
+LIB_PATH = Config.TREE_SITTER_LIB_PATH
+
+# 벡터를 생성한 백엔드 태그 (hashing 벡터는 모델 벡터와 같은 공간이 아니므로 하위 단계에서 구분)
+MODEL_BACKEND = "unixcoder"
+EMBED_DIM = 768
+
+def _pool_vectors(vectors: list, weights: list, backends: list) -> tuple:
+    """
+    길이 가중 평균 벡터와 백엔드를 반환합니다.
+    서로 다른 벡터 공간을 섞지 않도록, 모델 벡터가 하나라도 있으면 모델 벡터만 Pooling합니다.
+    """
+    if len(vectors) == 1:
+        return vectors[0], backends[0]
+    keep = [i for i, b in enumerate(backends) if b == MODEL_BACKEND] or list(range(len(backends)))
+    pooled = np.average(np.array([vectors[i] for i in keep]), axis=0, weights=[max(weights[i], 1) for i in keep])
+    return pooled.tolist(), backends[keep[0]]
+
+
+class CircuitBreaker:
+    """
+    임베딩 API 단기 차단기.
+    연속 실패가 failure_threshold회에 도달하면 cooldown초 동안 열려(open) API 호출을 건너뛰고,
+    cooldown이 지나면 한 건만 시험 호출(half-open)해 성공하면 닫고 실패하면 다시 엽니다.
+    """
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """이번 입력에 API를 호출해도 되는지 (열려 있으면 False)"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            self._probing = True  # half-open: 시험 호출 1건만 통과
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(f"Embedding API circuit opened for {self.cooldown:.0f}s after {self._failures} failures.")
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+
+_breaker = None
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """프로세스 전역 차단기 (임베더는 단계마다 새로 만들어지므로 상태를 여기 보관)"""
+    global _breaker
+    if _breaker is None:
+        _breaker = CircuitBreaker(Config.EMBED_BREAKER_FAILURES, Config.EMBED_BREAKER_COOLDOWN)
+    return _breaker
+
 
 class UniversalEmbedder:
     def __init__(self, device=None):
         token = os.getenv("HF_API_KEY")
         self.client = InferenceClient(token=token)
-        self.parser = Parser()
 
         # UniXcoder: 코드와 AST 구조를 동시에 이해하는 MS의 모델
         self.model_id = "microsoft/unixcoder-base"
 
-    def _get_language(self, ext: str):
-        """확장자에 따른 Tree-sitter 언어 로드"""
-        if not TREE_SITTER_AVAILABLE:
-            return None
-            
-        mapping = {
-            '.py': 'python', '.js': 'javascript', '.java': 'java',
-            '.go': 'go', '.cpp': 'cpp', '.rs': 'rust', '.ts': 'typescript'
-        }
-        lang_name = mapping.get(ext)
-        if lang_name:
-            try:
-                # 실제 구현시엔 미리 로드된 객체를 재사용해야 함
-                # 라이브러리 파일이 없으면 에러가 날 수 있음
-                if os.path.exists(LIB_PATH):
-                    return Language(LIB_PATH, lang_name)
-            except Exception:
-                pass
-        return None
+        # 콘텐츠 해시 키 임베딩 캐시 (메모리 LRU + 디스크 float32)
+        self.cache = get_embedding_cache()
+        self.breaker = get_circuit_breaker()
 
     def _linearize_ast(self, node) -> str:
         """
         [핵심] AST 트리를 텍스트 시퀀스로 평탄화 (Linearization)
+        반복 순회 + 예산 도달 시 조기 종료 (비용은 파일 크기가 아닌 EMBED_AST_MAX_CHARS에 비례)
         """
-        if not node:
-            return ""
-            
-        if len(node.children) == 0:
-            # 리프 노드면 텍스트 반환 (너무 길면 생략)
-            text = node.text.decode('utf-8')
-            return text if len(text) < 20 else "..."
-
-        # 자식 노드 재귀 호출
-        children_str = " ".join([self._linearize_ast(child) for child in node.children])
-        return f"({node.type} {children_str})"
+        return linearize_tree(
+            node,
+            max_chars=Config.EMBED_AST_MAX_CHARS,
+            named_only=Config.EMBED_AST_NAMED_ONLY,
+        )
+
+    def _build_input(self, code: str, ext: str, max_chars: int = None) -> str:
+        """입력 텍스트 구성: [코드(max_chars까지, 기본 EMBED_CHUNK_CHARS)] + <SEP> + [구조(Linearized AST)]"""
+        structure_info = ""
+        # 프로세스 전역 Language + 스레드별 Parser 재사용 (배치 임베딩 스레드에서도 안전)
+        tree = parse_code(code, ext, LIB_PATH) if Config.USE_TREE_SITTER else None
+        if tree:
+            structure_info = self._linearize_ast(tree.root_node)
+
+        return f"{code[:max_chars or Config.EMBED_CHUNK_CHARS]} <SEP> {structure_info}"
+
+    def _request_vector(self, text: str) -> list:
+        """임베딩 API 호출 + Pooling (CLS token or Mean)"""
+        response = self.client.feature_extraction(
+            text,
+            model=self.model_id
+        )
+        arr = np.array(response)
+        if len(arr.shape) == 3: vector = np.mean(arr[0], axis=0)
+        elif len(arr.shape) == 2: vector = np.mean(arr, axis=0)
+        else: vector = arr
+        return vector.tolist()
 
     def generate_fused_vector(self, code: str, filename: str) -> list[float]:
         """
         코드 + 구조(AST)를 결합한 임베딩 생성
         """
         _, ext = os.path.splitext(filename)
+        combined_input = self._build_input(code, ext)
+        return self._embed_inputs([combined_input])[0]
 
-        # 1. AST 구조 추출 (Linearized AST)
-        structure_info = ""
-        lang = self._get_language(ext)
-
-        if lang:
-            self.parser.set_language(lang)
-            tree = self.parser.parse(bytes(code, "utf8"))
-            if tree:
-                structure_info = self._linearize_ast(tree.root_node)[:512]
-
-        # 2. 입력 텍스트 구성: [코드] + <SEP> + [구조]
-        combined_input = f"{code[:512]} <SEP> {structure_info}"
-
-        try:
-            # 3. 임베딩 API 호출
-            response = self.client.feature_extraction(
-                combined_input,
-                model=self.model_id
-            )
+    def _embed_inputs(self, inputs: list, with_backend: bool = False) -> list:
+        """
+        여러 입력을 임베딩합니다.
+        배치 안의 동일 입력은 한 번만, 캐시에 있는 입력은 요청 없이 처리하고
+        나머지만 EMBED_BATCH_SIZE 단위로 동시에 요청합니다 (API는 단건 호출만 지원).
 
-            # Pooling Logic (CLS token or Mean)
-            arr = np.array(response)
-            if len(arr.shape) == 3: vector = np.mean(arr[0], axis=0)
-            elif len(arr.shape) == 2: vector = np.mean(arr, axis=0)
-            else: vector = arr
+        API 실패 시에는 결정적인 hashing 벡터로 대체하며, 이 벡터는 캐시에 저장하지 않습니다.
+        연속 실패로 차단기가 열려 있는 동안은 API를 호출하지 않고 바로 hashing 벡터를 씁니다.
+        with_backend=True이면 (vector, backend) 튜플 리스트를 반환합니다.
+        """
+        results = {}
+        missing = []
+        for text in dict.fromkeys(inputs):
+            cached = self.cache.get(text, self.model_id) if self.cache else None
+            if cached is not None:
+                results[text] = (cached, MODEL_BACKEND)
+            else:
+                missing.append(text)
+
+        def embed_one(text):
+            if self.breaker.allow():
+                try:
+                    vector = self._request_vector(text)
+                    self.breaker.record_success()
+                    return vector, MODEL_BACKEND
+                except Exception:
+                    self.breaker.record_failure()
+            # Degraded mode: 재현 가능한 토큰/AST n-gram 해싱 벡터
+            return hashed_embedding(text, EMBED_DIM), HASHING_BACKEND
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=Config.EMBED_BATCH_SIZE) as pool:
+                for text, (vector, backend) in zip(missing, pool.map(embed_one, missing)):
+                    results[text] = (vector, backend)
+                    if backend == MODEL_BACKEND and self.cache:
+                        self.cache.put(text, self.model_id, vector)
 
-            return vector.tolist()
+            degraded = sum(1 for text in missing if results[text][1] == HASHING_BACKEND)
+            if degraded:
+                logger.warning(f"Embedding API unavailable for {degraded}/{len(missing)} inputs; using hashing fallback.")
 
-        except Exception as e:
-            # logger.warning(f"Embedding failed: {e}")
-            # Mocking for verification if API fails
-            return np.random.rand(768).tolist()
+        if with_backend:
+            return [results[text] for text in inputs]
+        return [results[text][0] for text in inputs]
+
+    def cache_stats(self) -> dict:
+        """임베딩 캐시 적중/미스 통계 (캐시 크기 조정용)"""
+        return self.cache.stats() if self.cache else {}
 
     def batch_embed(self, snippets: list, model_name: str = "graphcodebert") -> list:
         """
         여러 코드 조각에 대한 임베딩 생성 (Batch)
         """
-        results = []
+        inputs = [self._build_input(s['code'], os.path.splitext(s['id'])[1]) for s in snippets]
+        tagged = self._embed_inputs(inputs, with_backend=True)
+        return [
+            {"id": s['id'], "embedding": v, "embedding_backend": backend}
+            for s, (v, backend) in zip(snippets, tagged)
+        ]
+
+    def batch_embed_chunked(self, snippets: list) -> list:
+        """
+        [Chunked] 파일을 함수/클래스(또는 슬라이딩 윈도우) 청크로 나누어 임베딩하고,
+        청크 벡터와 길이 가중 평균(Pooled) 파일 벡터를 함께 반환합니다.
+
+        Returns:
+            [{"id": file_id, "embedding": pooled, "chunks": [chunk_id, ...]},
+             {"id": "file::name", "parent": file_id, "level": "function", "lines": [s, e], "embedding": ...}, ...]
+        """
+        # 1. 모든 파일의 청크를 모아 한 번에 배치 처리
+        # 청크 크기를 넘는 청크(큰 최상위 함수 등)는 요약 단계처럼 윈도우로 나눠 전부 임베딩
+        size = Config.EMBED_CHUNK_CHARS
+        plan = []
+        inputs = []
         for snippet in snippets:
-            vector = self.generate_fused_vector(snippet['code'], snippet['id'])
+            file_id = snippet['id']
+            ext = os.path.splitext(file_id)[1]
+            chunks = split_code_chunks(snippet['code'], ext, size) or [
+                {"name": "<module>", "type": "module", "start_line": 1, "end_line": 1, "code": snippet['code']}
+            ]
+            for chunk in chunks:
+                code = chunk["code"]
+                windows = [code[start:start + size] for start in range(0, len(code), size)] or [code]
+                plan.append((file_id, chunk, len(inputs), [len(w) for w in windows]))
+                inputs.extend(self._build_input(window, ext, size) for window in windows)
+
+        tagged = self._embed_inputs(inputs, with_backend=True)
+
+        # 2. 청크별 윈도우 벡터 -> 파일별 청크 벡터 집계
+        results = []
+        file_entries = {}
+        for file_id, chunk, first, window_sizes in plan:
+            window_tags = tagged[first:first + len(window_sizes)]
+            vector, backend = _pool_vectors(
+                [v for v, _ in window_tags], window_sizes, [b for _, b in window_tags]
+            )
+            entry = file_entries.get(file_id)
+            if entry is None:
+                entry = {"id": file_id, "chunks": [], "_vectors": [], "_weights": [], "_backends": []}
+                file_entries[file_id] = entry
+                results.append(entry)
+
+            chunk_id = f"{file_id}::{chunk['name']}"
+            entry["chunks"].append(chunk_id)
+            entry["_vectors"].append(vector)
+            entry["_weights"].append(max(len(chunk["code"]), 1))
+            entry["_backends"].append(backend)
             results.append({
-                "id": snippet['id'],
-                "embedding": vector
+                "id": chunk_id,
+                "parent": file_id,
+                "level": chunk["type"],
+                "lines": [chunk["start_line"], chunk["end_line"]],
+                "embedding": vector,
+                "embedding_backend": backend
             })
+
+        for entry in file_entries.values():
+            entry["embedding"], entry["embedding_backend"] = _pool_vectors(
+                entry.pop("_vectors"), entry.pop("_weights"), entry.pop("_backends")
+            )
+
         return results
 
+    def embed_texts(self, texts: list, with_backend: bool = False) -> list:
+        """
+        여러 텍스트 임베딩을 한 번에 생성 (중복 제거 + 캐시 적용)
+        """
+        limit = Config.EMBED_CHUNK_CHARS
+        return self._embed_inputs([text[:limit] for text in texts], with_backend=with_backend)
+
     def _generate_embedding(self, text: str, model_name: str) -> list:
         """
         단일 텍스트 임베딩 생성 (Evaluate 단계에서 사용)
         """
-        try:
-            response = self.client.feature_extraction(
-                text[:512],
-                model=self.model_id
-            )
-            arr = np.array(response)
-            if len(arr.shape) == 3: vector = np.mean(arr[0], axis=0)
-            elif len(arr.shape) == 2: vector = np.mean(arr, axis=0)
-            else: vector = arr
-            return vector.tolist()
-        except Exception:
-            return np.random.rand(768).tolist()
+        return self.embed_texts([text])[0]
 
 def create_embedder(device=None):
     return UniversalEmbedder(device)
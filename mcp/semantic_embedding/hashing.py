@@ -0,0 +1,62 @@
+"""
+mcp/semantic_embedding/hashing.py
+Deterministic degraded-mode embedder (feature hashing over token / AST n-grams).
+
+임베딩 API를 사용할 수 없을 때 np.random 대신 사용하는 CPU 전용 폴백입니다.
+같은 입력은 항상 같은 벡터를 만들기 때문에 결과가 재현 가능하고 캐시를 오염시키지 않습니다.
+입력에 포함된 Linearized AST("(function_definition ...)")의 노드 타입도 토큰으로 취급되어
+구조 n-gram 특징이 함께 반영됩니다.
+"""
+import math
+import re
+import zlib
+from typing import Dict, List
+
+HASHING_BACKEND = "hashing"
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|\d+|[^\sA-Za-z0-9_]")
+SUBTOKEN_PATTERN = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+
+def _tokens(text: str) -> List[str]:
+    tokens = []
+    for tok in TOKEN_PATTERN.findall(text):
+        tokens.append(tok.lower())
+        # 식별자는 camelCase / snake_case 하위 토큰도 추가 (getUserName -> get, user, name)
+        if len(tok) > 3 and (tok[0].isalpha() or tok[0] == "_"):
+            subs = SUBTOKEN_PATTERN.findall(tok)
+            if len(subs) > 1:
+                tokens.extend(sub.lower() for sub in subs)
+    return tokens
+
+
+def hashed_embedding(text: str, dim: int = 768, ngram: int = 2) -> List[float]:
+    """
+    토큰 1~n-gram을 해싱하여 고정 차원의 L2 정규화 벡터를 생성합니다.
+
+    Args:
+        text: 입력 텍스트 (코드 + <SEP> + 구조)
+        dim: 출력 차원 (모델 벡터와 같은 768 차원 유지)
+        ngram: 최대 n-gram 길이
+
+    Returns:
+        길이 dim의 float 리스트
+    """
+    tokens = _tokens(text)
+    counts: Dict[str, int] = {}
+    for n in range(1, ngram + 1):
+        for i in range(len(tokens) - n + 1):
+            feature = " ".join(tokens[i:i + n])
+            counts[feature] = counts.get(feature, 0) + 1
+
+    vector = [0.0] * dim
+    for feature, count in counts.items():
+        h = zlib.crc32(feature.encode("utf-8"))
+        # 부호 해싱으로 충돌에 의한 편향 완화, 빈도는 sublinear(log) 가중
+        sign = 1.0 if (h >> 31) & 1 else -1.0
+        vector[h % dim] += sign * (1.0 + math.log(count))
+
+    norm = math.sqrt(sum(v * v for v in vector))
+    if norm > 0:
+        vector = [v / norm for v in vector]
+    return vector
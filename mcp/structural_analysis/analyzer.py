@@ -1,70 +1,193 @@
 """
 mcp/structural_analysis/analyzer.py
-Multi-language Structural Analysis using Robust Regex Patterns.
+Multi-language Structural Analysis using Tree-sitter with Robust Regex Fallback.
 Supports: Python, JavaScript, TypeScript, Java, Go, C++
 """
+import bisect
 import logging
 import re
 import os
+import time
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+from agent.config import Config
+from shared.file_utils import count_lines, select_files
+from shared.graph_utils import CompactGraph
+from shared.symbol_utils import SymbolTable
+from shared.tree_sitter_utils import LANGUAGE_BY_EXT, get_language, parse_code, node_text
+
 logger = logging.getLogger(__name__)
 
+# 정의 패턴에 걸리지만 실제로는 제어문/키워드인 이름
+KEYWORDS = frozenset({
+    "if", "for", "while", "switch", "catch", "return", "function", "else", "elif",
+    "new", "throw", "sizeof", "do", "try", "with", "typeof", "await", "yield", "delete",
+})
+# 메서드 형태(이름 + "(")의 이름 자리에서 키워드를 정규식 단계에서 거름 ("if (x) {"가 매치로 소비되지 않도록)
+_NOT_KEYWORD = r"(?!(?:" + "|".join(sorted(KEYWORDS)) + r")\b)"
+
+
+def _branch_pattern(keywords, operators=()) -> str:
+    """
+    분기 토큰 패턴: 선두 문자 집합으로 시작해 정규식 엔진이 나머지 위치를 빠르게 건너뛰고,
+    나머지 글자와 단어 경계(앞/뒤)는 선두 문자를 소비한 뒤 검사합니다.
+    예: ("if", "for"), ("&&",) -> [&fi](?:(?<=&)&|(?<![\\w$].)(?:(?<=i)f|(?<=f)or)\\b)
+    """
+    heads = "".join(sorted({re.escape(token[0]) for token in (*keywords, *operators)}))
+    tails = [f"(?<={re.escape(op[0])}){re.escape(op[1:])}" for op in operators]
+    words = "|".join(f"(?<={re.escape(word[0])}){re.escape(word[1:])}" for word in keywords)
+    tails.append(rf"(?<![\w$].)(?:{words})\b")
+    return f"[{heads}](?:{'|'.join(tails)})"
+
+
 class LanguageConfig:
     """
     언어별 파싱 규칙 정의 (Regex Patterns)
     Tree-sitter 없이도 주요 구조를 추출하기 위한 경량화된 접근법입니다.
+
+    각 패턴은 정의 시작 위치(줄 시작, 들여쓰기 이후)에서만 시도됩니다 (DEFINITION_START).
+    스캔 대상 앞에 "\n"을 붙이고 패턴을 구분 문자로 시작하게 해, 정규식 엔진이
+    줄 시작이 아닌 위치를 문자 검사 한 번으로 건너뜁니다. 정의가 될 수 없는 줄
+    (빈 줄, "}", 주석 등)은 선두 문자 lookahead에서 바로 탈락합니다.
+    JS/TS는 minified 번들을 위해 ";", "{", "}" 뒤도 정의 시작으로 봅니다 ("start").
+    인접한 반복 구간은 서로 겹치지 않는 문자 클래스를 사용하므로,
+    minified/생성 코드에서도 역추적 비용이 줄 길이에 선형입니다.
     """
+    _DEFINITION_HEAD = r"[ \t]*(?=[^\s{}()/*;,])"
+    DEFINITION_START = r"\n" + _DEFINITION_HEAD
+    _STATEMENT_START = r"[\n;{}]" + _DEFINITION_HEAD
+
+    _IDENT = r"[A-Za-z_$][\w$]*"
+    _JS_FUNCTION = (
+        r"(?:export[ \t]+(?:default[ \t]+)?)?(?:async[ \t]+)?function\*?[ \t]*(" + _IDENT + r")"
+        r"|(?:export[ \t]+)?(?:const|let|var)[ \t]+(" + _IDENT + r")[ \t]*=[ \t]*(?:async[ \t]*)?"
+        # 화살표 함수: 한 줄 인자 목록, 포매터가 줄바꿈한 인자 목록 (괄호 없는 500자 이내), "(" 뒤 바로 줄바꿈
+        r"(?:function\b|\([^()]{0,500}\)[ \t]*(?::[^=;\n]*)?=>|\([ \t]*\r?\n|" + _IDENT + r"[ \t]*=>)"
+    )
+    _JS_IMPORT = (
+        r"import[ \t][^'\";\n]*['\"]([^'\"\n]+)['\"]"
+        r"|(?:export[ \t]+)?(?:const|let|var)[ \t]+[^=;\n]*=[ \t]*require\([ \t]*['\"]([^'\"\n]+)['\"]"
+    )
+
+    # 순환 복잡도 집계용 분기 토큰 (줄 중간에서도 매칭, 정의 패턴과 별도 스캔)
+    _C_BRANCH = _branch_pattern(("if", "for", "while", "case", "catch"), ("&&", "||"))
+
     PATTERNS = {
         ".py": {
             "name": "Python",
-            "function": r"def\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(",
-            "class": r"class\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*[:\(]",
-            "import": r"^(?:import|from)\s+([a-zA-Z0-9_\.]+)"
+            "function": r"(?:async[ \t]+)?def[ \t]+([A-Za-z_]\w*)",
+            "class": r"class[ \t]+([A-Za-z_]\w*)",
+            "import": r"from[ \t]+([\w\.]+)[ \t]+import|import[ \t]+([\w\.]+)",
+            "branch": _branch_pattern(("if", "elif", "for", "while", "except", "and", "or"))
         },
         ".js": {
             "name": "JavaScript",
-            "function": r"(?:function\s+([a-zA-Z0-9_]+)|const\s+([a-zA-Z0-9_]+)\s*=\s*(?:async\s*)?\(|([a-zA-Z0-9_]+)\s*\([^)]*\)\s*\{)",
-            "class": r"class\s+([a-zA-Z_][a-zA-Z0-9_]*)",
-            "import": r"(?:import\s+.*?from\s+['\"](.*?)['\"]|require\(['\"](.*?)['\"]\))"
+            "start": _STATEMENT_START,
+            "function": _JS_FUNCTION +
+                r"|(?:(?:static|async|get|set)[ \t]+)*" + _NOT_KEYWORD + r"(" + _IDENT + r")[ \t]*\([^()\n]*\)[ \t]*\{",
+            "class": r"(?:export[ \t]+(?:default[ \t]+)?)?class[ \t]+(" + _IDENT + r")",
+            "import": _JS_IMPORT,
+            "branch": _C_BRANCH
         },
         ".ts": {
             "name": "TypeScript",
-            "function": r"(?:function\s+([a-zA-Z0-9_]+)|const\s+([a-zA-Z0-9_]+)\s*=\s*(?:async\s*)?\(|([a-zA-Z0-9_]+)\s*\(.*?\)\s*[:\{])",
-            "class": r"class\s+([a-zA-Z_][a-zA-Z0-9_]*)",
-            "import": r"(?:import\s+.*?from\s+['\"](.*?)['\"]|require\(['\"](.*?)['\"]\))"
+            "start": _STATEMENT_START,
+            "function": _JS_FUNCTION +
+                r"|(?:(?:public|private|protected|static|async|readonly|abstract|get|set)[ \t]+)*"
+                + _NOT_KEYWORD + r"(" + _IDENT + r")[ \t]*(?:<[^<>()\n]*>)?\([^()\n]*\)[ \t]*(?::[^{;\n]*)?\{",
+            "class": r"(?:export[ \t]+(?:default[ \t]+)?)?(?:abstract[ \t]+)?(?:class|interface|enum)[ \t]+(" + _IDENT + r")",
+            "import": _JS_IMPORT,
+            "branch": _C_BRANCH
         },
         ".java": {
             "name": "Java",
-            "function": r"(?:public|protected|private|static|\s) +[\w\<\>\[\]]+\s+([a-zA-Z0-9_]+)\s*\(",
-            "class": r"class\s+([a-zA-Z_][a-zA-Z0-9_]*)",
-            "import": r"import\s+([a-zA-Z0-9_\.]+);"
+            "function": r"(?:(?:public|protected|private|static|final|abstract|synchronized|native|default)[ \t]+)*"
+                        r"(?:<[^()\n]*>[ \t]+)?(?!(?:return|new|throw|else|case)\b)[\w$.]+(?:<[\w$.,?<> \t]*>)?(?:\[\])*"
+                        r"[ \t]+(" + _IDENT + r")[ \t]*\("
+                        # 접근 제한자 없는 생성자: Svc(Repo r) {
+                        r"|([A-Z][\w$]*)[ \t]*\([^()\n]*\)[ \t]*(?:throws[ \t][^{;\n]*)?\{",
+            "class": r"(?:(?:public|protected|private|static|final|abstract|sealed)[ \t]+)*(?:class|interface|enum|record)[ \t]+(" + _IDENT + r")",
+            "import": r"import[ \t]+(?:static[ \t]+)?([\w\.]+)[ \t]*;",
+            "branch": _C_BRANCH
         },
         ".go": {
             "name": "Go",
-            "function": r"func\s+([a-zA-Z0-9_]+)\s*\(",
-            "class": r"type\s+([a-zA-Z0-9_]+)\s+struct",
-            "import": r"import\s+[\"\(](.*?)[\"\)]"
+            "function": r"func[ \t]+(?:\([^()\n]*\)[ \t]*)?([A-Za-z_]\w*)[ \t]*[\[(]",
+            "class": r"type[ \t]+([A-Za-z_]\w*)[ \t]+(?:struct|interface)\b",
+            "import": r"(?:import[ \t]+)?(?:[A-Za-z_.]\w*[ \t]+)?\"([^\"\n]+)\"[ \t]*$",
+            "branch": _branch_pattern(("if", "for", "case"), ("&&", "||"))
         },
         ".cpp": {
             "name": "C++",
-            "function": r"\w+\s+([a-zA-Z0-9_]+)\s*\(",
-            "class": r"class\s+([a-zA-Z0-9_]+)",
-            "import": r"#include\s+[<\"](.*?)[>\"]"
+            "function": r"(?:(?:static|inline|virtual|extern|constexpr|explicit)[ \t]+)*"
+                        r"[A-Za-z_][\w:<>,]*[ \t*&]+" + _NOT_KEYWORD + r"([A-Za-z_~][\w:~]*)[ \t]*\([^()\n]*\)[ \t\w]*(?:\{|$)",
+            "class": r"(?:class|struct)[ \t]+([A-Za-z_]\w*)[ \t]*(?:final[ \t]*)?(?::|\{|$)",
+            "import": r"#[ \t]*include[ \t]*[<\"]([^>\"\n]+)[>\"]",
+            "branch": _C_BRANCH
         }
     }
 
+    KEYWORDS = KEYWORDS  # 모듈 상수 (정규식 _NOT_KEYWORD와 같은 집합)
+
+    # 같은 문법 계열 확장자는 같은 정규식 규칙 사용 (Tree-sitter 문법이 없을 때의 fallback)
+    ALIASES = {".jsx": ".js", ".mjs": ".js", ".cjs": ".js", ".tsx": ".ts", ".cc": ".cpp", ".hpp": ".cpp"}
+
+    KINDS = ("function", "class", "import")
+    _compiled: Dict[str, Any] = {}
+
     @staticmethod
     def get_config(ext: str):
-        return LanguageConfig.PATTERNS.get(ext)
+        return LanguageConfig.PATTERNS.get(LanguageConfig.ALIASES.get(ext, ext))
+
+    @staticmethod
+    def language_name(ext: str) -> Optional[str]:
+        """표시용 언어 이름 (정규식 규칙이 없으면 Tree-sitter 문법 이름, 예: "rust")"""
+        config = LanguageConfig.get_config(ext)
+        return config["name"] if config else LANGUAGE_BY_EXT.get(ext)
+
+    @classmethod
+    def get_scanner(cls, ext: str):
+        """
+        언어별 통합 스캐너를 반환합니다 (최초 1회 컴파일 후 캐시).
+
+        function/class/import 패턴을 공통 정의 시작 접두사 뒤의 named-group alternation으로
+        합쳐 정의를 한 번에 훑습니다. branch 토큰은 별도 패턴으로 스캔합니다
+        (모든 위치에서 시도되는 분기 alternation이 정의 스캔의 구분 문자 건너뛰기를 막지 않도록).
+
+        Returns:
+            (정의 패턴, {kind: (첫 내부 그룹 인덱스, 끝 인덱스)}, 분기 패턴 또는 None) 또는 None
+        """
+        if ext in cls._compiled:
+            return cls._compiled[ext]
+
+        config = cls.get_config(ext)
+        scanner = None
+        if config:
+            parts, spans, index = [], {}, 1
+            for kind in cls.KINDS:
+                pattern = config[kind]
+                group_count = re.compile(pattern).groups
+                parts.append(f"(?P<{kind}>{pattern})")
+                spans[kind] = (index + 1, index + 1 + group_count)
+                index += 1 + group_count
+            combined = config.get("start", cls.DEFINITION_START) + "(?:" + "|".join(parts) + ")"
+            branch = re.compile(config["branch"]) if config.get("branch") else None
+            scanner = (re.compile(combined, re.MULTILINE), spans, branch)
+        cls._compiled[ext] = scanner
+        return scanner
 
 class PolyglotParser:
-    """다국어 지원 정규식 파서"""
-    def __init__(self, file_path: str):
+    """다국어 지원 정규식 파서 (언어별 통합 스캐너: 정의 1패스 + 분기 토큰 1패스)"""
+    # 시간 제한 검사 간격 (매치 수)
+    TIME_CHECK_INTERVAL = 256
+
+    def __init__(self, file_path: str, time_limit: Optional[float] = None):
         self.file_path = Path(file_path)
         self.config = LanguageConfig.get_config(self.file_path.suffix)
+        self.time_limit = time_limit if time_limit is not None else Config.REGEX_PARSE_TIME_LIMIT
         self.content = ""
+        self.truncated = False
 
         if self.config:
             try:
@@ -75,172 +198,493 @@ class PolyglotParser:
 
     def parse(self, file_id: str) -> Dict[str, List[Dict]]:
         """노드(함수/클래스)와 엣지(Import/Define) 추출"""
-        if not self.config or not self.content:
+        scanner = LanguageConfig.get_scanner(self.file_path.suffix)
+        if not scanner or not self.content:
             return {"nodes": [], "edges": []}
 
+        pattern, spans, branch_pattern = scanner
+        content = "\n" + self.content  # 첫 줄도 "\n" 뒤 정의 시작이 되도록 (위치는 이 문자열 기준)
         nodes = []
         edges = []
+        seen_nodes = set()
+        seen_imports = set()
+        deadline = time.monotonic() + self.time_limit
 
-        # 1. 함수 추출 (Function Definitions)
-        # 정규식은 여러 그룹 중 매칭된 하나를 찾아야 함
-        for match in re.finditer(self.config["function"], self.content, re.MULTILINE):
-            func_name = next((g for g in match.groups() if g), "unknown")
-            func_node_id = f"{file_id}::{func_name}"
-
-            nodes.append({
-                "id": func_node_id,
-                "type": "function",
-                "label": func_name,
-                "language": self.config["name"]
-            })
+        # 복잡도 추정: 분기는 직전에 정의된 함수(와 그 소속 클래스)에 귀속, 중첩 깊이는 들여쓰기로 추정
+        file_metrics = {"complexity": 1, "nesting_depth": 0}
+        current_func = current_class = func_class = None  # func_class: 현재 함수의 소속 클래스
+        func_indent = class_indent = 0
+        indent_unit = 0
+        line_start, line_end, line_indent = 0, 0, 0
 
-            # File defines Function (Contains)
-            edges.append({
-                "source": file_id,
-                "target": func_node_id,
-                "relation": "defines"
-            })
+        def indent_at(pos: int) -> int:
+            nonlocal line_start, line_end, line_indent
+            if pos >= line_end:
+                # 위치는 증가 순이므로 직전 줄 끝 이후만 검색 (minified 한 줄에서도 전체 선형)
+                line_start = content.rfind("\n", line_end, pos + 1) + 1 or line_start
+                line_end = content.find("\n", pos)
+                if line_end == -1:
+                    line_end = len(content)
+                head = content[line_start:line_start + 256]
+                prefix = head[:len(head) - len(head.lstrip(" \t"))]
+                line_indent = len(prefix) + 3 * prefix.count("\t")  # 탭은 4칸
+            return line_indent
 
-        # 2. 클래스 추출 (Class Definitions)
-        for match in re.finditer(self.config["class"], self.content, re.MULTILINE):
-            class_name = next((g for g in match.groups() if g), "unknown")
-            class_node_id = f"{file_id}::{class_name}"
+        # 분기 토큰 위치 (정의 패턴이 소비한 줄의 토큰도 모두 집계), 정의 매치와 위치 순으로 병합
+        branch_positions = [m.start() for m in branch_pattern.finditer(content)] if branch_pattern else []
+        branch_positions.append(len(content) + 1)  # 보초 (범위 검사 없이 비교)
+        next_branch = 0
 
-            nodes.append({
-                "id": class_node_id,
-                "type": "class",
-                "label": class_name,
-                "language": self.config["name"]
-            })
-            edges.append({
-                "source": file_id,
-                "target": class_node_id,
-                "relation": "defines"
-            })
+        def record_branches_before(pos: int):
+            """pos 이전의 분기를 직전 정의에 귀속 (같은 줄의 분기는 들여쓰기/깊이가 같으므로 줄 단위로 한 번에 집계)"""
+            nonlocal indent_unit, next_branch
+            stop = bisect.bisect_left(branch_positions, pos, next_branch)
+            index = next_branch
+            while index < stop:
+                indent = indent_at(branch_positions[index])
+                line_stop = bisect.bisect_left(branch_positions, line_end, index + 1, stop)
+                depth = 0
+                if current_func is not None:
+                    relative = indent - func_indent
+                    if relative > 0 and not indent_unit:
+                        indent_unit = relative
+                    depth = relative // indent_unit if indent_unit and relative > 0 else 0
+                for target in (current_func, func_class, file_metrics):
+                    if target:
+                        target["complexity"] += line_stop - index
+                        target["nesting_depth"] = max(target["nesting_depth"], depth)
+                index = line_stop
+            next_branch = stop
 
-        # 3. Import 추출 (Dependencies)
-        seen_imports = set()
-        for match in re.finditer(self.config["import"], self.content, re.MULTILINE):
-            imp = next((g for g in match.groups() if g), None)
+        def out_of_time() -> bool:
+            # 파일당 시간 상한 (거대한 생성 파일에서 전체 분석이 멈추지 않도록)
+            if time.monotonic() > deadline:
+                self.truncated = True
+                logger.warning(f"Regex parse time limit reached for {file_id}; partial result kept.")
+            return self.truncated
 
-            if imp and imp not in seen_imports:
-                seen_imports.add(imp)
+        interval = self.TIME_CHECK_INTERVAL
+        for count, match in enumerate(pattern.finditer(content), 1):
+            if count % interval == 0 and out_of_time():
+                break
+            start = match.start()
+            if branch_positions[next_branch] < start:
+                record_branches_before(start)
 
-                # Import 타겟 ID 생성 (단순화: 경로/확장자 추론은 어려우므로 모듈명 사용)
-                # 예: import utils -> utils.py (추정)
-                target_hint = imp.split('.')[-1] + self.file_path.suffix
+            kind = match.lastgroup
+            first, end = spans[kind]
+            for value in match.groups()[first - 1:end - 1]:
+                if value:
+                    break
+            else:
+                continue
 
+            if kind == "import":
+                if value in seen_imports:
+                    continue
+                seen_imports.add(value)
                 edges.append({
                     "source": file_id,
-                    "target": target_hint, # 나중에 그래프 단계에서 실제 파일 ID와 매칭 시도
+                    "target": import_target_hint(value, self.file_path.suffix), # 나중에 그래프 단계에서 실제 파일 ID와 매칭 시도
                     "relation": "imports"
                 })
+                continue
+
+            # 함수/클래스 정의 (qualified 이름은 마지막 요소만 사용)
+            name = value.rsplit("::", 1)[-1] if "::" in value else value
+            if not name or name in LanguageConfig.KEYWORDS:
+                continue
+            position = start + 1  # 구분 문자 바로 뒤 (정의와 같은 줄)
+            indent = line_indent if position < line_end else indent_at(position)
+            if current_class is not None and indent <= class_indent:
+                current_class = None  # 클래스 본문을 벗어남
+            node_id = definition_id(file_id, name, kind, current_class and current_class["label"])
+            if node_id in seen_nodes:
+                continue
+            seen_nodes.add(node_id)
+            node = {
+                "id": node_id,
+                "type": kind,
+                "label": name,
+                "language": self.config["name"],
+                "complexity": 1,
+                "nesting_depth": 0,
+            }
+            nodes.append(node)
+            if kind == "class":
+                current_class, class_indent = node, indent
+                current_func = func_class = None
+            else:
+                current_func, func_indent, func_class = node, indent, current_class
+            # File defines Function/Class (Contains)
+            edges.append({
+                "source": file_id,
+                "target": node_id,
+                "relation": "defines"
+            })
+
+        if not self.truncated:  # 마지막 정의 이후의 분기
+            record_branches_before(len(content))
+
+        return {"nodes": nodes, "edges": edges, **file_metrics}
+
+
+class TreeSitterParser:
+    """
+    Tree-sitter 기반 구조 추출기 (Python 외 언어용).
+    정규식보다 정확하며 (주석/문자열 안의 가짜 정의 무시), 공유 레지스트리의 Parser를 재사용합니다.
+    문법을 사용할 수 없으면 parse()가 None을 반환하고 호출 측에서 PolyglotParser로 대체합니다.
+    """
+    # 언어별 정의 노드 타입
+    FUNCTION_TYPES = {
+        "javascript": {"function_declaration", "generator_function_declaration", "method_definition"},
+        "typescript": {"function_declaration", "generator_function_declaration", "method_definition"},
+        "tsx": {"function_declaration", "generator_function_declaration", "method_definition"},
+        "java": {"method_declaration", "constructor_declaration"},
+        "go": {"function_declaration", "method_declaration"},
+        "c": {"function_definition"},
+        "cpp": {"function_definition"},
+        "csharp": {"method_declaration", "constructor_declaration"},
+        "rust": {"function_item"},
+    }
+    CLASS_TYPES = {
+        "javascript": {"class_declaration"},
+        "typescript": {"class_declaration", "abstract_class_declaration", "interface_declaration", "enum_declaration"},
+        "tsx": {"class_declaration", "abstract_class_declaration", "interface_declaration", "enum_declaration"},
+        "java": {"class_declaration", "interface_declaration", "enum_declaration", "record_declaration"},
+        "go": {"type_spec"},
+        "c": {"struct_specifier"},
+        "cpp": {"class_specifier", "struct_specifier"},
+        "csharp": {"class_declaration", "interface_declaration", "struct_declaration", "enum_declaration", "record_declaration"},
+        "rust": {"struct_item", "enum_item", "trait_item"},
+    }
+    IMPORT_TYPES = {
+        "javascript": {"import_statement"},
+        "typescript": {"import_statement"},
+        "tsx": {"import_statement"},
+        "java": {"import_declaration"},
+        "go": {"import_spec"},
+        "c": {"preproc_include"},
+        "cpp": {"preproc_include"},
+        "csharp": {"using_directive"},
+        "rust": {"use_declaration"},
+    }
+    # 순환 복잡도에 +1 되는 분기 노드 (언어별 이름의 합집합)
+    BRANCH_TYPES = {
+        "if_statement", "for_statement", "for_in_statement", "enhanced_for_statement", "while_statement",
+        "do_statement", "catch_clause", "conditional_expression", "ternary_expression",
+        "switch_case", "switch_label", "case_statement", "switch_section",
+        "expression_case", "type_case", "communication_case",
+        "if_expression", "while_expression", "for_expression", "loop_expression", "match_arm",
+    }
+    # 중첩 깊이를 늘리는 제어 블록
+    NESTING_TYPES = {
+        "if_statement", "for_statement", "for_in_statement", "enhanced_for_statement", "while_statement",
+        "do_statement", "try_statement", "switch_statement", "switch_expression",
+        "expression_switch_statement", "type_switch_statement", "select_statement",
+        "if_expression", "while_expression", "for_expression", "loop_expression", "match_expression",
+    }
+    # 함수 값을 가지는 변수 선언 (const f = () => {...})
+    FUNCTION_VALUE_TYPES = {"arrow_function", "function_expression", "function"}
+    DECLARATOR_WRAPPERS = {"function_declarator", "pointer_declarator", "reference_declarator", "parenthesized_declarator"}
+
+    def __init__(self, file_path: str, content: Optional[str] = None):
+        self.file_path = Path(file_path)
+        self.lang = LANGUAGE_BY_EXT.get(self.file_path.suffix)
+        self.content = content
+        if self.content is None:
+            try:
+                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+                    self.content = f.read()
+            except Exception:
+                self.content = ""
+
+    def parse(self, file_id: str) -> Optional[Dict[str, List[Dict]]]:
+        """노드(함수/클래스)와 엣지(Import/Define) 추출 (Tree-sitter 사용 불가 시 None)"""
+        if self.lang not in self.FUNCTION_TYPES:
+            return None
+        tree = parse_code(self.content, self.file_path.suffix, Config.TREE_SITTER_LIB_PATH)
+        if tree is None:
+            return None
+
+        source = self.content.encode("utf-8", errors="ignore")
+        language_name = LanguageConfig.language_name(self.file_path.suffix)
+        func_types = self.FUNCTION_TYPES[self.lang]
+        class_types = self.CLASS_TYPES[self.lang]
+        import_types = self.IMPORT_TYPES[self.lang]
+
+        nodes, edges = [], []
+        seen_nodes, seen_imports = set(), set()
+
+        # 복잡도 프레임: 파일 -> 클래스 -> 함수. 분기는 가장 안쪽 함수와 그 소속 클래스, 파일에 집계
+        file_metrics = {"complexity": 1, "nesting_depth": 0}
+
+        def add_definition(name: str, kind: str, node, owner_class):
+            metrics = {"complexity": 1, "nesting_depth": 0, "class": owner_class}
+            nid = definition_id(file_id, name, kind, owner_class and owner_class.get("label"))
+            if nid in seen_nodes:
+                return metrics
+            seen_nodes.add(nid)
+            entry = {
+                "id": nid,
+                "type": kind,
+                "label": name,
+                "language": language_name,
+                "start_line": node.start_point[0] + 1,
+                "end_line": node.end_point[0] + 1,
+                "complexity": 1,
+                "nesting_depth": 0,
+            }
+            nodes.append(entry)
+            edges.append({"source": file_id, "target": nid, "relation": "defines"})
+            # 집계 대상은 노드 딕셔너리 자체 (순회가 끝나면 값이 확정됨)
+            entry["class"] = owner_class
+            return entry
+
+        def record(frame, depth: int, decisions: int):
+            targets = (frame, frame.get("class") if frame else None, file_metrics)
+            for target in targets:
+                if target is not None:
+                    target["complexity"] += decisions
+                    target["nesting_depth"] = max(target["nesting_depth"], depth)
+
+        # 반복 순회 (깊은 AST에서도 재귀 한도 없음): (노드, 함수 프레임, 클래스 프레임, 중첩 깊이)
+        stack = [(tree.root_node, None, None, 0)]
+        while stack:
+            node, frame, owner_class, depth = stack.pop()
+            ntype = node.type
+
+            if ntype in func_types:
+                name = self._definition_name(node, source)
+                if name:
+                    frame, depth = add_definition(name, "function", node, owner_class), 0
+            elif ntype in class_types:
+                if ntype != "type_spec" or self._is_go_struct(node):
+                    name = self._definition_name(node, source)
+                    if name:
+                        owner_class, frame, depth = add_definition(name, "class", node, None), None, 0
+            elif ntype == "variable_declarator":
+                value = node.child_by_field_name("value")
+                if value is not None and value.type in self.FUNCTION_VALUE_TYPES:
+                    name = self._definition_name(node, source)
+                    if name:
+                        frame, depth = add_definition(name, "function", value, owner_class), 0
+            elif ntype in import_types or (ntype == "call_expression" and self._is_require(node, source)):
+                imp = self._import_path(node, source)
+                if imp and imp not in seen_imports:
+                    seen_imports.add(imp)
+                    edges.append({
+                        "source": file_id,
+                        "target": import_target_hint(imp, self.file_path.suffix),
+                        "relation": "imports"
+                    })
+                continue
+            elif ntype in self.BRANCH_TYPES:
+                record(frame, depth, 1)
+            elif ntype == "binary_expression":
+                operator = node.child_by_field_name("operator")
+                if operator is not None and operator.type in ("&&", "||"):
+                    record(frame, depth, 1)
+
+            if ntype in self.NESTING_TYPES and not (
+                ntype == "if_statement" and node.parent is not None
+                and node.parent.type in ("else_clause", "if_statement")  # else if는 같은 깊이
+            ):
+                depth += 1
+                record(frame, depth, 0)
+
+            stack.extend((child, frame, owner_class, depth) for child in reversed(node.children))
 
-        return {"nodes": nodes, "edges": edges}
+        for entry in nodes:
+            entry.pop("class", None)
+        return {"nodes": nodes, "edges": edges, **file_metrics}
+
+    def _definition_name(self, node, source: bytes) -> Optional[str]:
+        name_node = node.child_by_field_name("name")
+        if name_node is None:
+            # C/C++: function_definition -> declarator(function_declarator) -> declarator(identifier)
+            declarator = node.child_by_field_name("declarator")
+            while declarator is not None and declarator.type in self.DECLARATOR_WRAPPERS:
+                declarator = declarator.child_by_field_name("declarator")
+            name_node = declarator
+        if name_node is None:
+            return None
+        name = node_text(name_node, source).strip()
+        # qualified 이름 (Foo::bar)은 마지막 요소만 사용
+        return name.split("::")[-1] or None
+
+    @staticmethod
+    def _is_go_struct(node) -> bool:
+        type_node = node.child_by_field_name("type")
+        return type_node is not None and type_node.type in ("struct_type", "interface_type")
+
+    @staticmethod
+    def _is_require(node, source: bytes) -> bool:
+        func = node.child_by_field_name("function")
+        return func is not None and node_text(func, source) == "require"
+
+    def _import_path(self, node, source: bytes) -> Optional[str]:
+        if node.type == "call_expression":
+            args = node.child_by_field_name("arguments")
+            target = args.named_children[0] if args is not None and args.named_children else None
+        else:
+            target = (
+                node.child_by_field_name("source")      # JS/TS
+                or node.child_by_field_name("path")     # Go, C/C++
+                or node.child_by_field_name("argument") # Rust
+            )
+        if target is not None:
+            text = node_text(target, source)
+        else:
+            # Java / C#: 선언문 전체에서 키워드 제거
+            text = node_text(node, source)
+            for token in ("import", "using", "static", ";"):
+                text = text.replace(token, " ")
+        return text.strip().strip("'\"<>`").strip() or None
+
+
+def definition_id(file_id: str, name: str, kind: str, class_name: Optional[str] = None) -> str:
+    """
+    정의 노드 ID. 생성자(클래스와 이름이 같은 메서드)는 클래스 노드와 겹치지 않도록 한정합니다.
+    예: Svc.java::Svc (클래스), Svc.java::Svc.Svc (생성자)
+    """
+    if kind == "function" and class_name == name:
+        return f"{file_id}::{class_name}.{name}"
+    return f"{file_id}::{name}"
+
+
+def import_target_hint(imp: str, suffix: str) -> str:
+    """
+    Import 타겟 ID 생성 (단순화: 경로/확장자 추론은 어려우므로 모듈명 사용)
+    예: import utils -> utils.py (추정)
+    """
+    return imp.split('.')[-1] + suffix
 
 class StructuralAnalyzer:
     def __init__(self, device=None):
         # Lite 모드: 모델 로드 없음
         pass
 
-    def analyze_repository(self, repo_path: str) -> Dict[str, Any]:
+    def analyze_repository(self, repo_path: str) -> CompactGraph:
         """
         저장소 내의 지원되는 모든 언어 파일을 분석합니다.
+
+        Returns:
+            CompactGraph (직렬화가 필요하면 to_dict())
         """
+        graph = CompactGraph()
         try:
             repo_path = Path(repo_path)
-            all_nodes = []
-            all_edges = []
 
-            # 지원하는 확장자 목록
-            valid_exts = set(LanguageConfig.PATTERNS.keys())
+            # 지원하는 확장자 목록: 정규식 규칙 + 문법을 불러올 수 있는 Tree-sitter 언어 (C/C#/Rust 등)
+            valid_exts = set(LanguageConfig.PATTERNS) | set(LanguageConfig.ALIASES)
+            if Config.USE_TREE_SITTER:
+                valid_exts |= {
+                    ext for ext, lang in LANGUAGE_BY_EXT.items()
+                    if lang in TreeSitterParser.FUNCTION_TYPES
+                    and get_language(ext, Config.TREE_SITTER_LIB_PATH) is not None
+                }
 
-            # 1. 파일 검색 (Git, node_modules 등 제외)
-            target_files = [
-                p for p in repo_path.rglob("*")
-                if p.suffix in valid_exts and not any(x in p.parts for x in ["node_modules", ".git", "venv", ".venv", "dist", "build", "__pycache__"])
-            ]
+            # 1. 파일 검색 (공유 선택 엔진: 무시 규칙/크기/바이너리/생성 파일 필터)
+            target_files = select_files(str(repo_path), valid_exts, Config.MAX_FILE_SIZE_BYTES)
 
             logger.info(f"Analyzing structure for {len(target_files)} files...")
 
+            # 저장소 단위 심볼 테이블 (파일 순회 후 호출식을 실제 함수 노드로 해석)
+            symbols = SymbolTable()
+
             for file_path in target_files:
                 try:
                     # ID 생성 (상대 경로, Windows 역슬래시 처리)
                     rel_path = str(file_path.relative_to(repo_path)).replace("\\", "/")
                     file_id = rel_path
 
-                    # 2. 파일 노드 추가
-                    all_nodes.append({
-                        "id": file_id,
-                        "type": "file",
-                        "label": file_path.name,
-                        "language": LanguageConfig.get_config(file_path.suffix)["name"]
-                    })
+                    # 2. 파일 노드 추가 (줄 수 포함, 복잡도는 파싱 후 채움)
+                    file_node = graph.add_node(
+                        file_id, "file",
+                        label=file_path.name,
+                        language=LanguageConfig.language_name(file_path.suffix),
+                        loc=count_lines(file_path)
+                    )
+                    result = None
 
                     # 3. 내부 구조 파싱 (Polyglot Parser vs AST)
                     if file_path.suffix == '.py':
                         from shared.ast_utils import PythonASTAnalyzer
                         tree = PythonASTAnalyzer.parse_file(str(file_path))
                         if tree:
-                            funcs = PythonASTAnalyzer.extract_functions(tree)
-                            classes = PythonASTAnalyzer.extract_classes(tree)
-                            
+                            # 함수/클래스/import/호출을 한 번의 순회로 추출
+                            structure = PythonASTAnalyzer.extract_structure(tree)
+                            symbols.add_file(file_id, structure)
+
                             # Convert to Node format
-                            for name, info in funcs.items():
+                            for name, info in structure["functions"].items():
                                 nid = f"{file_id}::{name}"
-                                all_nodes.append({
-                                    "id": nid,
-                                    "type": "function",
-                                    "label": name,
-                                    "language": "Python",
-                                    "docstring": info.get("docstring", ""),
-                                    "args": info.get("args", [])
-                                })
-                                all_edges.append({"source": file_id, "target": nid, "relation": "defines"})
-                                
-                            for name, info in classes.items():
+                                graph.add_node(
+                                    nid, "function",
+                                    label=name,
+                                    language="Python",
+                                    complexity=info["complexity"],
+                                    nesting_depth=info["nesting_depth"],
+                                    docstring=info.get("docstring", ""),
+                                    args=info.get("args", [])
+                                )
+                                graph.add_edge(file_id, nid, "defines")
+
+                            for name, info in structure["classes"].items():
                                 nid = f"{file_id}::{name}"
-                                all_nodes.append({
-                                    "id": nid,
-                                    "type": "class",
-                                    "label": name,
-                                    "language": "Python",
-                                    "docstring": info.get("docstring", "")
-                                })
-                                all_edges.append({"source": file_id, "target": nid, "relation": "defines"})
-                                
-                            # Imports are handled by AST too if we want, but keeping regex for edges for now or merging?
-                            # Let's keep regex for imports for consistency across languages for now, 
-                            # or use AST imports. AST imports are better.
-                            imports = PythonASTAnalyzer.extract_imports(tree)
+                                graph.add_node(
+                                    nid, "class",
+                                    label=name,
+                                    language="Python",
+                                    complexity=info["complexity"],
+                                    nesting_depth=info["nesting_depth"],
+                                    docstring=info.get("docstring", "")
+                                )
+                                graph.add_edge(file_id, nid, "defines")
+
+                            imports = structure["imports"]
                             for imp in imports['direct'] + imports['from']:
                                 target_hint = imp.split('.')[-1] + ".py"
-                                all_edges.append({"source": file_id, "target": target_hint, "relation": "imports"})
+                                graph.add_edge(file_id, target_hint, "imports")
+                            result = structure
                         else:
                             # Fallback to regex if AST fails
                             parser = PolyglotParser(str(file_path))
                             result = parser.parse(file_id)
-                            all_nodes.extend(result["nodes"])
-                            all_edges.extend(result["edges"])
+                            graph.add_nodes_from(result["nodes"])
+                            graph.add_edges_from(result["edges"])
                     else:
-                        # Other languages use PolyglotParser (Regex)
-                        parser = PolyglotParser(str(file_path))
-                        result = parser.parse(file_id)
-                        all_nodes.extend(result["nodes"])
-                        all_edges.extend(result["edges"])
+                        # Other languages: Tree-sitter 우선, 문법이 없으면 PolyglotParser (Regex)
+                        if Config.USE_TREE_SITTER:
+                            result = TreeSitterParser(str(file_path)).parse(file_id)
+                        if result is None:
+                            result = PolyglotParser(str(file_path)).parse(file_id)
+                        graph.add_nodes_from(result["nodes"])
+                        graph.add_edges_from(result["edges"])
+
+                    if result:
+                        file_node.complexity = result.get("complexity", 1)
+                        file_node.nesting_depth = result.get("nesting_depth", 0)
 
                 except Exception as e:
                     logger.warning(f"Parse error {file_path.name}: {e}")
 
-            return {
-                "nodes": all_nodes,
-                "edges": all_edges,
-                "statistics": {"total_files": len(target_files)}
+            # 4. 호출 그래프 (Cross-file Call Resolution, 가중치 = 호출 지점 수)
+            call_edges = symbols.resolve_calls()
+            graph.add_edges_from(call_edges)
+
+            graph.statistics = {
+                "total_files": len(target_files),
+                "call_edges": len(call_edges),
+                "resolved_calls": symbols.resolved,
+                "unresolved_calls": symbols.unresolved
             }
+            return graph
 
         except Exception as e:
             logger.error(f"Structure analysis failed: {e}")
-            return {"nodes": [], "edges": []}
+            return CompactGraph()
 
 def create_analyzer(device=None):
     return StructuralAnalyzer(device)
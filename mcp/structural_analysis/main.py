@@ -139,7 +139,8 @@ async def analyze_repository(request: AnalyzeRepositoryRequest) -> GraphResponse
         if not repo_path.exists():
             raise HTTPException(status_code=404, detail=f"Repository not found: {request.repo_path}")
 
-        result = analyzer.analyze_repository(str(repo_path))
+        # 응답 직렬화 시점에만 dict로 변환 (Edge 모델은 관계를 type 키로 받음)
+        result = analyzer.analyze_repository(str(repo_path)).to_dict(relation_key="type")
 
         if "error" in result:
             raise HTTPException(status_code=500, detail=result["error"])
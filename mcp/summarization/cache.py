@@ -0,0 +1,72 @@
+"""
+mcp/summarization/cache.py
+Persistent summary cache keyed by (hash(code), model_id, prompt_type, prompt_version).
+"""
+import json
+import logging
+from typing import Any, Optional
+
+from agent.config import Config
+from shared.cache_utils import PersistentCache, content_hash
+
+logger = logging.getLogger(__name__)
+
+# 프롬프트 문구나 후처리 로직이 바뀌면 올려서 기존 캐시를 무효화합니다.
+PROMPT_VERSION = "1"
+
+
+class SummaryCache:
+    """요약 결과 캐시 (vendored 코드, 생성 stub, 반복되는 __init__.py 등의 재요약 방지)"""
+
+    def __init__(self, path: str = None, max_entries: int = None, ttl_seconds: float = None):
+        self.store = PersistentCache(
+            path or Config.SUMMARY_CACHE_PATH,
+            max_entries=max_entries or Config.SUMMARY_CACHE_MAX_ENTRIES,
+            ttl_seconds=ttl_seconds if ttl_seconds is not None else Config.SUMMARY_CACHE_TTL,
+        )
+
+    @staticmethod
+    def make_key(code: str, model_id: str, prompt_type: str) -> str:
+        return content_hash(code, model_id, prompt_type, PROMPT_VERSION)
+
+    def get(self, code: str, model_id: str, prompt_type: str) -> Optional[Any]:
+        raw = self.store.get(self.make_key(code, model_id, prompt_type))
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except (ValueError, TypeError):
+            return None
+
+    def put(self, code: str, model_id: str, prompt_type: str, value: Any) -> None:
+        try:
+            payload = json.dumps(value, ensure_ascii=False).encode("utf-8")
+            self.store.put(self.make_key(code, model_id, prompt_type), payload)
+        except Exception as e:
+            logger.warning(f"Summary cache write failed: {e}")
+
+    def stats(self):
+        return self.store.stats()
+
+
+# 글로벌 요약 캐시 (요약기 인스턴스 간 공유)
+_summary_cache: Optional[SummaryCache] = None
+
+
+def get_summary_cache() -> Optional[SummaryCache]:
+    """
+    글로벌 요약 캐시를 가져옵니다.
+
+    Returns:
+        SummaryCache 인스턴스 (비활성화되었거나 열 수 없으면 None)
+    """
+    global _summary_cache
+
+    if _summary_cache is None and Config.USE_SUMMARY_CACHE:
+        try:
+            _summary_cache = SummaryCache()
+        except Exception as e:
+            logger.warning(f"Summary cache unavailable: {e}")
+            return None
+
+    return _summary_cache
@@ -2,15 +2,21 @@
 mcp/summarization/summarizer.py
 Core summarization logic with Hugging Face API support (Polyglot).
 """
+import json
 import logging
-import os
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from huggingface_hub import InferenceClient
 from agent.config import Config
+from shared.budget_utils import plan_analysis
+from shared.ast_utils import split_code_chunks
+from .cache import get_summary_cache
 
 logger = logging.getLogger(__name__)
 
+LOCAL_SUMMARIZER_MODEL = "Salesforce/codet5-small"
+LOCAL_FAILURE_TEXT = "Local summary generation failed."
+
 class CodeSummarizer:
     def __init__(self, device: Optional[str] = None):
         token = Config.HF_API_KEY
@@ -27,7 +33,10 @@ class CodeSummarizer:
         self.model_structure = Config.MODEL_SUMMARIZER_STRUCTURE
 
         # 지원 확장자 (Polyglot)
-        self.valid_exts = {'.py', '.js', '.ts', '.java', '.go', '.cpp', '.c', '.cs', '.rs'}
+        self.valid_exts = Config.ANALYSIS_EXTENSIONS
+
+        # (hash(code), model_id, prompt_type, prompt_version) 키의 영구 요약 캐시
+        self.cache = get_summary_cache()
 
     def summarize_file(self, file_path: str, model_name: str = None) -> Dict[str, Any]:
         """단일 파일 요약"""
@@ -61,62 +70,155 @@ class CodeSummarizer:
             "confidence": 0.85
         }
 
-    def summarize_code_local(self, code: str) -> str:
-        """[Local SLM] 로컬 모델을 사용한 요약 (CodeT5-small)"""
-        try:
+    def _get_local_pipeline(self):
+        """로컬 요약 파이프라인 (싱글톤 패턴으로 캐싱)"""
+        if not hasattr(self, '_local_pipeline'):
             from transformers import pipeline
             import torch
 
-            # 파이프라인 캐싱 (싱글톤 패턴)
-            if not hasattr(self, '_local_pipeline'):
-                logger.info("Loading local summarization model (Salesforce/codet5-small)...")
-                
-                # Device Auto-detection
-                device = -1 # CPU Default
-                if torch.backends.mps.is_available():
-                    device = "mps"
-                    logger.info("🚀 Using MPS (Metal) acceleration on macOS.")
-                elif torch.cuda.is_available():
-                    device = 0
-                    logger.info("🚀 Using CUDA acceleration.")
-                
-                self._local_pipeline = pipeline("summarization", model="Salesforce/codet5-small", device=device)
-            
-            # 입력 길이 제한 (CodeT5 max position embedding is usually 512)
-            input_code = code[:512] 
-            
-            result = self._local_pipeline(input_code, max_length=50, min_length=10, do_sample=False)
-            return result[0]['summary_text']
+            logger.info("Loading local summarization model (Salesforce/codet5-small)...")
+
+            # Device Auto-detection
+            device = -1 # CPU Default
+            if torch.backends.mps.is_available():
+                device = "mps"
+                logger.info("🚀 Using MPS (Metal) acceleration on macOS.")
+            elif torch.cuda.is_available():
+                device = 0
+                logger.info("🚀 Using CUDA acceleration.")
+
+            self._local_pipeline = pipeline("summarization", model=LOCAL_SUMMARIZER_MODEL, device=device)
+        return self._local_pipeline
+
+    def summarize_code_local(self, code: str) -> str:
+        """[Local SLM] 로컬 모델을 사용한 요약 (CodeT5-small)"""
+        # 입력 길이 제한 (CodeT5 max position embedding is usually 512)
+        input_code = code[:512] 
+
+        cached = self._cache_get(input_code, LOCAL_SUMMARIZER_MODEL, "local")
+        if cached is not None:
+            return cached
+
+        try:
+            local_pipeline = self._get_local_pipeline()
+            result = local_pipeline(input_code, max_length=50, min_length=10, do_sample=False)
+            return self._remember(input_code, LOCAL_SUMMARIZER_MODEL, "local", result[0]['summary_text'])
         except Exception as e:
             logger.error(f"Local summarization failed: {e}")
-            return "Local summary generation failed."
+            return LOCAL_FAILURE_TEXT
 
-        
-    def summarize_repository(self, repo_path: str, max_files: int = Config.MAX_ANALYSIS_FILES, target_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+    def summarize_batch_local(self, codes: List[str]) -> List[str]:
+        """[Local SLM] 여러 코드 조각을 배치 단위로 한 번에 요약"""
+        if not codes:
+            return []
+
+        # 캐시 적중분은 제외하고, 배치 안의 동일 코드도 한 번만 요약
+        summaries = [self._cache_get(code, LOCAL_SUMMARIZER_MODEL, "local-batch") for code in codes]
+        pending = list(dict.fromkeys(code for code, summ in zip(codes, summaries) if summ is None))
+        if not pending:
+            return summaries
+
+        try:
+            local_pipeline = self._get_local_pipeline()
+            results = local_pipeline(
+                pending,
+                max_length=50,
+                min_length=10,
+                do_sample=False,
+                truncation=True,
+                batch_size=Config.SUMMARY_BATCH_SIZE
+            )
+            fresh = {
+                code: self._remember(code, LOCAL_SUMMARIZER_MODEL, "local-batch", r['summary_text'])
+                for code, r in zip(pending, results)
+            }
+        except Exception as e:
+            logger.error(f"Local batch summarization failed: {e}")
+            fresh = {}
+
+        return [summ if summ is not None else fresh.get(code, LOCAL_FAILURE_TEXT)
+                for code, summ in zip(codes, summaries)]
+
+    def summarize_code_hierarchical(self, code: str, code_id: str) -> Dict[str, Any]:
+        """
+        [Hierarchical] 함수/클래스 경계로 분할 -> 청크 배치 요약 -> 요약의 요약.
+        잘라내기 없이 파일 전체를 커버하며, 청크 요약은 children으로 반환되어
+        Fusion 단계에서 함수/클래스 노드 요약으로 재사용됩니다.
+        """
+        max_chars = Config.SUMMARY_CHUNK_CHARS
+        result = {"code_id": code_id, "level": "file", "model": "codet5-small-local", "children": []}
+
+        if len(code) <= max_chars:
+            result["text"] = self.summarize_code_local(code)
+            return result
+
+        chunks = split_code_chunks(code, Path(code_id).suffix, max_chars)
+
+        # 1. Map: 청크가 여전히 크면 윈도우로 나눈 뒤 전체를 한 번에 배치 요약
+        windows, owners = [], []
+        for idx, chunk in enumerate(chunks):
+            body = chunk["code"]
+            for start in range(0, len(body), max_chars):
+                windows.append(body[start:start + max_chars])
+                owners.append(idx)
+        window_summaries = self.summarize_batch_local(windows)
+
+        per_chunk = [[] for _ in chunks]
+        for idx, text in zip(owners, window_summaries):
+            per_chunk[idx].append(text)
+
+        digest = []
+        for chunk, parts in zip(chunks, per_chunk):
+            text = parts[0] if len(parts) == 1 else self._reduce_summaries(parts)
+            result["children"].append({
+                "code_id": f"{code_id}::{chunk['name']}",
+                "text": text,
+                "level": chunk["type"],
+                "lines": [chunk["start_line"], chunk["end_line"]]
+            })
+            digest.append(f"{chunk['type']} {chunk['name']}: {text}")
+
+        # 2. Reduce: 청크 요약들을 다시 요약하여 파일 요약 생성
+        result["text"] = self._reduce_summaries(digest)
+        return result
+
+    def _reduce_summaries(self, summaries: List[str]) -> str:
+        """요약 목록을 청크 크기 이하의 그룹으로 묶어 하나가 남을 때까지 반복 요약"""
+        max_chars = Config.SUMMARY_CHUNK_CHARS
+        current = summaries
+        while True:
+            groups, buf = [], ""
+            for text in current:
+                if buf and len(buf) + len(text) + 1 > max_chars:
+                    groups.append(buf)
+                    buf = ""
+                buf = f"{buf}\n{text}" if buf else text
+            if buf:
+                groups.append(buf)
+
+            if len(groups) == 1 or len(groups) >= len(current):
+                # 한 번의 호출로 충분하거나 더 줄일 수 없는 경우 (truncation으로 마무리)
+                return self.summarize_batch_local(["\n".join(groups)])[0]
+            current = self.summarize_batch_local(groups)
+
+    def summarize_repository(self, repo_path: str, max_files: int = Config.MAX_ANALYSIS_FILES, target_ids: Optional[List[str]] = None, planned_ids: Optional[List[str]] = None) -> Dict[str, Any]:
         """저장소 전체 앙상블 요약 (다국어 지원 & 선별적 재분석)"""
         try:
             repo_path = Path(repo_path)
-            all_files = []
-
-            # 파일 검색
-            for root, dirs, files in os.walk(repo_path):
-                # 불필요한 디렉토리 제외
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in {'venv', 'node_modules', 'dist', 'build', '.git'}]
-                for file in files:
-                    if Path(file).suffix in self.valid_exts:
-                        all_files.append(Path(root) / file)
 
             target_files = []
             
             # [Filtering Logic]
             if target_ids:
                 logger.info(f"Targeted Analysis Mode: Filtering {len(target_ids)} files.")
-                for f in all_files:
-                    fid = str(f.relative_to(repo_path)).replace("\\", "/")
-                    if fid in target_ids:
-                        target_files.append(f)
+                target_files = [repo_path / fid for fid in target_ids if (repo_path / fid).is_file()]
             else:
-                target_files = all_files[:max_files]
+                # [Budget Plan] 임베딩 스테이지와 동일한 파일 집합을 사용
+                if planned_ids is None:
+                    plan = plan_analysis(str(repo_path), self.valid_exts, Config.ANALYSIS_TIME_BUDGET,
+                                         max_files=max_files, max_file_size=Config.MAX_FILE_SIZE_BYTES)
+                    planned_ids = plan["files"]
+                target_files = [repo_path / fid for fid in planned_ids]
 
             file_summaries = []
 
@@ -132,6 +234,11 @@ class CodeSummarizer:
 
                     # ★ 앙상블 호출 (기존 단일 호출 대체)
                     if True or Config.USE_LOCAL_SUMMARIZER: # FORCE LOCAL FOR DEMO
+                        if Config.USE_HIERARCHICAL_SUMMARY:
+                            # [Local Mode] Hierarchical CodeT5 (청크 배치 요약 -> 요약의 요약)
+                            file_summaries.append(self.summarize_code_hierarchical(code, code_id))
+                            continue
+
                         # [Local Mode] Single Pass CodeT5 (No Ensemble to save time/resources)
                         local_text = self.summarize_code_local(code)
                         file_summaries.append({
@@ -140,6 +247,14 @@ class CodeSummarizer:
                             "level": "file",
                             "model": "codet5-small-local"
                         })
+                    elif Config.USE_HIERARCHICAL_SUMMARY and len(code) > 2000:
+                        # [Cloud Mode] Ensemble over hierarchical digest (긴 파일은 잘라내지 않고 청크 요약으로 압축)
+                        hierarchy = self.summarize_code_hierarchical(code, code_id)
+                        digest = "\n".join(f"- {c['code_id'].split('::')[-1]}: {c['text']}" for c in hierarchy["children"])
+                        context = f"File overview: {hierarchy['text']}\nComponents:\n{digest}"
+                        ensemble_result = self._generate_ensemble_summary(context[:2000], code_id)
+                        ensemble_result["children"] = hierarchy["children"]
+                        file_summaries.append(ensemble_result)
                     else:
                         # [Cloud Mode] Ensemble
                         ensemble_result = self._generate_ensemble_summary(code[:2000], code_id)
@@ -148,13 +263,18 @@ class CodeSummarizer:
                 except Exception as e:
                     logger.warning(f"Failed to summarize {file_path}: {e}")
 
+            cache_stats = self.cache.stats() if self.cache else {}
+            if cache_stats:
+                logger.info(f"Summary cache: {cache_stats}")
+
             return {
                 "summary": f"Ensemble analyzed {len(file_summaries)} files.",
                 "file_summaries": file_summaries,
                 "metadata": {
                     "total_files": len(target_files),
                     "ensemble_mode": True,
-                    "partial_retry": bool(target_ids)
+                    "partial_retry": bool(target_ids),
+                    "cache": cache_stats
                 },
                 "statistics": {"total_files": len(target_files)}
             }
@@ -164,6 +284,12 @@ class CodeSummarizer:
 
     def _generate_ensemble_summary(self, code: str, code_id: str, ast_metadata: Dict[str, Any] = None) -> Dict[str, Any]:
         """3개 모델 앙상블 요약 생성 (AST 메타데이터 활용)"""
+        cache_code = code + json.dumps(ast_metadata or {}, sort_keys=True, default=str)
+        ensemble_model = self._ensemble_model_id()
+        cached = self._cache_get(cache_code, ensemble_model, "ensemble")
+        if cached is not None:
+            return {**cached, "code_id": code_id}
+
         try:
             # 1. 3개 Expert 호출 (각각 다른 관점)
             # [Logic Expert] Local CodeT5 (Fast & Efficient) - User Request
@@ -194,7 +320,7 @@ class CodeSummarizer:
             quality = self._calculate_quality(logic_summary, intent_summary, structure_summary)
 
             # 4. 결과 반환
-            return {
+            result = {
                 "code_id": code_id,
                 "text": unified,  # 호환성을 위해 "text" 키도 포함
                 "unified_summary": unified,
@@ -207,6 +333,12 @@ class CodeSummarizer:
                 "level": "file"
             }
 
+            # 폴백(더미/로컬 실패) 결과가 섞여 있으면 캐시하지 않음
+            views = (logic_summary, intent_summary, structure_summary)
+            if not any(self._is_fallback(v) for v in views):
+                self._remember(cache_code, ensemble_model, "ensemble", result)
+            return result
+
         except Exception as e:
             logger.error(f"Ensemble summary failed for {code_id}: {e}")
             # 폴백: 단일 모델 사용
@@ -310,6 +442,10 @@ class CodeSummarizer:
 
         prompt = prompts.get(prompt_type, prompts["general"])
 
+        cached = self._cache_get(code, model_id, prompt_type)
+        if cached is not None:
+            return cached
+
         # [SAFE MODE] Throttling & Retry (Aggressive)
         import time
         max_retries = 3
@@ -349,11 +485,11 @@ class CodeSummarizer:
                         max_tokens=200,
                         temperature=0.2
                     )
-                    return response.choices[0].message.content.strip()
+                    return self._remember(code, model_id, prompt_type, response.choices[0].message.content.strip())
                 
                 # [Legacy/Compatibility Mode]
                 if is_chat_model:
-                     return self._generate_summary_via_chat(prompt, model_id)
+                     return self._remember(code, model_id, prompt_type, self._generate_summary_via_chat(prompt, model_id))
                 else:
                     response = self.client.text_generation(
                         prompt,
@@ -362,7 +498,7 @@ class CodeSummarizer:
                         temperature=0.2,
                         do_sample=False
                     )
-                    return response.strip()
+                    return self._remember(code, model_id, prompt_type, response.strip())
 
             except Exception as e:
                 logger.warning(f"HF API Attempt {attempt+1}/{max_retries} failed ({model_id}): {e}")
@@ -394,6 +530,28 @@ class CodeSummarizer:
              logger.warning(f"Local Fallback/GPU Check failed: {e}. Using Dummy Data.")
              return self._get_dummy_summary(prompt_type)
 
+    def _ensemble_model_id(self) -> str:
+        """앙상블 캐시 키의 모델 ID (세 Expert 모델 + 로컬 모델 중 하나라도 바뀌면 캐시 미스)"""
+        return "+".join((self.model_logic, self.model_intent, self.model_structure, LOCAL_SUMMARIZER_MODEL))
+
+    def _cache_get(self, code: str, model_id: str, prompt_type: str) -> Optional[Any]:
+        """요약 캐시 조회 (캐시 비활성화 시 None)"""
+        if not self.cache:
+            return None
+        return self.cache.get(code, model_id, prompt_type)
+
+    def _remember(self, code: str, model_id: str, prompt_type: str, value: Any) -> Any:
+        """성공한 요약 결과를 캐시에 저장하고 그대로 반환"""
+        if self.cache and value and not self._is_fallback(value):
+            self.cache.put(code, model_id, prompt_type, value)
+        return value
+
+    @staticmethod
+    def _is_fallback(value: Any) -> bool:
+        return isinstance(value, str) and (
+            value == LOCAL_FAILURE_TEXT or value.startswith("[Dummy Fallback]") or value.startswith("[Local Fallback")
+        )
+
     def _get_dummy_summary(self, prompt_type: str) -> str:
         """[Safety Net] 통신 테스트용 더미 데이터 반환"""
         dummies = {
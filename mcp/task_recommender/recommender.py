@@ -291,7 +291,8 @@ Return ONLY a JSON object with the list of selected IDs:
                         "type": "documentation_needed"
                     })
 
-                if complexity == 0 and loc < 5 and loc > 0:
+                # 복잡도는 1 + 분기 수 (분기 없는 파일/함수 = 1)
+                if complexity <= 1 and loc < 5 and loc > 0:
                      recommendations.append({
                         "target": node['id'],
                         "reason": "Minimal implementation detected.",
@@ -1,11 +1,12 @@
 import asyncio
-import json
 import uuid
 from pathlib import Path
 import time # [Modified]
+from agent.config import Config
 from agent.workflow import get_workflow
 from agent.schemas import RepoInput
 from agent.state import AgentState
+from shared.artifact_utils import save_artifact
 
 async def regenerate():
     print("🔄 Regenerating verification_result.json...")
@@ -41,9 +42,7 @@ async def regenerate():
     result = final_state.get("final_artifact")
     
     if result:
-        output_path = Path("verification_result.json")
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        output_path = save_artifact(Path(f"verification_result.{Config.ARTIFACT_FORMAT}"), result)
         print(f"✅ Restored: {output_path.resolve()}")
     else:
         print("❌ Regeneration failed: No artifact produced.")
@@ -0,0 +1,214 @@
+"""
+shared/artifact_utils.py
+Compact final-artifact encoding: string dictionary + columnar graph, serialized as msgpack (or JSON).
+
+JSON 아티팩트(indent=2)는 엣지마다 긴 노드 ID 문자열을, 노드마다 같은 키 문자열을 반복합니다.
+압축 형식은 그래프 부분만 다음처럼 바꾸고 나머지(context, recommendations, metrics)는 그대로 둡니다.
+
+  - strings: 노드 ID + 범주형 값(type, group, color...)의 문자열 사전 (StringPool)
+  - nodes: 키별 열 (id/parent/범주형 열은 사전 코드, 없던 키는 absent 행 목록으로 복원)
+  - edges: source/target/type/relations 코드 열 + weight 열 (그 외 속성은 희소 extra)
+
+msgpack이 설치되어 있으면 바이너리(.msgpack), 없으면 같은 구조를 JSON으로 저장할 수 있습니다.
+
+    python -m shared.artifact_utils <입력> <출력>   # 확장자로 형식 결정 (.json / .msgpack)
+"""
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+from .graph_utils import StringPool
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+ARTIFACT_FORMAT = "fithub-artifact"
+ARTIFACT_VERSION = 1
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# 사전 코드로 저장하는 노드 열 (값이 None이면 -1)
+CODED_NODE_COLUMNS = ("id", "parent", "type", "group", "color", "domain", "language")
+EDGE_COLUMNS = ("source", "target", "type", "weight")
+RELATION_SEPARATOR = "|"  # 병합 엣지의 relations 목록은 "calls|structure" 한 문자열로 사전 코드화
+
+
+def _code(pool: StringPool, value: Any) -> Any:
+    if value is None:
+        return -1
+    if isinstance(value, str):
+        return pool.code(value)
+    raise TypeError(value)
+
+
+def encode_artifact(artifact: Dict[str, Any]) -> Dict[str, Any]:
+    """final_artifact -> 압축 구조 (사전 + 열 저장 그래프)"""
+    graph = artifact.get("graph") or {}
+    pool = StringPool()
+    nodes = graph.get("nodes") or []
+
+    columns: Dict[str, List[Any]] = {}
+    absent: Dict[str, List[int]] = {}
+    for row, node in enumerate(nodes):
+        for key in node:
+            if key not in columns:
+                columns[key] = [None] * row
+                absent[key] = list(range(row))
+        for key, column in columns.items():
+            if key in node:
+                column.append(node[key])
+            else:
+                column.append(None)
+                absent[key].append(row)
+
+    coded = []
+    for key in CODED_NODE_COLUMNS:
+        column = columns.get(key)
+        if column is not None and all(value is None or isinstance(value, str) for value in column):
+            columns[key] = [_code(pool, value) for value in column]
+            coded.append(key)
+
+    edge_columns: Dict[str, List[Any]] = {key: [] for key in EDGE_COLUMNS + ("relations",)}
+    edge_extra = []
+    for row, edge in enumerate(graph.get("edges") or []):
+        edge_columns["source"].append(_code(pool, edge.get("source")))
+        edge_columns["target"].append(_code(pool, edge.get("target")))
+        edge_columns["type"].append(_code(pool, edge.get("type")))
+        edge_columns["weight"].append(edge.get("weight"))
+        relations = edge.get("relations")
+        if relations and isinstance(relations, list) and all(
+            isinstance(r, str) and RELATION_SEPARATOR not in r for r in relations
+        ):
+            edge_columns["relations"].append(pool.code(RELATION_SEPARATOR.join(relations)))
+            extra = {k: v for k, v in edge.items() if k not in EDGE_COLUMNS and k != "relations"}
+        else:
+            edge_columns["relations"].append(-1)
+            extra = {k: v for k, v in edge.items() if k not in EDGE_COLUMNS}
+        if extra:
+            edge_extra.append([row, extra])
+
+    encoded_graph = {k: v for k, v in graph.items() if k not in ("nodes", "edges")}
+    encoded_graph.update({
+        "strings": pool.strings,
+        "nodes": {
+            "count": len(nodes),
+            "order": list(columns),
+            "columns": columns,
+            "coded": coded,
+            "absent": {k: rows for k, rows in absent.items() if rows},
+        },
+        "edges": {"columns": edge_columns, "extra": edge_extra},
+    })
+    encoded = {k: v for k, v in artifact.items() if k != "graph"}
+    encoded["graph"] = encoded_graph
+    return {"format": ARTIFACT_FORMAT, "version": ARTIFACT_VERSION, "artifact": encoded}
+
+
+def decode_artifact(data: Dict[str, Any]) -> Dict[str, Any]:
+    """압축 구조 -> final_artifact (일반 JSON 아티팩트는 그대로 반환)"""
+    if data.get("format") != ARTIFACT_FORMAT:
+        return data
+    if data.get("version") != ARTIFACT_VERSION:
+        raise ValueError(f"Unsupported artifact version: {data.get('version')}")
+
+    encoded = data["artifact"]
+    graph_data = encoded.get("graph") or {}
+    strings = graph_data.get("strings") or []
+
+    def lookup(code):
+        return None if code is None or code < 0 else strings[code]
+
+    node_data = graph_data.get("nodes") or {}
+    columns = dict(node_data.get("columns") or {})
+    for key in node_data.get("coded", ()):
+        columns[key] = [lookup(code) for code in columns[key]]
+    order = node_data.get("order") or list(columns)
+    nodes = [dict(zip(order, values)) for values in zip(*(columns[key] for key in order))]
+    if not order:
+        nodes = [{} for _ in range(node_data.get("count", 0))]
+    for key, rows in (node_data.get("absent") or {}).items():
+        for row in rows:
+            del nodes[row][key]  # 원래 없던 키 (None 값과 구분)
+
+    edge_data = graph_data.get("edges") or {}
+    edge_columns = edge_data.get("columns") or {}
+    sources = [lookup(code) for code in edge_columns.get("source", ())]
+    targets = [lookup(code) for code in edge_columns.get("target", ())]
+    relations = [lookup(code) for code in edge_columns.get("type", ())]
+    edges = [
+        {"source": source, "target": target, "type": relation, "weight": weight}
+        for source, target, relation, weight in zip(sources, targets, relations, edge_columns.get("weight", ()))
+    ]
+    for edge in edges:
+        if edge["weight"] is None:
+            del edge["weight"]
+        if edge["type"] is None:
+            del edge["type"]
+    for edge, code in zip(edges, edge_columns.get("relations", ())):
+        if code is not None and code >= 0:
+            edge["relations"] = strings[code].split(RELATION_SEPARATOR)
+    for row, extra in edge_data.get("extra") or []:
+        edges[row].update(extra)
+
+    graph = {k: v for k, v in graph_data.items() if k not in ("strings", "nodes", "edges")}
+    graph.update({"nodes": nodes, "edges": edges})
+    artifact = {k: v for k, v in encoded.items() if k != "graph"}
+    artifact["graph"] = graph
+    return artifact
+
+
+def dumps_msgpack(artifact: Dict[str, Any]) -> bytes:
+    if not MSGPACK_AVAILABLE:
+        raise RuntimeError("msgpack is not installed (pip install msgpack)")
+    return msgpack.packb(encode_artifact(artifact), use_bin_type=True, default=str)
+
+
+def loads_msgpack(raw: bytes) -> Dict[str, Any]:
+    if not MSGPACK_AVAILABLE:
+        raise RuntimeError("msgpack is not installed (pip install msgpack)")
+    return decode_artifact(msgpack.unpackb(raw, raw=False, strict_map_key=False))
+
+
+def save_artifact(path: Union[str, Path], artifact: Dict[str, Any]) -> Path:
+    """
+    확장자에 맞춰 아티팩트를 저장합니다.
+
+    - .msgpack: 압축 구조의 msgpack
+    - .compact.json: 압축 구조의 JSON (msgpack 없이도 ID 반복 제거)
+    - 그 외: 기존 JSON (indent=2)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".msgpack":
+        path.write_bytes(dumps_msgpack(artifact))
+    elif path.name.endswith(".compact.json"):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(encode_artifact(artifact), f, ensure_ascii=False, separators=(",", ":"), default=str)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(artifact, f, indent=2, ensure_ascii=False, default=str)
+    return path
+
+
+def load_artifact(path: Union[str, Path]) -> Dict[str, Any]:
+    """저장 형식(JSON/압축 JSON/msgpack)을 자동 판별해 final_artifact로 읽습니다."""
+    raw = Path(path).read_bytes()
+    if raw.lstrip()[:1] in (b"{", b"["):
+        return decode_artifact(json.loads(raw.decode("utf-8")))
+    return loads_msgpack(raw)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python -m shared.artifact_utils <input> <output>")
+        sys.exit(1)
+    src, dst = Path(sys.argv[1]), Path(sys.argv[2])
+    save_artifact(dst, load_artifact(src))
+    print(f"{src} ({src.stat().st_size:,} bytes) -> {dst} ({dst.stat().st_size:,} bytes)")
@@ -5,6 +5,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple, Any
 import re
 
+from shared.file_utils import select_files
+
 logger = logging.getLogger(__name__)
 
 
@@ -178,6 +180,33 @@ class PythonASTAnalyzer:
 
         return visitor.calls
 
+    @staticmethod
+    def extract_structure(tree: ast.Module) -> Dict[str, Any]:
+        """
+        함수/클래스/import/호출/복잡도 정보를 한 번의 순회로 추출합니다 (저장소 단위 분석용).
+
+        Args:
+            tree: AST Module
+
+        Returns:
+            {"functions", "classes", "imports", "aliases", "calls", "complexity", "nesting_depth"}
+            - complexity: 1 + 분기 수 (함수는 자신의 본문, 클래스는 직접 메서드 합, 파일은 전체)
+            - nesting_depth: 제어 블록(if/for/while/try/with/match) 최대 중첩 깊이
+            - aliases: 로컬 이름 -> import 대상 ("pkg.mod", "pkg.mod.name", 상대 import는 ".mod.name")
+            - calls: [{"caller": 호출자 이름("" = 모듈 레벨), "class": 소속 클래스, "callees": {호출식: 횟수}}]
+        """
+        visitor = _StructureVisitor()
+        visitor.visit(tree)
+        return {
+            "functions": visitor.functions,
+            "classes": visitor.classes,
+            "imports": visitor.imports,
+            "aliases": visitor.aliases,
+            "calls": visitor.calls,
+            "complexity": 1 + visitor.total_decisions,
+            "nesting_depth": visitor.max_nesting,
+        }
+
     @staticmethod
     def _extract_calls(node: ast.FunctionDef) -> List[str]:
         """함수 내에서의 호출들을 추출합니다."""
@@ -194,6 +223,174 @@ class PythonASTAnalyzer:
         return list(set(calls))
 
 
+class _StructureVisitor(ast.NodeVisitor):
+    """PythonASTAnalyzer.extract_structure의 단일 패스 방문자"""
+
+    def __init__(self):
+        self.functions: Dict[str, Dict] = {}
+        self.classes: Dict[str, Dict] = {}
+        self.imports: Dict[str, List[str]] = {"direct": [], "from": []}
+        self.aliases: Dict[str, str] = {}
+        self.calls: List[Dict[str, Any]] = []
+        self._call_index: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+        self._func_stack: List[str] = []
+        self._class_stack: List[str] = []
+        self._in_function = False
+        # 복잡도 프레임 (모듈 -> 함수 중첩 순). 분기는 가장 안쪽 함수 프레임에만 집계
+        self._frames: List[Dict[str, int]] = [{"decisions": 0, "depth": 0, "max_depth": 0}]
+        self.total_decisions = 0
+        self.max_nesting = 0
+
+    # ---------- Complexity (McCabe 분기 수 + 제어 블록 중첩 깊이) ----------
+
+    def _decision(self, count: int = 1):
+        self._frames[-1]["decisions"] += count
+        self.total_decisions += count
+
+    def _visit_block(self, nodes):
+        frame = self._frames[-1]
+        frame["depth"] += 1
+        frame["max_depth"] = max(frame["max_depth"], frame["depth"])
+        self.max_nesting = max(self.max_nesting, frame["depth"])
+        for child in nodes:
+            self.visit(child)
+        frame["depth"] -= 1
+
+    def visit_If(self, node):
+        self._decision()
+        self.visit(node.test)
+        self._visit_block(node.body)
+        if len(node.orelse) == 1 and isinstance(node.orelse[0], ast.If):
+            self.visit(node.orelse[0])  # elif는 같은 깊이
+        elif node.orelse:
+            self._visit_block(node.orelse)
+
+    def _visit_loop(self, node):
+        self._decision()
+        self._visit_block(list(ast.iter_child_nodes(node)))
+
+    visit_For = visit_AsyncFor = visit_While = _visit_loop
+
+    def _visit_nested(self, node):
+        self._visit_block(list(ast.iter_child_nodes(node)))
+
+    visit_Try = visit_With = visit_AsyncWith = _visit_nested
+    if hasattr(ast, "TryStar"):
+        visit_TryStar = _visit_nested
+    if hasattr(ast, "Match"):
+        visit_Match = _visit_nested
+
+    def _visit_branch(self, node):
+        self._decision()
+        self.generic_visit(node)
+
+    visit_ExceptHandler = visit_IfExp = visit_match_case = _visit_branch
+
+    def visit_BoolOp(self, node):
+        self._decision(len(node.values) - 1)
+        self.generic_visit(node)
+
+    def visit_comprehension(self, node):
+        self._decision(1 + len(node.ifs))
+        self.generic_visit(node)
+
+    # ---------- Definitions ----------
+
+    def _visit_function(self, node):
+        # 클래스 본문에 직접 정의된 함수만 메서드로 취급
+        direct_owner = self._class_stack[-1] if self._class_stack and not self._in_function else None
+        owner = self._class_stack[-1] if self._class_stack else None
+        self.functions[node.name] = {
+            "name": node.name,
+            "lineno": node.lineno,
+            "end_lineno": getattr(node, "end_lineno", node.lineno),
+            "args": [arg.arg for arg in node.args.args],
+            "docstring": ast.get_docstring(node) or "",
+            "class": owner,
+        }
+        if direct_owner and node.name not in self.classes[direct_owner]["methods"]:
+            self.classes[direct_owner]["methods"].append(node.name)
+
+        # 중첩 함수의 self는 바깥 메서드의 self (소속 클래스 유지)
+        self._func_stack.append(node.name)
+        self._frames.append({"decisions": 0, "depth": 0, "max_depth": 0})
+        in_function, self._in_function = self._in_function, True
+        self.generic_visit(node)
+        self._in_function = in_function
+        frame = self._frames.pop()
+        self._func_stack.pop()
+
+        info = self.functions[node.name]
+        info["complexity"] = 1 + frame["decisions"]
+        info["nesting_depth"] = frame["max_depth"]
+        if direct_owner:
+            owner_info = self.classes[direct_owner]
+            owner_info["complexity"] += frame["decisions"]
+            owner_info["nesting_depth"] = max(owner_info["nesting_depth"], frame["max_depth"])
+
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+
+    def visit_ClassDef(self, node):
+        self.classes[node.name] = {
+            "name": node.name,
+            "lineno": node.lineno,
+            "end_lineno": getattr(node, "end_lineno", node.lineno),
+            "bases": [_dotted_name(base) for base in node.bases if _dotted_name(base)],
+            "docstring": ast.get_docstring(node) or "",
+            "methods": [],
+            "complexity": 1,
+            "nesting_depth": 0,
+        }
+        self._class_stack.append(node.name)
+        in_function, self._in_function = self._in_function, False
+        self.generic_visit(node)
+        self._in_function = in_function
+        self._class_stack.pop()
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.imports["direct"].append(alias.name)
+            if alias.asname:
+                self.aliases[alias.asname] = alias.name
+            else:
+                top = alias.name.split(".")[0]
+                self.aliases.setdefault(top, top)
+
+    def visit_ImportFrom(self, node):
+        module = node.module or ""
+        prefix = "." * (node.level or 0) + module
+        for alias in node.names:
+            self.imports["from"].append(f"{module}.{alias.name}")
+            if alias.name != "*":
+                target = f"{prefix}.{alias.name}" if module else f"{prefix}{alias.name}"
+                self.aliases[alias.asname or alias.name] = target
+
+    def visit_Call(self, node):
+        callee = _dotted_name(node.func)
+        if callee:
+            caller = self._func_stack[-1] if self._func_stack else ""
+            owner = self._class_stack[-1] if caller and self._class_stack else None
+            entry = self._call_index.get((caller, owner))
+            if entry is None:
+                entry = self._call_index[(caller, owner)] = {"caller": caller, "class": owner, "callees": {}}
+                self.calls.append(entry)
+            entry["callees"][callee] = entry["callees"].get(callee, 0) + 1
+        self.generic_visit(node)
+
+
+def _dotted_name(node) -> Optional[str]:
+    """Name / Attribute 체인을 "a.b.c" 문자열로 변환 (그 외 표현식은 None)"""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
 class JavaASTAnalyzer:
     """Java 코드의 구조를 분석합니다 (정규표현식 기반)."""
 
@@ -331,6 +528,103 @@ class CodeAnalyzer:
         return result
 
 
+def split_code_chunks(code: str, ext: str = ".py", max_chars: int = 1500) -> List[Dict[str, Any]]:
+    """
+    코드를 함수/클래스 경계 단위의 청크로 분할합니다 (계층적 요약/임베딩용).
+
+    Python은 AST의 (lineno, end_lineno) 구간을 사용하고, 너무 큰 클래스는 메서드 단위로
+    다시 나눕니다. 파싱할 수 없는 코드나 다른 언어는 줄 단위 윈도우로 분할합니다.
+
+    Args:
+        code: 소스 코드
+        ext: 파일 확장자
+        max_chars: 청크 하나의 목표 최대 길이
+
+    Returns:
+        [{"name", "type", "start_line", "end_line", "code"}] (시작 줄 순)
+    """
+    lines = code.splitlines(keepends=True)
+    if not lines:
+        return []
+
+    tree = None
+    if ext == ".py":
+        try:
+            tree = ast.parse(code)
+        except (SyntaxError, ValueError):
+            tree = None
+
+    if tree is None:
+        return _window_chunks(lines, 1, len(lines), max_chars, "block")
+
+    def span(node) -> Tuple[int, int]:
+        start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+        return start, node.end_lineno
+
+    def text(start: int, end: int) -> str:
+        return "".join(lines[start - 1:end])
+
+    chunks = []
+    covered = set()
+    func_types = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+    for node in tree.body:
+        if isinstance(node, func_types):
+            start, end = span(node)
+            chunks.append({"name": node.name, "type": "function", "start_line": start,
+                           "end_line": end, "code": text(start, end)})
+            covered.update(range(start, end + 1))
+        elif isinstance(node, ast.ClassDef):
+            start, end = span(node)
+            body = text(start, end)
+            if len(body) <= max_chars:
+                chunks.append({"name": node.name, "type": "class", "start_line": start,
+                               "end_line": end, "code": body})
+                covered.update(range(start, end + 1))
+                continue
+
+            # 큰 클래스: 메서드 단위로 분할하고 나머지(헤더/속성)는 클래스 청크로 남김
+            method_lines = set()
+            for item in node.body:
+                if isinstance(item, func_types):
+                    m_start, m_end = span(item)
+                    chunks.append({"name": item.name, "type": "function", "start_line": m_start,
+                                   "end_line": m_end, "code": text(m_start, m_end)})
+                    method_lines.update(range(m_start, m_end + 1))
+            header = "".join(lines[i - 1] for i in range(start, end + 1) if i not in method_lines)
+            if header.strip():
+                chunks.append({"name": node.name, "type": "class", "start_line": start,
+                               "end_line": end, "code": header})
+            covered.update(range(start, end + 1))
+
+    # 모듈 레벨 코드 (import, 상수, 스크립트 본문)
+    module_code = "".join(line for i, line in enumerate(lines, 1) if i not in covered)
+    if module_code.strip():
+        chunks.append({"name": "<module>", "type": "module", "start_line": 1,
+                       "end_line": len(lines), "code": module_code})
+
+    chunks.sort(key=lambda c: (c["start_line"], c["type"] != "class"))
+    return chunks
+
+
+def _window_chunks(lines: List[str], start: int, end: int, max_chars: int, chunk_type: str) -> List[Dict[str, Any]]:
+    """줄 경계를 유지하면서 max_chars 단위의 윈도우로 분할합니다."""
+    chunks = []
+    buf, buf_start, size = [], start, 0
+    for lineno in range(start, end + 1):
+        line = lines[lineno - 1]
+        if buf and size + len(line) > max_chars:
+            chunks.append({"name": f"L{buf_start}-{lineno - 1}", "type": chunk_type,
+                           "start_line": buf_start, "end_line": lineno - 1, "code": "".join(buf)})
+            buf, buf_start, size = [], lineno, 0
+        buf.append(line)
+        size += len(line)
+    if buf and "".join(buf).strip():
+        chunks.append({"name": f"L{buf_start}-{end}", "type": chunk_type,
+                       "start_line": buf_start, "end_line": end, "code": "".join(buf)})
+    return chunks
+
+
 def analyze_repository(
     repo_path: str,
     extensions: Optional[List[str]] = None
@@ -359,22 +653,20 @@ def analyze_repository(
         }
     }
 
-    for file_path in repo_path.rglob("*"):
-        if file_path.is_file() and file_path.suffix in extensions:
-            if ".git" not in file_path.parts:
-                try:
-                    file_analysis = CodeAnalyzer.analyze_file(str(file_path))
-                    rel_path = str(file_path.relative_to(repo_path))
-                    analysis["files"][rel_path] = file_analysis
+    for file_path in select_files(str(repo_path), extensions):
+        try:
+            file_analysis = CodeAnalyzer.analyze_file(str(file_path))
+            rel_path = str(file_path.relative_to(repo_path))
+            analysis["files"][rel_path] = file_analysis
 
-                    analysis["statistics"]["total_files"] += 1
-                    analysis["statistics"]["total_lines"] += file_analysis["lines"]
+            analysis["statistics"]["total_files"] += 1
+            analysis["statistics"]["total_lines"] += file_analysis["lines"]
 
-                    lang = file_analysis["language"]
-                    analysis["statistics"]["languages"][lang] = \
-                        analysis["statistics"]["languages"].get(lang, 0) + 1
+            lang = file_analysis["language"]
+            analysis["statistics"]["languages"][lang] = \
+                analysis["statistics"]["languages"].get(lang, 0) + 1
 
-                except Exception as e:
-                    logger.warning(f"Failed to analyze {file_path}: {e}")
+        except Exception as e:
+            logger.warning(f"Failed to analyze {file_path}: {e}")
 
     return analysis
@@ -0,0 +1,235 @@
+"""
+shared/budget_utils.py
+Importance-ranked analysis budget planner.
+
+비싼 ML 스테이지(요약/임베딩)에 넘길 파일 집합을 한 번만 결정합니다.
+정규식 기반의 빠른 사전 스캔으로 구조 신호(import in-degree, 크기, 엔트리포인트)를
+수집하고, 예상 비용이 예산을 넘지 않는 범위에서 가치가 높은 파일부터 선택합니다.
+"""
+import math
+import re
+import logging
+import posixpath
+from pathlib import Path
+from typing import Dict, List, Optional, Iterable, Any
+
+from shared.file_utils import select_files
+
+logger = logging.getLogger(__name__)
+
+# 언어별 import 추출 (사전 스캔용 - 정확도보다 속도 우선)
+IMPORT_PATTERNS = {
+    ".py": re.compile(r"^[ \t]*(?:from[ \t]+(\.*[\w\.]*)[ \t]+import|import[ \t]+([\w\.]+))", re.MULTILINE),
+    ".js": re.compile(r"(?:\bfrom[ \t]*['\"]([^'\"\n]+)['\"]|\brequire\(['\"]([^'\"\n]+)['\"]\))"),
+    ".ts": re.compile(r"(?:\bfrom[ \t]*['\"]([^'\"\n]+)['\"]|\brequire\(['\"]([^'\"\n]+)['\"]\))"),
+    ".java": re.compile(r"^[ \t]*import[ \t]+(?:static[ \t]+)?([\w\.]+)[ \t]*;", re.MULTILINE),
+    ".go": re.compile(r"^[ \t]*(?:import[ \t]+)?(?:\w+[ \t]+)?\"([\w\./\-]+)\"", re.MULTILINE),
+}
+
+ENTRY_POINT_NAMES = {
+    "main.py", "__main__.py", "app.py", "server.py", "manage.py", "cli.py", "wsgi.py", "asgi.py",
+    "index.js", "index.ts", "main.js", "main.ts", "server.js", "server.ts", "app.js", "app.ts",
+    "main.go", "Main.java", "Application.java",
+}
+ENTRY_POINT_MARKERS = {
+    ".py": ("__name__ == \"__main__\"", "__name__ == '__main__'"),
+    ".go": ("func main()",),
+    ".java": ("public static void main",),
+}
+LOW_VALUE_DIRS = {"test", "tests", "__tests__", "spec", "examples", "example", "docs", "scripts", "migrations"}
+
+
+class BudgetPlanner:
+    """
+    파일 가치(value)와 예상 비용(cost)을 계산하여 예산 안에서 분석 대상을 고릅니다.
+
+    비용 모델은 초 단위입니다: cost = seconds_per_file + seconds_per_kb * size_kb
+    """
+
+    def __init__(
+        self,
+        budget_seconds: float = 300.0,
+        max_files: Optional[int] = None,
+        seconds_per_file: float = 1.5,
+        seconds_per_kb: float = 0.05,
+    ):
+        self.budget_seconds = budget_seconds
+        self.max_files = max_files
+        self.seconds_per_file = seconds_per_file
+        self.seconds_per_kb = seconds_per_kb
+
+    def plan(self, repo_path: str, files: Iterable[Path]) -> Dict[str, Any]:
+        """
+        사전 스캔 후 분석 계획을 반환합니다.
+
+        Returns:
+            {"files": [우선순위 순 ID], "scores": {...}, "estimated_seconds": ..., ...}
+        """
+        root = Path(repo_path)
+        infos = self._prepass(root, files)
+        in_degree = self._import_in_degree(infos)
+
+        max_in = max(in_degree.values(), default=0)
+        for fid, info in infos.items():
+            info["in_degree"] = in_degree.get(fid, 0)
+            info["score"] = self._score(fid, info, max_in)
+            info["cost"] = self.estimate_cost(info["size"])
+
+        # 점수 내림차순, 동점은 경로 순 (결정적 선택)
+        ranked = sorted(infos, key=lambda fid: (-infos[fid]["score"], fid))
+
+        selected = []
+        spent = 0.0
+        for fid in ranked:
+            if self.max_files is not None and len(selected) >= self.max_files:
+                break
+            cost = infos[fid]["cost"]
+            if spent + cost > self.budget_seconds:
+                continue  # 더 작은 파일이 남은 예산에 들어갈 수 있으므로 계속 탐색
+            selected.append(fid)
+            spent += cost
+
+        logger.info(
+            f"Budget plan: {len(selected)}/{len(infos)} files, "
+            f"~{spent:.1f}s of {self.budget_seconds:.1f}s budget."
+        )
+        return {
+            "files": selected,
+            "scores": {fid: round(infos[fid]["score"], 4) for fid in ranked},
+            "in_degree": {fid: infos[fid]["in_degree"] for fid in ranked if infos[fid]["in_degree"]},
+            "estimated_seconds": round(spent, 2),
+            "budget_seconds": self.budget_seconds,
+            "total_candidates": len(infos),
+        }
+
+    def estimate_cost(self, size_bytes: int) -> float:
+        return self.seconds_per_file + self.seconds_per_kb * (size_bytes / 1024)
+
+    def _prepass(self, root: Path, files: Iterable[Path]) -> Dict[str, Dict[str, Any]]:
+        infos = {}
+        for path in files:
+            fid = path.relative_to(root).as_posix()
+            try:
+                text = path.read_text(encoding="utf-8", errors="ignore")
+            except OSError:
+                continue
+
+            imports = []
+            pattern = IMPORT_PATTERNS.get(path.suffix)
+            if pattern:
+                for match in pattern.finditer(text):
+                    imp = next((g for g in match.groups() if g), None)
+                    if imp:
+                        imports.append(imp)
+
+            infos[fid] = {
+                "size": len(text.encode("utf-8", errors="ignore")),
+                "loc": text.count("\n") + 1,
+                "imports": imports,
+                "entry": path.name in ENTRY_POINT_NAMES
+                         or any(m in text for m in ENTRY_POINT_MARKERS.get(path.suffix, ())),
+            }
+        return infos
+
+    def _import_in_degree(self, infos: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+        """import 문을 파일 ID로 해석하여 파일별 피참조 횟수를 셉니다."""
+        index, basenames = self._build_index(infos)
+
+        in_degree: Dict[str, int] = {}
+        for fid, info in infos.items():
+            targets = set()
+            for imp in info["imports"]:
+                target = self._resolve(fid, imp, index, basenames)
+                if target and target != fid:
+                    targets.add(target)
+            for target in targets:
+                in_degree[target] = in_degree.get(target, 0) + 1
+        return in_degree
+
+    @staticmethod
+    def _build_index(fids: Iterable[str]):
+        """(모듈 경로 -> 파일 ID, 파일명 stem -> [파일 ID]) 색인"""
+        index: Dict[str, str] = {}
+        basenames: Dict[str, List[str]] = {}
+        for fid in fids:
+            stem_path = posixpath.splitext(fid)[0]
+            if stem_path.endswith("/__init__") or stem_path.endswith("/index"):
+                index.setdefault(stem_path.rsplit("/", 1)[0], fid)
+            index.setdefault(stem_path, fid)
+            basenames.setdefault(stem_path.rsplit("/", 1)[-1], []).append(fid)
+        return index, basenames
+
+    @staticmethod
+    def _resolve(importer: str, imp: str, index: Dict[str, str], basenames: Dict[str, List[str]]) -> Optional[str]:
+        base_dir = posixpath.dirname(importer)
+
+        # 상대 경로 (JS/TS './x', '../x')
+        if imp.startswith("."):
+            if "/" in imp or imp in (".", ".."):
+                candidate = posixpath.normpath(posixpath.join(base_dir, imp))
+                return index.get(candidate)
+            # Python 상대 import ('.state', '..utils')
+            dots = len(imp) - len(imp.lstrip("."))
+            pkg = base_dir
+            for _ in range(dots - 1):
+                pkg = posixpath.dirname(pkg)
+            rest = imp[dots:].replace(".", "/")
+            candidate = posixpath.join(pkg, rest) if rest else pkg
+            return index.get(candidate.strip("/"))
+
+        # 절대 모듈 경로: 가장 긴 접두사부터 시도 ('a.b.c' -> 'a/b/c', 'a/b')
+        parts = imp.replace("\\", "/").replace(".", "/").split("/")
+        # 패키지로 한정되지 않은 import('logging', 'react')는 저장소 최상위 모듈과 정확히 일치할 때만 인정
+        # (아래 파일명 기반 추정은 stdlib/외부 패키지를 같은 이름의 저장소 파일로 잘못 연결함)
+        qualified = len(parts) > 1
+        for i in range(len(parts), 0, -1):
+            candidate = "/".join(parts[:i])
+            if candidate in index:
+                return index[candidate]
+            # 저장소 하위 디렉토리에 위치한 패키지 (src/pkg/...)
+            if i == len(parts) and qualified:
+                owners = basenames.get(parts[-1], [])
+                suffix_hits = [f for f in owners if posixpath.splitext(f)[0].endswith("/" + candidate)]
+                if len(suffix_hits) == 1:
+                    return suffix_hits[0]
+
+        # 최후 수단: 파일명이 유일하고 상위 패키지 이름이 그 파일의 디렉토리에 있을 때만 매칭
+        # ('os.path'가 저장소의 util/path.py로 연결되지 않도록)
+        if not qualified:
+            return None
+        owners = basenames.get(parts[-1], [])
+        if len(owners) == 1 and parts[-2] in posixpath.dirname(owners[0]).split("/"):
+            return owners[0]
+        return None
+
+    def _score(self, fid: str, info: Dict[str, Any], max_in: int) -> float:
+        # 1. 피참조 횟수 (로그 스케일 정규화)
+        centrality = math.log1p(info["in_degree"]) / math.log1p(max_in) if max_in else 0.0
+
+        # 2. 크기: 너무 작은 파일(빈 __init__ 등)은 정보가 적음, 큰 파일은 포화
+        size_signal = min(math.log1p(info["loc"]) / math.log1p(500), 1.0)
+
+        score = 0.55 * centrality + 0.25 * size_signal
+        if info["entry"]:
+            score += 0.3
+
+        parts = fid.split("/")
+        if any(p in LOW_VALUE_DIRS for p in parts[:-1]) or parts[-1].startswith("test_"):
+            score *= 0.5
+        if parts[-1] in ("__init__.py",) and info["loc"] < 5:
+            score *= 0.2
+        return score
+
+
+def plan_analysis(
+    repo_path: str,
+    extensions: Iterable[str],
+    budget_seconds: float,
+    max_files: Optional[int] = None,
+    max_file_size: Optional[int] = None,
+) -> Dict[str, Any]:
+    """파일 선택 + 예산 계획을 한 번에 수행합니다."""
+    kwargs = {"max_file_size": max_file_size} if max_file_size else {}
+    files = select_files(repo_path, extensions, **kwargs)
+    planner = BudgetPlanner(budget_seconds=budget_seconds, max_files=max_files)
+    return planner.plan(repo_path, files)
@@ -0,0 +1,149 @@
+"""
+shared/cache_utils.py
+Persistent key-value cache (SQLite) with LRU/TTL eviction and hit-rate metrics.
+"""
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(*parts: str) -> str:
+    """여러 문자열을 구분자와 함께 이어붙인 SHA-256 해시 (캐시 키 생성용)"""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8", errors="ignore"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class PersistentCache:
+    """
+    실행/저장소 간에 공유되는 디스크 캐시.
+
+    - LRU: 엔트리 수가 max_entries를 넘으면 가장 오래 접근하지 않은 항목부터 제거
+    - TTL: ttl_seconds보다 오래된 항목은 조회 시 만료 처리
+    - 통계: hits / misses / evictions / hit_rate
+
+    조회 적중 시 접근 시각은 메모리에 모아 두었다가 put/eviction 직전, 또는
+    TOUCH_FLUSH_SIZE개가 쌓이거나 TOUCH_FLUSH_SECONDS가 지났을 때 한 번의 executemany + commit으로 기록합니다.
+    """
+    TOUCH_FLUSH_SIZE = 1024
+    TOUCH_FLUSH_SECONDS = 30.0
+
+    def __init__(self, path: str, max_entries: int = 100_000, ttl_seconds: Optional[float] = None):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+        self._touched: Dict[str, float] = {}  # 아직 기록하지 않은 접근 시각
+        self._touched_since = 0.0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL,"
+            " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache(accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._touched.pop(key, None)
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                self.evictions += 1
+                return None
+
+            if not self._touched:
+                self._touched_since = now
+            self._touched[key] = now
+            if len(self._touched) >= self.TOUCH_FLUSH_SIZE or now - self._touched_since >= self.TOUCH_FLUSH_SECONDS:
+                self._flush_touched_locked()
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: bytes) -> None:
+        now = time.time()
+        with self._lock:
+            self._touched.pop(key, None)
+            self._flush_touched_locked(commit=False)  # 같은 트랜잭션으로 기록
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._conn.commit()
+
+            # 매 쓰기마다 COUNT를 하지 않도록 일정 간격으로만 용량 검사
+            self._writes_since_evict += 1
+            if self._writes_since_evict >= max(self.max_entries // 100, 1):
+                self._writes_since_evict = 0
+                self._evict_locked()
+
+    def flush(self) -> None:
+        """모아 둔 접근 시각을 디스크에 기록합니다."""
+        with self._lock:
+            self._flush_touched_locked()
+
+    def _flush_touched_locked(self, commit: bool = True) -> None:
+        if not self._touched:
+            return
+        self._conn.executemany(
+            "UPDATE cache SET accessed_at = ? WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in self._touched.items()],
+        )
+        self._touched.clear()
+        if commit:
+            self._conn.commit()
+
+    def _evict_locked(self) -> None:
+        self._flush_touched_locked()  # LRU 순서가 최근 조회를 반영하도록
+        count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            )
+            self._conn.commit()
+            self.evictions += overflow
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
@@ -0,0 +1,216 @@
+"""
+shared/diff_utils.py
+Linear-time diff / patch between two final artifacts using hashed fingerprints.
+
+같은 저장소를 다시 분석했을 때 두 아티팩트 전체를 클라이언트에서 비교하지 않도록,
+서버에서 변경분만 계산합니다.
+
+  - 노드: id 키, 지문(정렬된 JSON의 blake2b 64bit)이 다르면 changed (바뀐 필드만 따로 비교)
+  - 엣지: (source, target) 키 (최종 그래프는 쌍마다 엣지 1개로 병합됨), type/weight/relations 등 지문 (changed는 키와 함께 기록)
+  - 중요도: 양쪽에 있는 노드의 importance 변화량이 임계값 이상인 항목
+  - 추천: (target, type, category) 키로 새로 생긴/사라진(closed)/내용이 바뀐 작업
+  - 그 외 섹션(context, metrics): 지문이 다르면 새 값으로 교체
+
+apply_diff(base, diff)는 base에 변경분을 적용해 새 아티팩트를 만듭니다 (저장된 diff 기록으로 이후 실행을 재구성할 때).
+
+    python -m shared.diff_utils <이전 아티팩트|디렉토리> <새 아티팩트|디렉토리>
+"""
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+from .artifact_utils import load_artifact
+
+DIFF_VERSION = 2  # 2: 엣지 키 (source, target)
+GRAPH_SECTIONS = ("graph", "recommendations")
+IGNORED_SECTIONS = ("changes",)  # 실행마다 붙는 변경 요약 (비교 대상 아님)
+ARTIFACT_NAMES = ("latest", "final_artifact")  # 실행/저장소 디렉토리 안의 아티팩트 파일 이름
+RECOMMENDATION_KEY_FIELDS = ("target", "type", "category")
+
+
+def fingerprint(value: Any) -> bytes:
+    """정렬된 JSON 표현의 64bit 해시 (dict 키 순서와 무관)"""
+    raw = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).digest()
+
+
+def _edge_keys(edges: Iterable[Dict[str, Any]]) -> Iterable[Tuple[Tuple[Any, ...], Dict[str, Any]]]:
+    """(source, target) 키 (EdgeMerger로 병합된 최종 그래프에서 유일, 관계 종류가 바뀌면 changed)"""
+    for edge in edges:
+        yield (edge.get("source"), edge.get("target")), edge
+
+
+def _recommendation_key(rec: Dict[str, Any]) -> Tuple[Any, ...]:
+    return tuple(rec.get(field) for field in RECOMMENDATION_KEY_FIELDS)
+
+
+def _changed_fields(before: Dict[str, Any], after: Dict[str, Any]) -> List[str]:
+    return sorted(
+        key for key in before.keys() | after.keys()
+        if key not in before or key not in after or fingerprint(before[key]) != fingerprint(after[key])
+    )
+
+
+def diff_artifacts(
+    base: Dict[str, Any],
+    new: Dict[str, Any],
+    importance_threshold: float = 0.05,
+) -> Dict[str, Any]:
+    """
+    두 final_artifact의 차이를 계산합니다 (노드/엣지/추천 수에 선형).
+
+    Args:
+        base: 이전 실행 아티팩트
+        new: 새 실행 아티팩트
+        importance_threshold: 보고할 최소 importance 변화량
+
+    Returns:
+        {"nodes", "edges", "importance", "recommendations", "sections", "summary"}
+    """
+    base_graph = base.get("graph") or {}
+    new_graph = new.get("graph") or {}
+
+    # 노드
+    base_nodes = {node["id"]: node for node in base_graph.get("nodes") or []}
+    base_prints = {nid: fingerprint(node) for nid, node in base_nodes.items()}
+    added_nodes, changed_nodes, importance = [], [], []
+    new_ids = set()
+    for node in new_graph.get("nodes") or []:
+        nid = node["id"]
+        new_ids.add(nid)
+        before = base_nodes.get(nid)
+        if before is None:
+            added_nodes.append(node)
+            continue
+        if base_prints[nid] == fingerprint(node):
+            continue
+        changed_nodes.append({"id": nid, "fields": _changed_fields(before, node), "node": node})
+        old_score, new_score = before.get("importance"), node.get("importance")
+        if isinstance(old_score, (int, float)) and isinstance(new_score, (int, float)):
+            delta = new_score - old_score
+            if abs(delta) >= importance_threshold:
+                importance.append({"id": nid, "before": old_score, "after": new_score, "delta": round(delta, 6)})
+    removed_nodes = [nid for nid in base_nodes if nid not in new_ids]
+    importance.sort(key=lambda item: -abs(item["delta"]))
+
+    # 엣지
+    base_edges = {key: fingerprint(edge) for key, edge in _edge_keys(base_graph.get("edges") or [])}
+    added_edges, changed_edges = [], []
+    new_keys = set()
+    for key, edge in _edge_keys(new_graph.get("edges") or []):
+        new_keys.add(key)
+        before = base_edges.get(key)
+        if before is None:
+            added_edges.append(edge)
+        elif before != fingerprint(edge):
+            changed_edges.append({"key": list(key), "edge": edge})
+    removed_edges = [list(key) for key in base_edges if key not in new_keys]
+
+    # 추천
+    base_recs = {_recommendation_key(rec): rec for rec in base.get("recommendations") or []}
+    new_recs = {_recommendation_key(rec): rec for rec in new.get("recommendations") or []}
+    opened = [rec for key, rec in new_recs.items() if key not in base_recs]
+    closed = [rec for key, rec in base_recs.items() if key not in new_recs]
+    updated = [
+        rec for key, rec in new_recs.items()
+        if key in base_recs and fingerprint(base_recs[key]) != fingerprint(rec)
+    ]
+
+    # 그 외 섹션 (context, metrics 등)은 통째로 비교
+    sections = {
+        name: new[name]
+        for name in sorted(new.keys() - set(GRAPH_SECTIONS) - set(IGNORED_SECTIONS))
+        if name not in base or fingerprint(base[name]) != fingerprint(new[name])
+    }
+    removed_sections = sorted(base.keys() - new.keys() - set(GRAPH_SECTIONS) - set(IGNORED_SECTIONS))
+
+    summary = {
+        "nodes_added": len(added_nodes),
+        "nodes_removed": len(removed_nodes),
+        "nodes_changed": len(changed_nodes),
+        "edges_added": len(added_edges),
+        "edges_removed": len(removed_edges),
+        "edges_changed": len(changed_edges),
+        "importance_shifts": len(importance),
+        "recommendations_new": len(opened),
+        "recommendations_closed": len(closed),
+        "recommendations_changed": len(updated),
+    }
+    summary["unchanged"] = not any(summary.values()) and not sections and not removed_sections
+    return {
+        "version": DIFF_VERSION,
+        "nodes": {"added": added_nodes, "removed": removed_nodes, "changed": changed_nodes},
+        "edges": {"added": added_edges, "removed": removed_edges, "changed": changed_edges},
+        "importance": importance,
+        "recommendations": {"new": opened, "closed": closed, "changed": updated},
+        "sections": sections,
+        "removed_sections": removed_sections,
+        "summary": summary,
+    }
+
+
+def apply_diff(base: Dict[str, Any], diff: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    base 아티팩트에 diff_artifacts() 결과를 적용한 새 아티팩트를 반환합니다 (base는 수정하지 않음).
+
+    기존 노드/엣지/추천의 순서를 유지하고, 새 항목은 뒤에 붙입니다.
+    """
+    if diff.get("version") != DIFF_VERSION:
+        raise ValueError(f"Unsupported diff version: {diff.get('version')}")
+
+    graph = dict(base.get("graph") or {})
+    node_diff = diff["nodes"]
+    removed = set(node_diff["removed"])
+    changed = {item["id"]: item["node"] for item in node_diff["changed"]}
+    nodes = [changed.get(node["id"], node) for node in graph.get("nodes") or [] if node["id"] not in removed]
+    nodes.extend(node_diff["added"])
+
+    edge_diff = diff["edges"]
+    removed_edges = {tuple(key) for key in edge_diff["removed"]}
+    changed_edges = {tuple(item["key"]): item["edge"] for item in edge_diff["changed"]}
+    edges = [
+        changed_edges.get(key, edge)
+        for key, edge in _edge_keys(graph.get("edges") or [])
+        if key not in removed_edges
+    ]
+    edges.extend(edge_diff["added"])
+    graph.update({"nodes": nodes, "edges": edges})
+
+    rec_diff = diff["recommendations"]
+    closed = {_recommendation_key(rec) for rec in rec_diff["closed"]}
+    updated = {_recommendation_key(rec): rec for rec in rec_diff.get("changed", ())}
+    recommendations = [
+        updated.get(_recommendation_key(rec), rec)
+        for rec in base.get("recommendations") or []
+        if _recommendation_key(rec) not in closed
+    ]
+    recommendations.extend(rec_diff["new"])
+
+    patched = {k: v for k, v in base.items() if k not in diff.get("removed_sections", ())}
+    patched.update(diff.get("sections") or {})
+    patched["graph"] = graph
+    if "recommendations" in base or recommendations:
+        patched["recommendations"] = recommendations
+    return patched
+
+
+def load_run(path: Union[str, Path]) -> Dict[str, Any]:
+    """아티팩트 파일 또는 실행/저장소 디렉토리(latest.* / final_artifact.*)에서 아티팩트를 읽습니다."""
+    path = Path(path)
+    if path.is_dir():
+        for name in ARTIFACT_NAMES:
+            for candidate in sorted(path.glob(f"{name}.*")):
+                if not candidate.name.endswith(".meta.json"):
+                    return load_artifact(candidate)
+        raise FileNotFoundError(f"No artifact found in {path}")
+    return load_artifact(path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python -m shared.diff_utils <base artifact|dir> <new artifact|dir>")
+        sys.exit(1)
+    result = diff_artifacts(load_run(sys.argv[1]), load_run(sys.argv[2]))
+    print(json.dumps({"summary": result["summary"], "importance": result["importance"][:20]}, indent=2, ensure_ascii=False))
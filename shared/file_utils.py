@@ -2,13 +2,313 @@
 shared/file_utils.py
 File system utilities for repository processing.
 """
+import os
+import re
 import shutil
 import logging
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple
 
 logger = logging.getLogger(__name__)
 
+# 모든 스테이지가 공유하는 기본 제외 디렉토리
+# ("env", "out", "target"처럼 소스 디렉토리 이름으로도 쓰이는 이름은 넣지 않고 .gitignore/마커 파일로 판별)
+DEFAULT_EXCLUDE_DIRS = {
+    ".git", ".hg", ".svn", "__pycache__", ".venv", "venv",
+    "node_modules", "dist", "build", "vendor",
+    ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".idea", ".vscode",
+    "temp_repos",
+}
+
+# 이 파일/디렉토리가 들어 있는 디렉토리는 이름과 무관하게 제외 (가상환경, conda 환경, Cargo target 등 캐시 디렉토리)
+EXCLUDE_DIR_MARKERS = ("pyvenv.cfg", "conda-meta", "CACHEDIR.TAG")
+
+# 저장소 안에서 읽어들이는 무시 규칙 파일 (.gitignore 문법)
+IGNORE_FILENAMES = (".gitignore", ".fithubignore")
+
+DEFAULT_MAX_FILE_SIZE = 512 * 1024  # 512KB 이상은 분석 대상에서 제외
+SNIFF_BYTES = 8192                  # 바이너리/생성 파일 판별용 헤더 크기
+MINIFIED_LINE_LENGTH = 1000         # 이보다 긴 평균 줄 길이는 minified로 간주
+
+# 파일명만으로 판별 가능한 생성/번들 파일
+GENERATED_NAME_PATTERNS = re.compile(
+    r"(\.min\.(js|css)|\.bundle\.js|\.chunk\.js|_pb2(_grpc)?\.py|\.pb\.go|\.pb\.(cc|h)"
+    r"|\.generated\.\w+|\.g\.dart|\.designer\.cs|package-lock\.json|yarn\.lock|pnpm-lock\.yaml)$",
+    re.IGNORECASE,
+)
+
+# 헤더 주석에 흔히 들어가는 생성기 마커 (첫 코드 줄 이전의 주석 줄에서만 검사)
+GENERATED_MARKERS = (
+    b"@generated", b"DO NOT EDIT", b"Code generated by", b"auto-generated",
+    b"autogenerated", b"This file is generated",
+)
+HEADER_BYTES = 2048
+COMMENT_PREFIXES = (b"#", b"//", b"/*", b"*", b"<!--", b"--", b";")
+BLOCK_COMMENTS = ((b"/*", b"*/"), (b"<!--", b"-->"))
+
+
+class IgnoreRules:
+    """
+    .gitignore 문법의 무시 규칙 집합.
+    하위 디렉토리의 규칙 파일은 해당 디렉토리 기준의 상대 경로로 적용됩니다.
+    """
+
+    def __init__(self):
+        # (base_dir, regex, negate, dir_only) - 마지막으로 매칭된 규칙이 우선
+        self.rules: List[Tuple[str, "re.Pattern", bool, bool]] = []
+
+    def add_file(self, ignore_file: Path, base_dir: str = "") -> None:
+        """규칙 파일 하나를 읽어 추가합니다."""
+        try:
+            with open(ignore_file, "r", encoding="utf-8", errors="ignore") as f:
+                self.add_patterns(f.read().splitlines(), base_dir)
+        except OSError as e:
+            logger.warning(f"Failed to read ignore file {ignore_file}: {e}")
+
+    def add_patterns(self, lines: Iterable[str], base_dir: str = "") -> None:
+        """패턴 목록을 추가합니다. base_dir은 저장소 루트 기준 상대 경로입니다."""
+        for line in lines:
+            rule = self._compile(line)
+            if rule:
+                self.rules.append((base_dir.strip("/"), *rule))
+
+    def is_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """저장소 루트 기준 상대 경로(posix)가 무시 대상인지 판단합니다."""
+        ignored = False
+        for base_dir, regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if base_dir:
+                if not rel_path.startswith(base_dir + "/"):
+                    continue
+                path = rel_path[len(base_dir) + 1:]
+            else:
+                path = rel_path
+            if regex.match(path):
+                ignored = not negate
+        return ignored
+
+    @staticmethod
+    def _compile(line: str) -> Optional[Tuple["re.Pattern", bool, bool]]:
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            return None
+
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        if line.startswith("\\"):
+            line = line[1:]
+
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            return None
+
+        # 중간에 '/'가 있으면 기준 디렉토리에 고정(anchored), 없으면 어느 깊이든 매칭
+        anchored = "/" in line
+        line = line.lstrip("/")
+
+        regex = IgnoreRules._translate(line)
+        prefix = "^" if anchored else "^(?:.*/)?"
+        return re.compile(prefix + regex + "$"), negate, dir_only
+
+    @staticmethod
+    def _translate(pattern: str) -> str:
+        """glob 패턴을 정규식으로 변환 (**, *, ?, [...] 지원)"""
+        out = []
+        i, n = 0, len(pattern)
+        while i < n:
+            c = pattern[i]
+            if pattern.startswith("**/", i):
+                out.append("(?:.*/)?")
+                i += 3
+            elif pattern.startswith("/**", i) and i + 3 == n:
+                out.append("(?:/.*)?")
+                i += 3
+            elif pattern.startswith("**", i):
+                out.append(".*")
+                i += 2
+            elif c == "*":
+                out.append("[^/]*")
+                i += 1
+            elif c == "?":
+                out.append("[^/]")
+                i += 1
+            elif c == "[":
+                end = pattern.find("]", i + 1)
+                if end == -1:
+                    out.append(re.escape(c))
+                    i += 1
+                else:
+                    body = pattern[i + 1:end]
+                    if body.startswith("!"):
+                        body = "^" + body[1:]
+                    out.append(f"[{body}]")
+                    i = end + 1
+            else:
+                out.append(re.escape(c))
+                i += 1
+        return "".join(out)
+
+
+class FileSelector:
+    """
+    모든 분석 스테이지가 공유하는 파일 선택 엔진.
+    무시 규칙, 크기 제한, 바이너리/생성 파일 판별을 스캔 단계에서 적용하여
+    비싼 스테이지(파싱/요약/임베딩)에 불필요한 파일이 넘어가지 않도록 합니다.
+    """
+
+    def __init__(
+        self,
+        extensions: Optional[Iterable[str]] = None,
+        max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+        exclude_dirs: Optional[Iterable[str]] = None,
+        use_ignore_files: bool = True,
+        skip_generated: bool = True,
+    ):
+        self.extensions = set(extensions) if extensions else None
+        self.max_file_size = max_file_size
+        self.exclude_dirs = set(exclude_dirs) if exclude_dirs is not None else set(DEFAULT_EXCLUDE_DIRS)
+        self.use_ignore_files = use_ignore_files
+        self.skip_generated = skip_generated
+        self.skipped: Dict[str, int] = {}
+
+    def iter_files(self, repo_path: str) -> Iterator[Path]:
+        """선택된 파일을 디렉토리 순회 순서대로 반환합니다."""
+        root = Path(repo_path)
+        rules = IgnoreRules()
+        self.skipped = {}
+
+        for dirpath, dirs, files in os.walk(root):
+            rel_dir = Path(dirpath).relative_to(root).as_posix()
+            rel_dir = "" if rel_dir == "." else rel_dir
+
+            if self.use_ignore_files:
+                for name in IGNORE_FILENAMES:
+                    if name in files:
+                        rules.add_file(Path(dirpath) / name, rel_dir)
+
+            # 하위 디렉토리 가지치기 (무시된 디렉토리는 아예 내려가지 않음)
+            kept = []
+            for d in sorted(dirs):
+                rel = f"{rel_dir}/{d}" if rel_dir else d
+                if d in self.exclude_dirs or rules.is_ignored(rel, is_dir=True) or is_excluded_dir(Path(dirpath) / d):
+                    self._skip("ignored_dir")
+                    continue
+                kept.append(d)
+            dirs[:] = kept
+
+            for name in sorted(files):
+                path = Path(dirpath) / name
+                rel = f"{rel_dir}/{name}" if rel_dir else name
+                reason = self._reject_reason(path, rel, rules)
+                if reason:
+                    self._skip(reason)
+                    continue
+                yield path
+
+    def select(self, repo_path: str) -> List[Path]:
+        """선택된 파일 목록 (경로 순 정렬)"""
+        files = sorted(self.iter_files(repo_path))
+        if self.skipped:
+            logger.info(f"File selection kept {len(files)} files, skipped {self.skipped}")
+        return files
+
+    def _reject_reason(self, path: Path, rel_path: str, rules: IgnoreRules) -> Optional[str]:
+        if self.extensions is not None and path.suffix not in self.extensions:
+            return "extension"
+        if rules.is_ignored(rel_path):
+            return "ignored"
+        if self.skip_generated and GENERATED_NAME_PATTERNS.search(path.name):
+            return "generated"
+
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return "unreadable"
+        if self.max_file_size and size > self.max_file_size:
+            return "too_large"
+
+        # 헤더 한 번만 읽어서 바이너리/생성 파일을 동시에 판별
+        try:
+            with open(path, "rb") as f:
+                head = f.read(SNIFF_BYTES)
+        except OSError:
+            return "unreadable"
+        if is_binary(head):
+            return "binary"
+        if self.skip_generated and is_generated(head):
+            return "generated"
+        return None
+
+    def _skip(self, reason: str) -> None:
+        self.skipped[reason] = self.skipped.get(reason, 0) + 1
+
+
+def is_binary(head: bytes) -> bool:
+    """NUL 바이트 또는 제어 문자 비율로 바이너리 여부를 판단합니다."""
+    if not head:
+        return False
+    if b"\x00" in head:
+        return True
+    text_chars = bytes(range(32, 127)) + b"\n\r\t\f\b"
+    non_text = head.translate(None, text_chars)
+    # UTF-8 멀티바이트(>=0x80)는 텍스트로 취급
+    control = sum(1 for b in non_text if b < 0x80)
+    return control / len(head) > 0.3
+
+
+def is_excluded_dir(path: Path) -> bool:
+    """가상환경/캐시 디렉토리 마커가 있는지 확인합니다 (EXCLUDE_DIR_MARKERS)."""
+    return any(os.path.exists(os.path.join(path, marker)) for marker in EXCLUDE_DIR_MARKERS)
+
+
+def has_generated_header(head: bytes) -> bool:
+    """
+    파일 맨 앞 주석 블록(첫 코드 줄 이전)에 생성기 마커가 있는지 확인합니다.
+    본문/docstring/문자열에 "DO NOT EDIT" 등이 있는 직접 작성한 파일은 생성 파일로 보지 않습니다.
+    """
+    closing = None  # 여러 줄 주석 안이면 닫는 토큰
+    for raw in head[:HEADER_BYTES].removeprefix(b"\xef\xbb\xbf").split(b"\n"):
+        line = raw.strip()
+        if closing is None:
+            if not line:
+                continue
+            if not line.startswith(COMMENT_PREFIXES):
+                return False
+            for opening, end in BLOCK_COMMENTS:
+                if line.startswith(opening) and end not in line[len(opening):]:
+                    closing = end
+                    break
+        elif closing in line:
+            closing = None
+        if any(marker in line for marker in GENERATED_MARKERS):
+            return True
+    return False
+
+
+def is_generated(head: bytes) -> bool:
+    """헤더 주석의 생성기 마커 또는 minified 형태(매우 긴 줄)를 감지합니다."""
+    if has_generated_header(head):
+        return True
+    lines = head.split(b"\n")
+    # 마지막 줄은 잘렸을 수 있으므로 전체 헤더가 한두 줄뿐일 때만 길이로 판단
+    if len(head) >= SNIFF_BYTES and len(lines) <= 2:
+        return True
+    avg_len = len(head) / max(len(lines), 1)
+    return avg_len > MINIFIED_LINE_LENGTH
+
+
+def select_files(
+    repo_path: str,
+    extensions: Optional[Iterable[str]] = None,
+    max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+) -> List[Path]:
+    """기본 규칙으로 분석 대상 파일을 선택합니다."""
+    return FileSelector(extensions=extensions, max_file_size=max_file_size).select(repo_path)
+
+
 def list_files(
     repo_path: str,
     extensions: Optional[List[str]] = None,
@@ -17,24 +317,170 @@ def list_files(
     """
     저장소의 파일 목록을 가져옵니다.
     """
-    if exclude_dirs is None:
-        exclude_dirs = [".git", "__pycache__", ".venv", "venv", "node_modules"]
+    selector = FileSelector(extensions=extensions, exclude_dirs=exclude_dirs)
+    return [str(p) for p in selector.select(repo_path)]
 
-    files = []
-    repo_path = Path(repo_path)
 
-    for file_path in repo_path.rglob("*"):
-        if file_path.is_file():
-            if any(excl in file_path.parts for excl in exclude_dirs):
-                continue
+def path_parts(path: str) -> Tuple[str, ...]:
+    """경로를 정규화된 컴포넌트 튜플로 변환합니다 (역슬래시/"."/빈 컴포넌트 제거)."""
+    return tuple(p for p in str(path).replace("\\", "/").split("/") if p and p != ".")
 
-            if extensions:
-                if file_path.suffix not in extensions:
-                    continue
 
-            files.append(str(file_path))
+class _SuffixNode:
+    __slots__ = ("children", "exact", "best")
+
+    def __init__(self):
+        self.children: Dict[str, "_SuffixNode"] = {}
+        self.exact = None  # 이 노드에서 끝나는 경로 (len, key, value)
+        self.best = None   # 하위 트리 전체에서 가장 짧은 경로 (len, key, value)
+
+
+class PathSuffixIndex:
+    """
+    경로 -> 값 매핑의 컴포넌트 단위 접미사 인덱스 (역방향 경로 트라이).
+
+    절대 경로/상대 경로/저장소 루트가 다른 경로를 서로 맞출 때 사용합니다.
+    조회 비용은 매핑 크기와 무관하게 조회 경로의 컴포넌트 수에 비례합니다.
+
+    매칭 우선순위 (결정적):
+      1. 조회 경로 전체가 접미사인 키 ("src/a.py" -> "/abs/repo/src/a.py"),
+         여러 개면 가장 짧은 키, 그다음 사전순
+      2. 키 전체가 조회 경로의 접미사인 경우 중 가장 긴 키 ("a.py" -> "pkg/a.py")
+    """
+
+    def __init__(self, mapping: Optional[Dict[str, object]] = None):
+        self._root = _SuffixNode()
+        for key, value in (mapping or {}).items():
+            self.add(key, value)
+
+    def add(self, key: str, value: object) -> None:
+        parts = path_parts(key)
+        if not parts:
+            return
+        entry = (len(parts), str(key), value)
+        node = self._root
+        for part in reversed(parts):
+            node = node.children.setdefault(part, _SuffixNode())
+            if node.best is None or entry[:2] < node.best[:2]:
+                node.best = entry
+        if node.exact is None or entry[:2] < node.exact[:2]:
+            node.exact = entry
+
+    def lookup(self, path: str, default: object = None) -> object:
+        parts = path_parts(path)
+        node = self._root
+        deepest = None
+        for part in reversed(parts):
+            node = node.children.get(part)
+            if node is None:
+                break
+            if node.exact is not None:
+                deepest = node.exact
+        else:
+            if parts and node.best is not None:
+                return node.best[2]
+        return deepest[2] if deepest is not None else default
+
+def count_lines(path, chunk_size: int = 1 << 16) -> int:
+    """파일의 줄 수 (디코딩 없이 개행 바이트만 셈, 마지막 줄 개행 누락 포함)"""
+    lines = 0
+    last = b"\n"
+    try:
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                lines += chunk.count(b"\n")
+                last = chunk[-1:]
+    except OSError as e:
+        logger.warning(f"Failed to count lines of {path}: {e}")
+        return 0
+    return lines + (last != b"\n")
+
+
+class _DirNode:
+    __slots__ = ("id", "parent", "label", "children", "file_count", "loc", "importance_sum", "domains")
+
+    def __init__(self, id: str, parent: Optional[str], label: str):
+        self.id = id
+        self.parent = parent
+        self.label = label
+        self.children: Dict[str, "_DirNode"] = {}
+        self.file_count = 0
+        self.loc = 0
+        self.importance_sum = 0.0
+        self.domains: Dict[str, int] = {}  # 도메인 -> 파일 수
+
+
+class DirectoryTree:
+    """
+    파일 경로의 정방향 트라이 (디렉토리 계층 + 디렉토리별 집계).
+
+    파일마다 경로 컴포넌트를 한 번씩만 따라 내려가며 없는 디렉토리를 만들고,
+    집계(file_count, loc, importance_sum, dominant_domain)는 aggregate()의 후위 순회 한 번으로
+    상위 디렉토리에 누적합니다. 전체 비용은 경로 컴포넌트 총수에 선형입니다.
+    """
+
+    def __init__(self, root_id: str = "ROOT"):
+        self.root = _DirNode(root_id, None, root_id)
+
+    def add_file(self, path: str, loc: int = 0, importance: float = 0.0, domain: Optional[str] = None) -> str:
+        """파일을 추가하고 부모 디렉토리 ID를 반환합니다 (최상위 파일이면 root_id)."""
+        node = self.root
+        for part in path_parts(path)[:-1]:
+            child = node.children.get(part)
+            if child is None:
+                child_id = part if node is self.root else f"{node.id}/{part}"
+                child = node.children[part] = _DirNode(child_id, node.id, part)
+            node = child
+        node.file_count += 1
+        node.loc += loc or 0
+        node.importance_sum += importance or 0.0
+        if domain:
+            node.domains[domain] = node.domains.get(domain, 0) + 1
+        return node.id
+
+    def _preorder(self) -> List[_DirNode]:
+        order, stack = [], [self.root]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            stack.extend(node.children.values())
+        return order
+
+    def aggregate(self) -> List[Tuple[_DirNode, Dict[str, object]]]:
+        """
+        (디렉토리, 하위 트리 전체 집계) 목록을 전위 순서(부모가 먼저)로 반환합니다. 루트 포함.
+
+        집계: file_count, loc, importance_sum, dominant_domain (파일 수 최다, 동률이면 사전순)
+        """
+        order = self._preorder()
+        totals: Dict[str, Tuple[int, int, float, Dict[str, int]]] = {}
+        for node in reversed(order):
+            file_count, loc, importance = node.file_count, node.loc, node.importance_sum
+            domains = dict(node.domains)
+            for child in node.children.values():
+                c_files, c_loc, c_importance, c_domains = totals[child.id]
+                file_count += c_files
+                loc += c_loc
+                importance += c_importance
+                for domain, count in c_domains.items():
+                    domains[domain] = domains.get(domain, 0) + count
+            totals[node.id] = (file_count, loc, importance, domains)
+
+        result = []
+        for node in order:
+            file_count, loc, importance, domains = totals[node.id]
+            dominant = min(domains.items(), key=lambda item: (-item[1], item[0]))[0] if domains else None
+            result.append((node, {
+                "file_count": file_count,
+                "loc": loc,
+                "importance_sum": round(importance, 6),
+                "dominant_domain": dominant,
+            }))
+        return result
 
-    return sorted(files)
 
 def cleanup_directory(path: str) -> None:
     """디렉토리를 삭제합니다."""
@@ -0,0 +1,262 @@
+"""
+shared/graph_utils.py
+Compact, string-interned container for the structural code graph.
+
+파싱부터 GraphBuilder까지 노드/엣지를 dict 대신 아래 형태로 유지하고,
+직렬화(JSON 저장, API 응답) 시점에만 dict로 변환합니다.
+
+  - StringPool: ID/타입/언어/관계 문자열을 한 번만 저장하고 정수 코드로 참조
+  - NodeRecord: __slots__ 레코드 (노드마다 반복되는 키 문자열/dict 없음)
+  - EdgeTable: array 기반 열 저장 (source/target/relation 코드 + weight)
+  - EdgeMerger: (source, target)별 엣지 하나로 병합 (관계 집합 + 합산 가중치, 최종 그래프 출력용)
+"""
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+_MISSING = object()
+
+
+class StringPool:
+    """문자열 <-> 정수 코드 인터닝 테이블"""
+
+    __slots__ = ("strings", "_codes")
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            value = sys.intern(value)
+            code = self._codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def intern(self, value: Optional[str]) -> Optional[str]:
+        """풀에 등록된 동일 문자열 객체를 반환합니다 (None은 그대로)."""
+        if value is None:
+            return None
+        return self.strings[self.code(value)]
+
+    def __getitem__(self, code: int) -> str:
+        return self.strings[code]
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+class NodeRecord:
+    """
+    구조 그래프 노드 (id/type/label/language/complexity/nesting_depth + 선택 속성).
+
+    fusion 등 기존 소비자를 위해 dict와 같은 get()/[] 조회를 지원합니다.
+    """
+
+    FIELDS = ("id", "type", "label", "language", "complexity", "nesting_depth")
+    __slots__ = FIELDS + ("attrs",)
+    _FIELD_SET = frozenset(FIELDS)
+
+    def __init__(self, id, type, label=None, language=None, complexity=None, nesting_depth=None, attrs=None):
+        self.id = id
+        self.type = type
+        self.label = label
+        self.language = language
+        self.complexity = complexity
+        self.nesting_depth = nesting_depth
+        self.attrs = attrs  # docstring, args 등 드문 속성만 (없으면 None)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._FIELD_SET:
+            value = getattr(self, key)
+            return default if value is None else value
+        if self.attrs:
+            return self.attrs.get(key, default)
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {}
+        for field in self.FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                data[field] = value
+        if self.attrs:
+            data.update(self.attrs)
+        return data
+
+    def __repr__(self) -> str:
+        return f"NodeRecord({self.id!r}, {self.type!r})"
+
+
+class EdgeTable:
+    """열 지향 엣지 저장소. 순회 시 (source, target, relation, weight) 튜플을 생성합니다."""
+
+    __slots__ = ("pool", "_source", "_target", "_relation", "_weight")
+
+    def __init__(self, pool: Optional[StringPool] = None):
+        self.pool = pool if pool is not None else StringPool()
+        self._source = array("I")
+        self._target = array("I")
+        self._relation = array("I")
+        self._weight = array("d")
+
+    def add(self, source: str, target: str, relation: str, weight: float = 1.0) -> None:
+        code = self.pool.code
+        self._source.append(code(source))
+        self._target.append(code(target))
+        self._relation.append(code(relation))
+        self._weight.append(weight)
+
+    def __len__(self) -> int:
+        return len(self._source)
+
+    def __iter__(self) -> Iterator[Tuple[str, str, str, float]]:
+        strings = self.pool.strings
+        for s, t, r, w in zip(self._source, self._target, self._relation, self._weight):
+            yield strings[s], strings[t], strings[r], w
+
+    def to_dicts(self, relation_key: str = "relation") -> List[Dict[str, Any]]:
+        return [
+            {"source": s, "target": t, relation_key: r, "weight": w}
+            for s, t, r, w in self
+        ]
+
+
+class EdgeMerger:
+    """
+    (source, target) 해시 인덱스로 다중 엣지를 하나로 병합합니다.
+
+    - type: 가중치가 가장 큰 코드 관계 (동률이면 먼저 추가된 관계), 코드 관계가 없으면 structure
+    - weight: 코드 관계(structure 제외) 가중치 합 (같은 관계가 반복되면 누적, structure만 있으면 생략)
+    - relations: 병합된 관계가 둘 이상일 때만 정렬된 목록 (없으면 [type]과 같음)
+
+    structure 엣지가 대부분이므로 단일 관계 엣지는 기존 {"source", "target", "type"(, "weight")} 형식을 유지합니다.
+    """
+
+    STRUCTURE = "structure"
+
+    __slots__ = ("_index",)
+
+    def __init__(self):
+        self._index: Dict[Tuple[str, str], Dict[str, float]] = {}
+
+    def add(self, source: str, target: str, relation: str, weight: Optional[float] = 1.0) -> None:
+        relations = self._index.get((source, target))
+        if relations is None:
+            relations = self._index[(source, target)] = {}
+        relations[relation] = relations.get(relation, 0.0) + (1.0 if weight is None else float(weight))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._index
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """병합된 엣지 dict 목록 (추가 순서 유지)"""
+        result = []
+        structure = self.STRUCTURE
+        for (source, target), relations in self._index.items():
+            primary, weight, best = structure, 0.0, None
+            for relation, value in relations.items():
+                if relation == structure:
+                    continue
+                weight += value
+                if best is None or value > best:
+                    primary, best = relation, value
+            edge = {"source": source, "target": target, "type": primary}
+            if best is not None:
+                edge["weight"] = weight
+            if len(relations) > 1:
+                edge["relations"] = sorted(relations)
+            result.append(edge)
+        return result
+
+
+class CompactGraph:
+    """
+    구조 분석 결과 그래프.
+
+    - nodes: ID -> NodeRecord (삽입 순서 유지, 같은 ID는 나중 것이 우선 - 기존 dict 변환과 동일)
+    - edges: EdgeTable (노드 풀과 문자열 풀 공유)
+    - statistics: 분석 통계 (직렬화 시 함께 출력)
+    """
+
+    def __init__(self):
+        self.pool = StringPool()
+        self.nodes: Dict[str, NodeRecord] = {}
+        self.edges = EdgeTable(self.pool)
+        self.statistics: Dict[str, Any] = {}
+
+    def add_node(
+        self,
+        node_id: str,
+        type: str,
+        label: Optional[str] = None,
+        language: Optional[str] = None,
+        complexity: Optional[int] = None,
+        nesting_depth: Optional[int] = None,
+        **attrs: Any,
+    ) -> NodeRecord:
+        intern = self.pool.intern
+        node_id = intern(node_id)
+        record = NodeRecord(
+            node_id, intern(type), label, intern(language),
+            complexity, nesting_depth, attrs or None,
+        )
+        self.nodes[node_id] = record
+        return record
+
+    def add_nodes_from(self, nodes: Iterable[Dict[str, Any]]) -> None:
+        """파서가 반환한 dict 노드 목록을 등록합니다."""
+        for node in nodes:
+            node = dict(node)
+            self.add_node(node.pop("id"), node.pop("type", "file"), **node)
+
+    def add_edge(self, source: str, target: str, relation: str, weight: float = 1.0) -> None:
+        self.edges.add(source, target, relation, weight)
+
+    def add_edges_from(self, edges: Iterable[Dict[str, Any]]) -> None:
+        """dict 엣지 목록을 등록합니다 ("relation" 또는 fusion 형식의 "type" 키)."""
+        for edge in edges:
+            relation = edge.get("relation") or edge.get("type") or "related"
+            self.edges.add(edge["source"], edge["target"], relation, edge.get("weight", 1.0))
+
+    def node(self, node_id: str) -> Optional[NodeRecord]:
+        return self.nodes.get(node_id)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self.nodes
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def to_dict(self, relation_key: str = "relation") -> Dict[str, Any]:
+        """직렬화용 dict ({"nodes": [...], "edges": [...], "statistics": {...}})"""
+        return {
+            "nodes": [record.to_dict() for record in self.nodes.values()],
+            "edges": self.edges.to_dicts(relation_key),
+            "statistics": dict(self.statistics),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "CompactGraph":
+        """dict 결과(저장된 structural.json 등)를 CompactGraph로 변환합니다 (CompactGraph는 그대로 반환)."""
+        if isinstance(data, cls):
+            return data
+        graph = cls()
+        data = data or {}
+        graph.add_nodes_from(data.get("nodes", []))
+        graph.add_edges_from(data.get("edges", []))
+        graph.statistics = dict(data.get("statistics", {}))
+        return graph
@@ -0,0 +1,204 @@
+"""
+shared/pagerank_utils.py
+Sparse-matrix PageRank engine (SciPy CSR power iteration) with warm starts and personalization.
+
+networkx.pagerank와 같은 정의(가중 전이 행렬, dangling 노드 질량은 personalization 분포로 재분배,
+수렴 조건 sum|x - x_prev| < N * tol)를 따르므로 결과가 허용 오차 안에서 일치합니다.
+
+- build(): 노드 인덱스 + CSR 전이 행렬을 한 번만 구성 (중복 엣지는 가중치 합산)
+- run(): personalization(진입점 시드) / warm_start(이전 실행 벡터)를 바꿔가며 반복 실행
+
+SciPy/NumPy가 없으면 같은 알고리즘의 순수 Python 구현으로 동작합니다 (작은 그래프/테스트용).
+"""
+import logging
+import posixpath
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    import scipy.sparse as sp
+    SCIPY_AVAILABLE = True
+except ImportError:
+    np = sp = None
+    SCIPY_AVAILABLE = False
+
+# 진입점으로 간주하는 파일 이름 (personalized PageRank 시드)
+ENTRY_POINT_NAMES = frozenset({
+    "main.py", "__main__.py", "app.py", "server.py", "manage.py", "wsgi.py", "asgi.py", "cli.py",
+    "index.js", "main.js", "server.js", "app.js", "index.ts", "main.ts", "server.ts", "app.ts",
+    "main.go", "Main.java", "Application.java", "main.cpp", "main.c", "main.rs", "Program.cs",
+})
+
+
+class PageRankEngine:
+    """
+    PageRank 계산기.
+
+    Attributes:
+        iterations: 마지막 run()의 반복 횟수
+        converged: 마지막 run()의 수렴 여부 (미수렴이면 마지막 벡터를 반환하고 경고만 남김)
+    """
+
+    def __init__(self, alpha: float = 0.85, tol: float = 1.0e-6, max_iter: int = 100, use_scipy: bool = True):
+        self.alpha = alpha
+        self.tol = tol
+        self.max_iter = max_iter
+        self.use_scipy = use_scipy and SCIPY_AVAILABLE
+        self.nodes: List[Hashable] = []
+        self.index: Dict[Hashable, int] = {}
+        self.iterations = 0
+        self.converged = False
+        self._transition_t = None  # SciPy: P^T (CSR), x_next = P^T @ x
+        self._out: List[List[Tuple[int, float]]] = []  # 순수 Python: 정규화된 출력 인접 리스트
+        self._dangling = None
+
+    def build(self, nodes: Iterable[Hashable], edges: Iterable[Tuple[Hashable, Hashable, float]]) -> "PageRankEngine":
+        """
+        전이 행렬을 구성합니다.
+
+        Args:
+            nodes: 노드 목록 (엣지에만 나오는 노드는 자동 추가)
+            edges: (source, target, weight) 튜플
+        """
+        self.nodes = list(dict.fromkeys(nodes))
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+
+        rows, cols, vals = [], [], []
+        for source, target, weight in edges:
+            rows.append(self._node_index(source))
+            cols.append(self._node_index(target))
+            vals.append(float(weight))
+
+        n = len(self.nodes)
+        if self.use_scipy:
+            adjacency = sp.csr_array((np.asarray(vals, dtype=float), (rows, cols)), shape=(n, n))
+            out_weight = np.asarray(adjacency.sum(axis=1)).ravel()
+            scale = np.divide(1.0, out_weight, out=np.zeros_like(out_weight), where=out_weight != 0)
+            transition = sp.diags_array(scale) @ adjacency
+            self._transition_t = transition.T.tocsr()
+            self._dangling = np.flatnonzero(out_weight == 0)
+        else:
+            merged: List[Dict[int, float]] = [dict() for _ in range(n)]
+            for i, j, w in zip(rows, cols, vals):
+                merged[i][j] = merged[i].get(j, 0.0) + w
+            self._out = []
+            dangling = []
+            for i, targets in enumerate(merged):
+                total = sum(targets.values())
+                if total == 0:
+                    dangling.append(i)
+                    self._out.append([])
+                else:
+                    self._out.append([(j, w / total) for j, w in targets.items()])
+            self._dangling = dangling
+        return self
+
+    def _node_index(self, node: Hashable) -> int:
+        i = self.index.get(node)
+        if i is None:
+            i = self.index[node] = len(self.nodes)
+            self.nodes.append(node)
+        return i
+
+    def _vector(self, values: Optional[Dict[Hashable, float]], missing: float):
+        """노드 순서의 정규화된 분포 (None이거나 합이 0이면 균등 분포)"""
+        n = len(self.nodes)
+        if values:
+            if self.use_scipy:
+                vec = np.fromiter((values.get(node, missing) for node in self.nodes), dtype=float, count=n)
+                np.maximum(vec, 0.0, out=vec)
+                total = vec.sum()
+                if total > 0:
+                    return vec / total
+            else:
+                vec = [max(float(values.get(node, missing)), 0.0) for node in self.nodes]
+                total = sum(vec)
+                if total > 0:
+                    return [v / total for v in vec]
+            logger.warning("PageRank vector has zero mass; using uniform distribution.")
+        if self.use_scipy:
+            return np.full(n, 1.0 / n)
+        return [1.0 / n] * n
+
+    def run(
+        self,
+        personalization: Optional[Dict[Hashable, float]] = None,
+        warm_start: Optional[Dict[Hashable, float]] = None,
+    ) -> Dict[Hashable, float]:
+        """
+        PageRank를 계산합니다.
+
+        Args:
+            personalization: 텔레포트 분포 (예: 진입점 시드). 없는 노드는 0
+            warm_start: 시작 벡터 (예: 이전 실행 결과). 새로 생긴 노드는 균등 질량으로 채움
+        """
+        n = len(self.nodes)
+        self.iterations = 0
+        self.converged = False
+        if n == 0:
+            self.converged = True
+            return {}
+
+        p = self._vector(personalization, 0.0)
+        x = self._vector(warm_start, 1.0 / n)
+        if self.use_scipy:
+            x = self._iterate_scipy(x, p)
+        else:
+            x = self._iterate_python(x, p)
+
+        if not self.converged:
+            logger.warning(f"PageRank did not converge in {self.max_iter} iterations; returning last vector.")
+        return dict(zip(self.nodes, map(float, x)))
+
+    def _iterate_scipy(self, x, p):
+        alpha, dangling = self.alpha, self._dangling
+        threshold = len(self.nodes) * self.tol
+        for _ in range(self.max_iter):
+            self.iterations += 1
+            previous = x
+            x = alpha * (self._transition_t @ previous + previous[dangling].sum() * p) + (1 - alpha) * p
+            if np.abs(x - previous).sum() < threshold:
+                self.converged = True
+                break
+        return x
+
+    def _iterate_python(self, x, p):
+        alpha, out = self.alpha, self._out
+        n = len(self.nodes)
+        threshold = n * self.tol
+        for _ in range(self.max_iter):
+            self.iterations += 1
+            dangling_mass = sum(x[i] for i in self._dangling)
+            nxt = [alpha * dangling_mass * pi + (1 - alpha) * pi for pi in p]
+            for i, targets in enumerate(out):
+                share = alpha * x[i]
+                if share:
+                    for j, w in targets:
+                        nxt[j] += share * w
+            err = sum(abs(a - b) for a, b in zip(nxt, x))
+            x = nxt
+            if err < threshold:
+                self.converged = True
+                break
+        return x
+
+
+def entry_point_seeds(
+    node_files: Dict[Hashable, str],
+    names: Iterable[str] = ENTRY_POINT_NAMES,
+) -> Dict[Hashable, float]:
+    """
+    진입점 파일에 속한 노드를 personalization 시드로 반환합니다.
+
+    Args:
+        node_files: 노드 -> 파일 경로
+        names: 진입점 파일 이름 집합
+    """
+    names = set(names)
+    return {
+        node: 1.0
+        for node, path in node_files.items()
+        if path and posixpath.basename(str(path).replace("\\", "/")) in names
+    }
@@ -0,0 +1,198 @@
+"""
+shared/symbol_utils.py
+Repository-wide Python symbol table and call resolution.
+
+파일별 구조(PythonASTAnalyzer.extract_structure)를 모아 정규화된 이름(qualified name)
+인덱스를 만들고, 호출식("helper", "mod.func", "self.method", "Cls.method")을 실제
+함수/클래스 노드 ID로 해석하여 가중치가 있는 calls 엣지를 생성합니다.
+
+모든 조회는 해시 인덱스이므로 전체 비용은 호출 지점 수에 선형입니다.
+"""
+import logging
+import posixpath
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 상속 체인 / 재노출 별칭 탐색 깊이 상한 (순환 방지)
+MAX_BASE_DEPTH = 8
+
+
+def module_name(file_id: str) -> str:
+    """파일 ID를 모듈 이름으로 변환 ("pkg/sub/mod.py" -> "pkg.sub.mod", "pkg/__init__.py" -> "pkg")"""
+    stem = posixpath.splitext(file_id)[0]
+    if stem == "__init__" or stem.endswith("/__init__"):
+        stem = stem[:-len("__init__")].rstrip("/")
+    return stem.replace("/", ".")
+
+
+class SymbolTable:
+    """
+    저장소 단위 심볼 테이블.
+
+    - local: 파일별 정의 ("func", "Cls", "Cls.method" -> 노드 ID)
+    - modules: 모듈 이름 -> 파일 ID (+ 접미사 인덱스: src/ 레이아웃 등 루트가 다른 import 대응)
+    """
+
+    def __init__(self):
+        self.local: Dict[str, Dict[str, str]] = {}
+        self.structures: Dict[str, Dict[str, Any]] = {}
+        self.modules: Dict[str, str] = {}
+        self._module_suffixes: Dict[str, List[str]] = {}
+        self._class_keys: Dict[str, Tuple[str, str]] = {}  # 클래스 노드 ID -> (file_id, class_name)
+        self._inherited: Dict[Tuple[str, str, str], Optional[str]] = {}  # 상속 메서드 조회 메모
+        self.resolved = 0
+        self.unresolved = 0
+
+    def add_file(self, file_id: str, structure: Dict[str, Any]) -> None:
+        """파일 하나의 extract_structure 결과를 등록합니다."""
+        defs: Dict[str, str] = {}
+        classes = structure.get("classes", {})
+        for name, info in structure.get("functions", {}).items():
+            owner = info.get("class")
+            if not owner:
+                defs[name] = f"{file_id}::{name}"
+        for name, info in structure.get("functions", {}).items():
+            # 메서드 안의 중첩 함수도 파일 내 이름으로 호출 가능 (최상위 정의가 우선)
+            owner = info.get("class")
+            if owner and name not in classes.get(owner, {}).get("methods", []):
+                defs.setdefault(name, f"{file_id}::{name}")
+        for class_name, info in classes.items():
+            class_id = f"{file_id}::{class_name}"
+            defs[class_name] = class_id
+            self._class_keys[class_id] = (file_id, class_name)
+            for method in info.get("methods", []):
+                defs[f"{class_name}.{method}"] = f"{file_id}::{method}"
+
+        self.local[file_id] = defs
+        self.structures[file_id] = structure
+
+        mod = module_name(file_id)
+        self.modules[mod] = file_id
+        parts = mod.split(".")
+        for i in range(1, len(parts)):
+            self._module_suffixes.setdefault(".".join(parts[i:]), []).append(mod)
+
+    def resolve_calls(self) -> List[Dict[str, Any]]:
+        """
+        등록된 모든 호출식을 해석하여 calls 엣지를 생성합니다.
+
+        Returns:
+            [{"source": 호출자 ID, "target": 피호출 ID, "relation": "calls", "weight": 호출 횟수}]
+        """
+        weights: Dict[Tuple[str, str], int] = {}
+        for file_id, structure in self.structures.items():
+            for entry in structure.get("calls", []):
+                caller = entry["caller"]
+                source = f"{file_id}::{caller}" if caller else file_id
+                for callee, count in entry["callees"].items():
+                    target = self.resolve(file_id, callee, entry.get("class"))
+                    if target is None:
+                        self.unresolved += count
+                        continue
+                    self.resolved += count
+                    if target != source:
+                        weights[(source, target)] = weights.get((source, target), 0) + count
+
+        logger.info(f"Call resolution: {self.resolved} resolved, {self.unresolved} unresolved call sites.")
+        return [
+            {"source": source, "target": target, "relation": "calls", "weight": weight}
+            for (source, target), weight in weights.items()
+        ]
+
+    def resolve(self, file_id: str, callee: str, class_name: Optional[str] = None) -> Optional[str]:
+        """호출식 하나를 노드 ID로 해석합니다 (해석 불가/외부 라이브러리면 None)."""
+        head, _, rest = callee.partition(".")
+
+        # 1. self.method() / cls.method()
+        if head in ("self", "cls") and class_name:
+            if rest and "." not in rest:
+                return self._lookup_method(file_id, class_name, rest, 0)
+            return None
+
+        # 2. 같은 파일의 정의 (함수, 클래스, Cls.method)
+        defs = self.local.get(file_id, {})
+        if callee in defs:
+            return defs[callee]
+        if head in defs and rest:
+            return self._resolve_in_class(defs[head], rest)
+
+        # 3. import 별칭을 통한 정규화된 이름
+        alias = self.structures.get(file_id, {}).get("aliases", {}).get(head)
+        if alias:
+            qualified = self._absolute(file_id, alias)
+            return self.resolve_qualified(f"{qualified}.{rest}" if rest else qualified)
+        return None
+
+    def resolve_qualified(self, qualified: str, depth: int = 0) -> Optional[str]:
+        """"pkg.mod.func" / "pkg.mod.Cls.method" 형태의 이름을 노드 ID로 해석합니다."""
+        parts = qualified.split(".")
+        # 가장 긴 모듈 접두사부터 시도
+        for i in range(len(parts) - 1, 0, -1):
+            file_id = self._find_module(".".join(parts[:i]))
+            if file_id is None:
+                continue
+            symbol = ".".join(parts[i:])
+            defs = self.local[file_id]
+            if symbol in defs:
+                return defs[symbol]
+            head, _, rest = symbol.partition(".")
+            if head in defs and rest:
+                return self._resolve_in_class(defs[head], rest)
+            # 패키지 __init__ 등에서 재노출된 이름 (from .mod import func)
+            alias = self.structures[file_id].get("aliases", {}).get(head)
+            if alias and depth < MAX_BASE_DEPTH:
+                target = self._absolute(file_id, alias)
+                return self.resolve_qualified(f"{target}.{rest}" if rest else target, depth + 1)
+            return None
+        return None
+
+    def _find_module(self, mod: str) -> Optional[str]:
+        if mod in self.modules:
+            return self.modules[mod]
+        owners = self._module_suffixes.get(mod)
+        if owners and len(owners) == 1:
+            return self.modules[owners[0]]
+        return None
+
+    def _resolve_in_class(self, class_id: str, method: str) -> Optional[str]:
+        key = self._class_keys.get(class_id)
+        if key is None or "." in method:
+            return None
+        return self._lookup_method(key[0], key[1], method, 0)
+
+    def _lookup_method(self, file_id: str, class_name: str, method: str, depth: int) -> Optional[str]:
+        """클래스와 (해석 가능한) 부모 클래스에서 메서드를 찾습니다."""
+        defs = self.local.get(file_id, {})
+        node_id = defs.get(f"{class_name}.{method}")
+        if node_id or depth >= MAX_BASE_DEPTH:
+            return node_id
+
+        key = (file_id, class_name, method)
+        if key in self._inherited:
+            return self._inherited[key]
+        self._inherited[key] = None  # 순환 상속 보호
+
+        info = self.structures.get(file_id, {}).get("classes", {}).get(class_name, {})
+        for base in info.get("bases", []):
+            base_id = self.resolve(file_id, base)
+            base_key = self._class_keys.get(base_id) if base_id else None
+            if base_key:
+                found = self._lookup_method(base_key[0], base_key[1], method, depth + 1)
+                if found:
+                    self._inherited[key] = found
+                    return found
+        return None
+
+    def _absolute(self, file_id: str, target: str) -> str:
+        """상대 import 대상(".mod.name")을 절대 이름으로 변환합니다."""
+        if not target.startswith("."):
+            return target
+        level = len(target) - len(target.lstrip("."))
+        package = module_name(file_id)
+        if not (file_id.endswith("/__init__.py") or file_id == "__init__.py"):
+            package = package.rpartition(".")[0]
+        for _ in range(level - 1):
+            package = package.rpartition(".")[0]
+        rest = target[level:]
+        return f"{package}.{rest}" if package and rest else (package or rest)
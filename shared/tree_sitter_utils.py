@@ -0,0 +1,193 @@
+"""
+shared/tree_sitter_utils.py
+Process-wide tree-sitter Language registry and per-thread Parser cache.
+
+Language 객체는 프로세스 전체에서 한 번만 로드하고, Parser는 스레드마다 언어별로
+하나씩 재사용합니다 (Parser는 스레드 안전하지 않음).
+
+지원하는 로딩 경로 (앞에서부터 시도):
+  1. tree_sitter_language_pack / tree_sitter_languages (사전 빌드된 문법 패키지)
+  2. 직접 빌드한 공유 라이브러리 (lib_path, 구버전 Language(path, name) API)
+"""
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from tree_sitter import Language, Parser
+    TREE_SITTER_AVAILABLE = True
+except ImportError:
+    Language = Parser = None
+    TREE_SITTER_AVAILABLE = False
+
+try:
+    from tree_sitter_language_pack import get_language as _pack_get_language
+except ImportError:
+    try:
+        from tree_sitter_languages import get_language as _pack_get_language
+    except ImportError:
+        _pack_get_language = None
+
+DEFAULT_LIB_PATH = "build/my-languages.so"
+
+# 확장자 -> tree-sitter 문법 이름
+LANGUAGE_BY_EXT = {
+    ".py": "python",
+    ".js": "javascript", ".jsx": "javascript", ".mjs": "javascript", ".cjs": "javascript",
+    ".ts": "typescript", ".tsx": "tsx",
+    ".java": "java",
+    ".go": "go",
+    ".c": "c", ".h": "c",
+    ".cpp": "cpp", ".cc": "cpp", ".hpp": "cpp",
+    ".cs": "csharp",
+    ".rs": "rust",
+}
+
+_languages: Dict[str, Optional[object]] = {}
+_languages_lock = threading.Lock()
+_thread_local = threading.local()
+
+
+def _load_language(name: str, lib_path: str):
+    if _pack_get_language is not None:
+        try:
+            return _pack_get_language(name)
+        except Exception as e:
+            logger.debug(f"Language pack has no grammar for {name}: {e}")
+
+    if lib_path and os.path.exists(lib_path):
+        try:
+            return Language(lib_path, name)  # tree-sitter < 0.22
+        except Exception as e:
+            logger.debug(f"Failed to load {name} from {lib_path}: {e}")
+    return None
+
+
+def get_language(ext: str, lib_path: str = DEFAULT_LIB_PATH):
+    """
+    확장자에 해당하는 Language를 반환합니다 (프로세스 전역 캐시, 실패도 캐시).
+
+    Returns:
+        Language 객체 또는 None (tree-sitter 미설치/문법 없음)
+    """
+    name = LANGUAGE_BY_EXT.get(ext)
+    if not name or not TREE_SITTER_AVAILABLE:
+        return None
+
+    if name in _languages:
+        return _languages[name]
+
+    with _languages_lock:
+        if name not in _languages:
+            _languages[name] = _load_language(name, lib_path)
+            if _languages[name] is None:
+                logger.info(f"Tree-sitter grammar unavailable for '{name}'.")
+        return _languages[name]
+
+
+def _new_parser(language):
+    # 구버전(< 0.22) Parser(...)는 인자를 무시하므로 set_language가 있으면 그쪽을 사용
+    parser = Parser()
+    if hasattr(parser, "set_language"):
+        parser.set_language(language)  # tree-sitter < 0.22
+    else:
+        parser.language = language     # tree-sitter >= 0.22
+    return parser
+
+
+def get_parser(ext: str, lib_path: str = DEFAULT_LIB_PATH):
+    """
+    현재 스레드 전용 Parser를 반환합니다 (언어별로 한 번만 생성).
+
+    Returns:
+        Parser 객체 또는 None
+    """
+    language = get_language(ext, lib_path)
+    if language is None:
+        return None
+
+    parsers = getattr(_thread_local, "parsers", None)
+    if parsers is None:
+        parsers = _thread_local.parsers = {}
+
+    name = LANGUAGE_BY_EXT[ext]
+    parser = parsers.get(name)
+    if parser is None:
+        parser = parsers[name] = _new_parser(language)
+    return parser
+
+
+def parse_code(code: str, ext: str, lib_path: str = DEFAULT_LIB_PATH):
+    """코드를 파싱하여 Tree를 반환합니다 (문법이 없거나 실패하면 None)."""
+    parser = get_parser(ext, lib_path)
+    if parser is None:
+        return None
+    try:
+        return parser.parse(code.encode("utf-8", errors="ignore"))
+    except Exception as e:
+        logger.debug(f"Tree-sitter parse failed ({ext}): {e}")
+        return None
+
+
+def node_text(node, source: bytes) -> str:
+    """노드의 원본 텍스트 (node.text는 구버전에서 None일 수 있어 바이트 범위 사용)"""
+    return source[node.start_byte:node.end_byte].decode("utf-8", errors="ignore")
+
+
+# 구조 문자열에 기여하지 않는 노드 (하위 트리째 생략)
+DEFAULT_SKIP_TYPES = frozenset({"comment", "line_comment", "block_comment"})
+
+_CLOSE = object()
+
+
+def linearize_tree(
+    root,
+    max_chars: int = 512,
+    skip_types=DEFAULT_SKIP_TYPES,
+    named_only: bool = False,
+    max_leaf_chars: int = 20,
+) -> str:
+    """
+    AST를 "(type child child ...)" 형태의 텍스트로 평탄화합니다.
+
+    명시적 스택으로 전위 순회하며 max_chars에 도달하면 즉시 중단하므로
+    비용이 파일 크기가 아닌 예산에 비례하고, 깊은 트리에서도 재귀 한도에 걸리지 않습니다.
+
+    Args:
+        root: 시작 노드
+        max_chars: 출력 문자 예산
+        skip_types: 하위 트리째 생략할 노드 타입 (주석 등)
+        named_only: True이면 익명 노드(괄호, 구두점 등)를 생략
+        max_leaf_chars: 리프 텍스트 최대 길이 (넘으면 "...")
+    """
+    if root is None:
+        return ""
+
+    parts: List[str] = []
+    length = 0
+    stack = [root]
+    while stack and length < max_chars:
+        node = stack.pop()
+        if node is _CLOSE:
+            parts[-1] += ")"
+            length += 1
+            continue
+        if node.type in skip_types or (named_only and not node.is_named and node is not root):
+            continue
+
+        children = node.children
+        if not children:
+            text = (node.text or b"").decode("utf-8", errors="ignore")
+            token = text if len(text) < max_leaf_chars else "..."
+        else:
+            token = f"({node.type}"
+            stack.append(_CLOSE)
+            stack.extend(reversed(children))
+
+        parts.append(token)
+        length += len(token) + 1
+
+    return " ".join(parts)[:max_chars]
@@ -0,0 +1,85 @@
+"""
+Final artifact encoding micro-benchmark: size and parse time (pytest 수집 대상 아님).
+
+GraphBuilder 출력과 비슷한 합성 아티팩트(디렉토리/파일/함수 노드 + structure/defines/imports/calls 엣지)를
+JSON(indent=2), JSON(compact), 압축 JSON(사전 + 열 저장), msgpack(압축 구조)으로 저장하고
+파일 크기, gzip 크기, 읽기+복원 시간을 비교합니다.
+
+    python test/bench_artifact.py [files]
+"""
+import gzip
+import json
+import os
+import random
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared.artifact_utils import MSGPACK_AVAILABLE, decode_artifact, dumps_msgpack, encode_artifact, loads_msgpack
+
+
+def make_artifact(files: int, seed: int = 42) -> dict:
+    rng = random.Random(seed)
+    nodes = [{"id": "ROOT", "label": "Fithub", "size": 30, "color": "#000000", "group": "Root", "type": "directory", "parent": None}]
+    dirs = [f"src/module_{d}/components" for d in range(max(1, files // 25))]
+    for d in dirs:
+        nodes.append({"id": d, "label": d.split("/")[-1], "size": 15, "color": "#333333", "group": "Directory", "type": "directory", "parent": "ROOT"})
+    file_ids, func_ids = [], []
+    for f in range(files):
+        d = dirs[f % len(dirs)]
+        fid = f"{d}/service_handler_{f}.py"
+        file_ids.append(fid)
+        nodes.append({
+            "id": fid, "label": fid.split("/")[-1], "size": 20 + rng.random() * 80, "color": "#888888",
+            "group": "Module", "type": "file", "parent": d, "summary": "Handles requests. " * 4,
+            "summary_details": {}, "domain": "General", "importance": rng.random(),
+            "complexity": rng.randrange(40), "nesting_depth": rng.randrange(5),
+            "x": rng.uniform(-5000, 5000), "y": rng.uniform(-5000, 5000),
+        })
+        for g in range(8):
+            gid = f"{fid}::handle_request_{g}"
+            func_ids.append(gid)
+            nodes.append({
+                "id": gid, "label": f"handle_request_{g}", "size": 10 + rng.random() * 20, "color": "#888888",
+                "group": "Module", "type": "function", "parent": fid, "summary": "", "summary_details": {},
+                "domain": "General", "importance": rng.random(), "complexity": rng.randrange(10),
+                "nesting_depth": rng.randrange(3), "x": rng.uniform(-5000, 5000), "y": rng.uniform(-5000, 5000),
+            })
+    edges = [{"source": n["parent"], "target": n["id"], "type": "structure"} for n in nodes if n["parent"]]
+    edges += [{"source": n["parent"], "target": n["id"], "type": "defines", "weight": 1.0} for n in nodes if n["type"] == "function"]
+    edges += [{"source": rng.choice(file_ids), "target": rng.choice(file_ids), "type": "imports", "weight": 1.0} for _ in range(files * 3)]
+    edges += [{"source": rng.choice(func_ids), "target": rng.choice(func_ids), "type": "calls", "weight": 1.0} for _ in range(files * 10)]
+    return {"graph": {"nodes": nodes, "edges": edges}, "context": {}, "recommendations": [], "metrics": {}}
+
+
+def measure(name, raw: bytes, load):
+    start = time.perf_counter()
+    load(raw)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<26}{len(raw) / 1e6:>10.2f} MB{len(gzip.compress(raw, 6)) / 1e6:>10.2f} MB{elapsed * 1000:>10.0f} ms")
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    artifact = make_artifact(files)
+    graph = artifact["graph"]
+    print(f"artifact: {len(graph['nodes'])} nodes, {len(graph['edges'])} edges")
+    print(f"{'format':<26}{'size':>13}{'gzip':>13}{'parse':>13}")
+
+    measure("json (indent=2)", json.dumps(artifact, indent=2, ensure_ascii=False).encode("utf-8"), json.loads)
+    measure("json (compact)", json.dumps(artifact, separators=(",", ":")).encode("utf-8"), json.loads)
+    compact = json.dumps(encode_artifact(artifact), separators=(",", ":")).encode("utf-8")
+    measure("compact json (+decode)", compact, lambda raw: decode_artifact(json.loads(raw)))
+    if MSGPACK_AVAILABLE:
+        packed = dumps_msgpack(artifact)
+        measure("msgpack (+decode)", packed, loads_msgpack)
+        import msgpack
+        measure("msgpack (columns only)", packed, lambda raw: msgpack.unpackb(raw, strict_map_key=False))
+    else:
+        print("msgpack not installed; skipping msgpack rows")
+
+
+if __name__ == "__main__":
+    main()
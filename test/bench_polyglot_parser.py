@@ -0,0 +1,127 @@
+"""
+PolyglotParser micro-benchmark (pytest 수집 대상 아님).
+
+기존 파서(파일마다 문자열 패턴으로 re.finditer 3회 + 노드 생성)와 통합 스캐너를
+큰 minified JS / 생성된 C++ / 일반 Java 파일에서 비교합니다.
+
+기존 열은 정의 추출만 측정하고, 현재 파서는 분기 토큰 스캔(순환 복잡도)과 키워드/중복 필터를 함께 수행합니다.
+따라서 일률적인 속도 향상은 아닙니다: 정의가 조밀한 minified JS는 기존보다 1.2~1.3배 느리고,
+역추적이 큰 입력(pathological.js, 생성된 C++)에서 크게 빨라집니다.
+
+    python test/bench_polyglot_parser.py [scale]
+"""
+import os
+import re
+import sys
+import tempfile
+import time
+from typing import Tuple
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from mcp.structural_analysis.analyzer import PolyglotParser
+
+REPEAT = 3
+
+# 변경 전 패턴 (비교 기준)
+LEGACY_PATTERNS = {
+    ".js": [
+        r"(?:function\s+([a-zA-Z0-9_]+)|const\s+([a-zA-Z0-9_]+)\s*=\s*(?:async\s*)?\(|([a-zA-Z0-9_]+)\s*\([^)]*\)\s*\{)",
+        r"class\s+([a-zA-Z_][a-zA-Z0-9_]*)",
+        r"(?:import\s+.*?from\s+['\"](.*?)['\"]|require\(['\"](.*?)['\"]\))",
+    ],
+    ".cpp": [
+        r"\w+\s+([a-zA-Z0-9_]+)\s*\(",
+        r"class\s+([a-zA-Z0-9_]+)",
+        r"#include\s+[<\"](.*?)[>\"]",
+    ],
+    ".java": [
+        r"(?:public|protected|private|static|\s) +[\w\<\>\[\]]+\s+([a-zA-Z0-9_]+)\s*\(",
+        r"class\s+([a-zA-Z_][a-zA-Z0-9_]*)",
+        r"import\s+([a-zA-Z0-9_\.]+);",
+    ],
+}
+
+
+def make_minified_js(scale: int) -> str:
+    unit = (
+        "function a%d(b,c){if(b){return c(b)}for(var d=0;d<b.length;d++){c(d)}}"
+        "var e%d=function(f){return f&&f.g?f.g(h):i};const j%d=(k)=>k*2;"
+        "class L%d{m(n){return n}}"
+    )
+    return "".join(unit % (i, i, i, i) for i in range(scale))  # 한 줄짜리 번들
+
+
+def make_pathological_js(scale: int) -> str:
+    # 'from' 없는 import 토큰이 반복되는 긴 한 줄: 기존 `import\s+.*?from` 패턴은 매 토큰마다 줄 끝까지 스캔
+    return "var s='" + "import x; " * scale + "';"
+
+
+def make_generated_cpp(scale: int) -> str:
+    lines = ["#include <vector>", "#include \"gen.h\""]
+    for i in range(scale):
+        lines.append(f"static const unsigned long long table_{i}_data_values_entry = {i} ;")
+        lines.append(f"int generated_func_{i}(int a, int b) {{ return helper(a, b) + sizeof(table_{i}_data_values_entry); }}")
+        if i % 50 == 0:
+            lines.append(f"class Generated{i} : public Base {{ }};")
+    return "\n".join(lines)
+
+
+def make_java(scale: int) -> str:
+    lines = ["import java.util.List;", "public class Big {"]
+    for i in range(scale):
+        lines.append(f"    public static List<Map<String, Integer>> method{i}(int a) {{")
+        lines.append(f"        return compute{i}(a);")
+        lines.append("    }")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def bench_legacy(content: str, ext: str) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):  # 최선값 (패턴 컴파일은 첫 회에만 포함)
+        start = time.perf_counter()
+        # 변경 전 PolyglotParser.parse와 같은 작업 (노드/엣지 생성 포함)
+        nodes, edges = [], []
+        for kind, pattern in zip(("function", "class", "import"), LEGACY_PATTERNS[ext]):
+            for match in re.finditer(pattern, content, re.MULTILINE):
+                name = next((g for g in match.groups() if g), "unknown")
+                if kind != "import":
+                    nodes.append({"id": f"bench{ext}::{name}", "type": kind, "label": name, "language": ext})
+                edges.append({"source": "bench" + ext, "target": name, "relation": kind})
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_current(path: str, ext: str) -> Tuple[float, int]:
+    parser = PolyglotParser(path, time_limit=60.0)
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = parser.parse("bench" + ext)
+        best = min(best, time.perf_counter() - start)
+    return best, len(result["nodes"])
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    cases = [
+        ("minified.js", ".js", make_minified_js(scale)),
+        ("pathological.js", ".js", make_pathological_js(scale)),
+        ("generated.cpp", ".cpp", make_generated_cpp(scale)),
+        ("Big.java", ".java", make_java(scale)),
+    ]
+    print(f"{'file':<16}{'size(KB)':>10}{'legacy(ms)':>12}{'current(ms)':>13}{'nodes':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, ext, content in cases:
+            path = os.path.join(tmp, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+            legacy = bench_legacy(content, ext)
+            current, node_count = bench_current(path, ext)
+            print(f"{name:<16}{len(content) / 1024:>10.0f}{legacy * 1000:>12.1f}{current * 1000:>13.1f}{node_count:>8}")
+
+
+if __name__ == "__main__":
+    main()
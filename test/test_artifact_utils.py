@@ -0,0 +1,56 @@
+import sys
+import os
+import tempfile
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared.artifact_utils import (
+    MSGPACK_AVAILABLE, decode_artifact, dumps_msgpack, encode_artifact, load_artifact, loads_msgpack, save_artifact
+)
+
+ARTIFACT = {
+    "graph": {
+        "nodes": [
+            {"id": "ROOT", "label": "Fithub", "type": "directory", "parent": None},
+            {"id": "agent/main.py", "label": "main.py", "type": "file", "parent": "agent",
+             "importance": 0.8, "x": 1.5, "y": -2.0, "summary_details": {"k": [1, 2]}},
+            {"id": "agent/main.py::run", "type": "function", "parent": "agent/main.py", "complexity": 3},
+        ],
+        "edges": [
+            {"source": "agent/main.py", "target": "agent/main.py::run", "type": "defines", "weight": 1.0},
+            {"source": "ROOT", "target": "agent/main.py", "type": "structure"},
+            {"source": "agent/main.py", "target": "ROOT", "type": "aggregated", "weight": 2.0, "relations": {"imports": 2}},
+        ],
+    },
+    "context": {"statistics": {"total_files": 1}},
+    "recommendations": [{"title": "t"}],
+    "metrics": {"coverage": {"percentage": 100.0}},
+}
+
+
+class TestArtifactEncoding(unittest.TestCase):
+    def test_round_trip_preserves_artifact(self):
+        encoded = encode_artifact(ARTIFACT)
+        graph = encoded["artifact"]["graph"]
+        self.assertEqual(graph["strings"].count("agent/main.py"), 1)  # ID는 사전에 한 번만
+        self.assertTrue(all(isinstance(code, int) for code in graph["edges"]["columns"]["source"]))
+        self.assertEqual(decode_artifact(encoded), ARTIFACT)
+
+    def test_plain_json_artifact_passes_through(self):
+        self.assertEqual(decode_artifact(ARTIFACT), ARTIFACT)
+
+    def test_save_and_load_by_suffix(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("result.json", "result.compact.json"):
+                path = save_artifact(os.path.join(tmp, name), ARTIFACT)
+                self.assertEqual(load_artifact(path), ARTIFACT)
+
+    @unittest.skipUnless(MSGPACK_AVAILABLE, "msgpack not installed")
+    def test_msgpack_round_trip(self):
+        self.assertEqual(loads_msgpack(dumps_msgpack(ARTIFACT)), ARTIFACT)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import sys
+import os
+import ast
+import unittest
+import textwrap
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared.ast_utils import PythonASTAnalyzer, split_code_chunks
+from shared.symbol_utils import SymbolTable
+
+
+class TestSplitCodeChunks(unittest.TestCase):
+    def test_python_chunks_follow_ast_spans(self):
+        code = textwrap.dedent('''
+            import os
+
+            @decorator
+            def first(a):
+                return a
+
+            class Small:
+                x = 1
+
+            def second():
+                pass
+        ''').lstrip()
+
+        chunks = split_code_chunks(code, ".py", max_chars=1500)
+        names = [(c["name"], c["type"]) for c in chunks]
+
+        self.assertEqual(names, [("<module>", "module"), ("first", "function"),
+                                 ("Small", "class"), ("second", "function")])
+        first = chunks[1]
+        self.assertTrue(first["code"].startswith("@decorator"))
+        self.assertEqual((first["start_line"], first["end_line"]), (3, 5))
+
+    def test_large_class_is_split_into_methods(self):
+        methods = "".join(f"    def m{i}(self):\n        return {'x' * 40!r}\n\n" for i in range(10))
+        code = "class Big:\n    attr = 1\n\n" + methods
+
+        chunks = split_code_chunks(code, ".py", max_chars=200)
+        functions = [c["name"] for c in chunks if c["type"] == "function"]
+        header = [c for c in chunks if c["type"] == "class"]
+
+        self.assertEqual(functions, [f"m{i}" for i in range(10)])
+        self.assertEqual(len(header), 1)
+        self.assertIn("attr = 1", header[0]["code"])
+        self.assertNotIn("def m0", header[0]["code"])
+
+    def test_unparsable_code_uses_line_windows(self):
+        code = "function f() {\n  return 1;\n}\n" * 20
+        chunks = split_code_chunks(code, ".js", max_chars=100)
+
+        self.assertTrue(all(c["type"] == "block" for c in chunks))
+        self.assertTrue(all(len(c["code"]) <= 100 for c in chunks))
+        self.assertEqual("".join(c["code"] for c in chunks), code)
+
+
+
+def _structure(code: str):
+    return PythonASTAnalyzer.extract_structure(ast.parse(textwrap.dedent(code)))
+
+
+class TestCallResolution(unittest.TestCase):
+    def test_cross_file_calls_are_resolved(self):
+        table = SymbolTable()
+        table.add_file("pkg/__init__.py", _structure("from .util import helper\n"))
+        table.add_file("pkg/util.py", _structure('''
+            def helper():
+                pass
+
+            class Base:
+                def save(self):
+                    pass
+        '''))
+        table.add_file("pkg/service.py", _structure('''
+            import pkg.util as u
+            from pkg import helper
+            from .util import Base
+
+            class Service(Base):
+                def run(self):
+                    helper()
+                    helper()
+                    u.helper()
+                    self.save()
+                    self.local()
+                    print("external")
+
+                def local(self):
+                    def inner():
+                        return Base()
+                    return inner()
+        '''))
+
+        edges = {(e["source"], e["target"]): e["weight"] for e in table.resolve_calls()}
+
+        self.assertEqual(edges[("pkg/service.py::run", "pkg/util.py::helper")], 3)
+        self.assertEqual(edges[("pkg/service.py::run", "pkg/util.py::save")], 1)
+        self.assertEqual(edges[("pkg/service.py::run", "pkg/service.py::local")], 1)
+        self.assertEqual(edges[("pkg/service.py::inner", "pkg/util.py::Base")], 1)
+        self.assertEqual(edges[("pkg/service.py::local", "pkg/service.py::inner")], 1)
+        self.assertEqual(table.unresolved, 1)  # print
+
+    def test_nested_functions_are_not_methods(self):
+        structure = _structure('''
+            class A:
+                def m(self):
+                    def helper():
+                        pass
+        ''')
+        self.assertEqual(structure["classes"]["A"]["methods"], ["m"])
+
+
+class TestComplexity(unittest.TestCase):
+    def test_cyclomatic_complexity_and_nesting(self):
+        structure = _structure('''
+            def f(items):
+                for x in items:
+                    if x and x > 1:
+                        pass
+                    elif x:
+                        try:
+                            pass
+                        except ValueError:
+                            pass
+                return [y for y in items if y]
+
+            class C:
+                def m(self, a):
+                    return 1 if a else 2
+        ''')
+        f = structure["functions"]["f"]
+        # for, if, and, elif, except, comprehension for, comprehension if
+        self.assertEqual(f["complexity"], 8)
+        self.assertEqual(f["nesting_depth"], 3)  # for > elif > try
+        self.assertEqual(structure["functions"]["m"]["complexity"], 2)
+        self.assertEqual(structure["classes"]["C"]["complexity"], 2)
+        self.assertEqual(structure["complexity"], 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
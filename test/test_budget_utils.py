@@ -0,0 +1,83 @@
+import sys
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared.budget_utils import BudgetPlanner
+
+
+class TestResolve(unittest.TestCase):
+    FILES = [
+        "src/app/__init__.py", "src/app/main.py", "src/app/state.py", "src/app/utils/logging.py",
+        "src/app/utils/path.py", "web/src/index.ts", "web/src/api/client.ts", "web/src/api/index.ts",
+        "src/main/java/com/shop/service/UserService.java", "internal/store/store.go",
+    ]
+
+    def setUp(self):
+        self.index, self.basenames = BudgetPlanner._build_index(self.FILES)
+
+    def resolve(self, importer, imp):
+        return BudgetPlanner._resolve(importer, imp, self.index, self.basenames)
+
+    def test_relative_imports(self):
+        self.assertEqual(self.resolve("src/app/main.py", ".state"), "src/app/state.py")
+        self.assertEqual(self.resolve("src/app/utils/path.py", "..state"), "src/app/state.py")
+        self.assertEqual(self.resolve("web/src/index.ts", "./api/client"), "web/src/api/client.ts")
+        self.assertEqual(self.resolve("web/src/api/client.ts", "."), "web/src/api/index.ts")
+
+    def test_package_qualified_imports(self):
+        self.assertEqual(self.resolve("src/app/main.py", "app.utils.logging"), "src/app/utils/logging.py")
+        self.assertEqual(
+            self.resolve("x/A.java", "com.shop.service.UserService"),
+            "src/main/java/com/shop/service/UserService.java",
+        )
+        self.assertEqual(self.resolve("cmd/main.go", "github.com/acme/repo/internal/store"), "internal/store/store.go")
+
+    def test_stdlib_and_external_imports_stay_unresolved(self):
+        self.assertIsNone(self.resolve("src/app/main.py", "logging"))
+        self.assertIsNone(self.resolve("src/app/main.py", "os.path"))
+        self.assertIsNone(self.resolve("web/src/index.ts", "react"))
+        self.assertIsNone(self.resolve("x/A.java", "java.util.logging"))
+
+
+class TestBudgetPlanner(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, rel, text):
+        path = self.root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def test_plan_ranks_by_in_degree_and_respects_budget(self):
+        files = [
+            self.write("pkg/core.py", "import logging\n\ndef core():\n    return 1\n"),
+            self.write("pkg/a.py", "import pkg.core\nimport logging\n"),
+            self.write("pkg/b.py", "from .core import core\n"),
+            self.write("pkg/logging.py", "LEVEL = 1\n"),
+            self.write("tests/test_core.py", "from pkg.core import core\n"),
+        ]
+        planner = BudgetPlanner(budget_seconds=100.0, seconds_per_file=1.0, seconds_per_kb=0.0)
+        plan = planner.plan(str(self.root), files)
+
+        self.assertEqual(plan["files"][0], "pkg/core.py")
+        self.assertEqual(plan["in_degree"], {"pkg/core.py": 3})  # stdlib logging은 pkg/logging.py로 연결되지 않음
+        self.assertEqual(plan["total_candidates"], 5)
+
+        tight = BudgetPlanner(budget_seconds=2.5, seconds_per_file=1.0, seconds_per_kb=0.0).plan(str(self.root), files)
+        self.assertEqual(len(tight["files"]), 2)
+        self.assertEqual(tight["files"][0], "pkg/core.py")
+        self.assertLessEqual(tight["estimated_seconds"], 2.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
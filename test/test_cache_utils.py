@@ -0,0 +1,71 @@
+import sys
+import os
+import tempfile
+import time
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared.cache_utils import PersistentCache, content_hash
+
+
+class TestPersistentCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hit_miss_and_persistence(self):
+        cache = PersistentCache(self.path)
+        key = content_hash("def f(): pass", "model", "logic", "1")
+
+        self.assertIsNone(cache.get(key))
+        cache.put(key, b"summary")
+        self.assertEqual(cache.get(key), b"summary")
+        self.assertEqual(cache.stats()["hit_rate"], 0.5)
+
+        reopened = PersistentCache(self.path)
+        self.assertEqual(reopened.get(key), b"summary")
+
+    def test_lru_eviction(self):
+        cache = PersistentCache(self.path, max_entries=3)
+        for i in range(3):
+            cache.put(f"k{i}", b"v")
+            time.sleep(0.01)
+        cache.get("k0")  # k0 becomes most recently used
+        cache.put("k3", b"v")
+
+        self.assertEqual(len(cache), 3)
+        self.assertIsNone(cache.get("k1"))
+        self.assertIsNotNone(cache.get("k0"))
+
+    def test_hits_batch_access_time_writes(self):
+        cache = PersistentCache(self.path, max_entries=1000)
+        cache.put("k", b"v")
+        changes = cache._conn.total_changes
+        time.sleep(0.01)
+
+        for _ in range(50):
+            self.assertEqual(cache.get("k"), b"v")
+        self.assertEqual(cache._conn.total_changes, changes)  # 조회마다 UPDATE/commit 하지 않음
+
+        cache.flush()
+        self.assertEqual(cache._conn.total_changes, changes + 1)  # 모아 둔 접근 시각을 한 번에 기록
+        reader = PersistentCache(self.path)
+        accessed_at = reader._conn.execute("SELECT accessed_at FROM cache WHERE key = 'k'").fetchone()[0]
+        created_at = reader._conn.execute("SELECT created_at FROM cache WHERE key = 'k'").fetchone()[0]
+        self.assertGreater(accessed_at, created_at)
+
+    def test_ttl_expiry(self):
+        cache = PersistentCache(self.path, ttl_seconds=0.05)
+        cache.put("k", b"v")
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("k"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
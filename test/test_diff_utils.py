@@ -0,0 +1,99 @@
+import sys
+import os
+import copy
+import tempfile
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared.artifact_utils import save_artifact
+from shared.diff_utils import apply_diff, diff_artifacts, load_run
+
+BASE = {
+    "graph": {
+        "nodes": [
+            {"id": "a.py", "type": "file", "importance": 0.5},
+            {"id": "b.py", "type": "file", "importance": 0.9},
+            {"id": "c.py", "type": "file", "importance": 0.1},
+        ],
+        "edges": [
+            {"source": "a.py", "target": "b.py", "type": "imports", "weight": 1.0},
+            {"source": "a.py", "target": "c.py", "type": "imports", "weight": 1.0},
+        ],
+    },
+    "recommendations": [
+        {"target": "b.py", "type": "refactor", "category": "Common", "rank": 1},
+        {"target": "c.py", "type": "test", "category": "Common", "rank": 2},
+    ],
+    "metrics": {"coverage": {"percentage": 50.0}},
+}
+
+
+def _changed():
+    new = copy.deepcopy(BASE)
+    graph = new["graph"]
+    graph["nodes"] = [n for n in graph["nodes"] if n["id"] != "c.py"]
+    graph["nodes"][0]["importance"] = 0.8              # a.py: 중요도 이동
+    graph["nodes"][1]["summary"] = "DB access"          # b.py: 중요도 외 변경
+    graph["nodes"].append({"id": "d.py", "type": "file", "importance": 0.3})
+    graph["edges"] = [
+        {"source": "a.py", "target": "b.py", "type": "imports", "weight": 3.0},
+        {"source": "a.py", "target": "d.py", "type": "imports", "weight": 1.0},
+    ]
+    new["recommendations"] = [
+        {"target": "b.py", "type": "refactor", "category": "Common", "rank": 2},
+        {"target": "d.py", "type": "docs", "category": "Common", "rank": 1},
+    ]
+    new["metrics"] = {"coverage": {"percentage": 75.0}}
+    new["changes"] = {"summary": {}}  # 비교 대상이 아닌 섹션
+    return new
+
+
+class TestArtifactDiff(unittest.TestCase):
+    def test_diff_reports_changes(self):
+        diff = diff_artifacts(BASE, _changed())
+        self.assertEqual([n["id"] for n in diff["nodes"]["added"]], ["d.py"])
+        self.assertEqual(diff["nodes"]["removed"], ["c.py"])
+        changed = {item["id"]: item["fields"] for item in diff["nodes"]["changed"]}
+        self.assertEqual(changed, {"a.py": ["importance"], "b.py": ["summary"]})
+        self.assertEqual([(i["id"], i["delta"]) for i in diff["importance"]], [("a.py", 0.3)])
+
+        self.assertEqual(len(diff["edges"]["added"]), 1)
+        self.assertEqual(diff["edges"]["removed"], [["a.py", "c.py"]])
+        self.assertEqual(diff["edges"]["changed"][0]["edge"]["weight"], 3.0)
+
+        recs = diff["recommendations"]
+        self.assertEqual([r["target"] for r in recs["new"]], ["d.py"])
+        self.assertEqual([r["target"] for r in recs["closed"]], ["c.py"])
+        self.assertEqual([r["rank"] for r in recs["changed"]], [2])
+        self.assertEqual(set(diff["sections"]), {"metrics"})
+        self.assertFalse(diff["summary"]["unchanged"])
+        self.assertTrue(diff_artifacts(BASE, copy.deepcopy(BASE))["summary"]["unchanged"])
+
+    def test_edge_relation_change_is_keyed_by_pair(self):
+        new = copy.deepcopy(BASE)
+        new["graph"]["edges"][0].update({"type": "calls", "relations": ["calls", "imports"], "weight": 2.0})
+        diff = diff_artifacts(BASE, new)
+        self.assertEqual(diff["edges"]["added"], [])
+        self.assertEqual(diff["edges"]["removed"], [])
+        self.assertEqual([item["key"] for item in diff["edges"]["changed"]], [["a.py", "b.py"]])
+        self.assertEqual(apply_diff(BASE, diff), new)
+
+    def test_apply_diff_reproduces_new_artifact(self):
+        new = _changed()
+        patched = apply_diff(BASE, diff_artifacts(BASE, new))
+        expected = {k: v for k, v in new.items() if k != "changes"}
+        self.assertEqual(patched, expected)
+        self.assertEqual(len(BASE["graph"]["nodes"]), 3)  # base는 그대로
+
+    def test_load_run_directory(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            save_artifact(os.path.join(tmp, "latest.json"), BASE)
+            with open(os.path.join(tmp, "latest.meta.json"), "w") as f:
+                f.write("{}")
+            self.assertEqual(load_run(tmp), BASE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Mock dotenv / HF client before importing config-dependent modules
+sys.modules.setdefault('dotenv', MagicMock())
+sys.modules.setdefault('huggingface_hub', MagicMock())
+
+try:
+    import numpy  # noqa: F401
+    from agent.config import Config
+    from mcp.semantic_embedding.embedder import MODEL_BACKEND, CircuitBreaker, UniversalEmbedder
+    from mcp.semantic_embedding.hashing import HASHING_BACKEND
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "numpy not installed")
+class TestChunkedEmbedding(unittest.TestCase):
+    def setUp(self):
+        self._saved = (Config.USE_EMBED_CACHE, Config.USE_TREE_SITTER, Config.EMBED_CHUNK_CHARS)
+        Config.USE_EMBED_CACHE, Config.USE_TREE_SITTER, Config.EMBED_CHUNK_CHARS = False, False, 200
+        self.embedder = UniversalEmbedder()
+        self.embedder.cache = None
+        self.requested = []
+
+        def fake_request(text):
+            self.requested.append(text)
+            return [float(len(text)), 1.0]
+
+        self.embedder._request_vector = fake_request
+
+    def tearDown(self):
+        Config.USE_EMBED_CACHE, Config.USE_TREE_SITTER, Config.EMBED_CHUNK_CHARS = self._saved
+
+    def test_oversized_function_is_fully_embedded(self):
+        body = "".join(f"    value_{i} = compute({i})\n" for i in range(40))  # ~1000자 최상위 함수
+        code = f"import os\n\n\ndef big():\n{body}\n\ndef small():\n    return 1\n"
+        results = self.embedder.batch_embed_chunked([{"id": "pkg/a.py", "code": code}])
+
+        by_id = {r["id"]: r for r in results}
+        self.assertEqual(by_id["pkg/a.py"]["chunks"], ["pkg/a.py::<module>", "pkg/a.py::big", "pkg/a.py::small"])
+        self.assertEqual(by_id["pkg/a.py::big"]["lines"], [4, 44])
+        self.assertTrue(all(r["embedding_backend"] == MODEL_BACKEND for r in results))
+
+        # 함수 본문 전체가 윈도우(청크 크기 단위)로 나뉘어 임베딩 입력에 포함됨
+        embedded = {text.split(" <SEP> ")[0] for text in self.requested}
+        function = f"def big():\n{body}"
+        windows = {function[start:start + 200] for start in range(0, len(function), 200)}
+        self.assertTrue(windows <= embedded)
+        self.assertTrue(all(len(text) <= 200 for text in embedded))
+
+    def test_single_chunk_file_reuses_chunk_vector(self):
+        results = self.embedder.batch_embed_chunked([{"id": "b.py", "code": "def f():\n    return 1\n"}])
+        self.assertEqual(len(results), 2)
+        file_entry, chunk = results
+        self.assertEqual(file_entry["embedding"], chunk["embedding"])
+        self.assertEqual(chunk["level"], "function")
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "numpy not installed")
+class TestEmbeddingCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.embedder = UniversalEmbedder()
+        self.embedder.cache = None
+        self.embedder.breaker = CircuitBreaker(failure_threshold=3, cooldown=60.0)
+        self.calls = 0
+        self.down = True
+
+        def flaky_request(text):
+            self.calls += 1
+            if self.down:
+                raise ConnectionError("embedding API down")
+            return [1.0, 0.0]
+
+        self.embedder._request_vector = flaky_request
+
+    def test_open_circuit_skips_api_calls(self):
+        Config.EMBED_BATCH_SIZE, saved = 1, Config.EMBED_BATCH_SIZE
+        try:
+            tagged = self.embedder._embed_inputs([f"x{i}" for i in range(20)], with_backend=True)
+        finally:
+            Config.EMBED_BATCH_SIZE = saved
+        self.assertEqual(self.calls, 3)  # 연속 3회 실패 후에는 호출하지 않음
+        self.assertTrue(all(backend == HASHING_BACKEND for _, backend in tagged))
+        self.assertTrue(self.embedder.breaker.is_open)
+
+    def test_half_open_probe_closes_on_success(self):
+        breaker = self.embedder.breaker
+        for _ in range(3):
+            breaker.record_failure()
+        self.assertFalse(breaker.allow())
+
+        breaker._opened_at -= breaker.cooldown  # cooldown 경과
+        self.down = False
+        self.assertEqual(self.embedder._embed_inputs(["probe"], with_backend=True), [([1.0, 0.0], MODEL_BACKEND)])
+        self.assertFalse(breaker.is_open)
+
+        # 시험 호출이 실패하면 곧바로 다시 열림
+        for _ in range(3):
+            breaker.record_failure()
+        breaker._opened_at -= breaker.cooldown
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())  # half-open 동안 시험 호출은 1건만
+        breaker.record_failure()
+        self.assertTrue(breaker.is_open)
+        self.assertFalse(breaker.allow())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import sys
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Mock dotenv / HF client before importing config-dependent modules
+sys.modules.setdefault('dotenv', MagicMock())
+sys.modules.setdefault('huggingface_hub', MagicMock())
+
+try:
+    import numpy as np
+    from mcp.semantic_embedding.cache import EmbeddingCache
+    from mcp.semantic_embedding.embedder import UniversalEmbedder
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "numpy not installed")
+class TestEmbeddingCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = EmbeddingCache(os.path.join(self.tmp.name, "embed.sqlite"), memory_entries=2, max_entries=100)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_memory_lru_holds_float32_and_returns_lists(self):
+        self.cache.put("a", "m", [0.5, 0.25])
+        stored = self.cache._memory[EmbeddingCache.make_key("a", "m")]
+        self.assertEqual(stored.dtype, np.float32)
+        self.assertFalse(stored.flags.writeable)
+
+        vector = self.cache.get("a", "m")
+        self.assertIsInstance(vector, list)
+        self.assertEqual(vector, [0.5, 0.25])
+        vector.append(1.0)  # 호출자가 바꿔도 캐시는 그대로
+        self.assertEqual(self.cache.get("a", "m"), [0.5, 0.25])
+        self.assertEqual(self.cache.stats()["memory_hits"], 2)
+
+    def test_eviction_falls_back_to_disk(self):
+        for text in ("a", "b", "c"):
+            self.cache.put(text, "m", [1.0, 2.0])
+        self.cache.get("b", "m")  # b가 가장 최근 -> 다음 put에서 c가 밀려남
+        self.cache.put("d", "m", [3.0, 4.0])
+
+        self.assertEqual(self.cache.stats()["memory_size"], 2)
+        self.assertNotIn(EmbeddingCache.make_key("a", "m"), self.cache._memory)
+        self.assertNotIn(EmbeddingCache.make_key("c", "m"), self.cache._memory)
+
+        self.assertEqual(self.cache.get("a", "m"), [1.0, 2.0])  # 디스크에서 복원
+        self.assertEqual(self.cache.stats()["disk_hits"], 1)
+        self.assertEqual(self.cache._memory[EmbeddingCache.make_key("a", "m")].dtype, np.float32)
+        self.assertIsNone(self.cache.get("a", "other-model"))
+
+    def test_embedder_dedups_and_reuses_cache(self):
+        embedder = UniversalEmbedder()
+        embedder.cache = self.cache
+        requested = []
+
+        def fake_request(text):
+            requested.append(text)
+            return [float(len(text)), 1.0]
+
+        embedder._request_vector = fake_request
+        vectors = embedder._embed_inputs(["x", "yy", "x", "yy", "x"])
+        self.assertEqual(sorted(requested), ["x", "yy"])
+        self.assertEqual(vectors[0], vectors[2])
+        self.assertEqual(vectors[1], [2.0, 1.0])
+
+        embedder._embed_inputs(["yy", "x"])
+        self.assertEqual(len(requested), 2)  # 두 번째 호출은 전부 캐시 적중
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import sys
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared.file_utils import DirectoryTree, FileSelector, IgnoreRules, PathSuffixIndex, count_lines, is_generated
+
+
+class TestIgnoreRules(unittest.TestCase):
+    def test_gitignore_semantics(self):
+        rules = IgnoreRules()
+        rules.add_patterns(["*.log", "!keep.log", "/build", "docs/**/*.md", "cache/"])
+
+        self.assertTrue(rules.is_ignored("app.log"))
+        self.assertTrue(rules.is_ignored("src/deep/app.log"))
+        self.assertFalse(rules.is_ignored("keep.log"))
+        self.assertTrue(rules.is_ignored("build", is_dir=True))
+        self.assertFalse(rules.is_ignored("src/build", is_dir=True))
+        self.assertTrue(rules.is_ignored("docs/a/b/readme.md"))
+        self.assertTrue(rules.is_ignored("src/cache", is_dir=True))
+        self.assertFalse(rules.is_ignored("src/cache"))
+
+    def test_nested_rules_are_relative(self):
+        rules = IgnoreRules()
+        rules.add_patterns(["/gen"], base_dir="pkg")
+        self.assertTrue(rules.is_ignored("pkg/gen", is_dir=True))
+        self.assertFalse(rules.is_ignored("gen", is_dir=True))
+
+
+class TestFileSelector(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        files = {
+            "main.py": "import os\n",
+            "pkg/util.py": "def f():\n    return 1\n",
+            "pkg/skip_me.py": "x = 1\n",
+            "pkg/.fithubignore": "skip_me.py\n",
+            "generated/api_pb2.py": "x = 1\n",
+            "stub.py": "# @generated by tool\nx = 1\n",
+            "bundle.js": "var a=1;" * 2000,
+            "node_modules/lib/index.js": "module.exports = 1\n",
+            "ignored_dir/a.py": "x = 1\n",
+            ".gitignore": "ignored_dir/\n",
+            "big.py": "x = 1\n" * 50000,
+            "env/config.py": "DEBUG = False\n",
+            "target/app.py": "x = 1\n",
+            "target/CACHEDIR.TAG": "Signature: 8a477f597d28d172789f06886806bc55\n",
+            "tools/myenv/pyvenv.cfg": "home = /usr/bin\n",
+            "tools/myenv/lib/site.py": "x = 1\n",
+        }
+        for rel, content in files.items():
+            path = self.root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+        (self.root / "blob.py").write_bytes(b"\x00\x01\x02binary")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_select_applies_all_filters(self):
+        selector = FileSelector(extensions={".py", ".js"}, max_file_size=64 * 1024)
+        selected = [p.relative_to(self.root).as_posix() for p in selector.select(str(self.root))]
+
+        self.assertEqual(selected, ["env/config.py", "main.py", "pkg/util.py"])
+        self.assertEqual(selector.skipped.get("binary"), 1)
+        self.assertEqual(selector.skipped.get("too_large"), 1)
+        self.assertGreaterEqual(selector.skipped.get("generated", 0), 3)
+
+    def test_generated_markers_only_in_header_comments(self):
+        self.assertTrue(is_generated(b"// Code generated by protoc-gen-go. DO NOT EDIT.\n\npackage api\n"))
+        self.assertTrue(is_generated(b"#!/usr/bin/env python\n# -*- coding: utf-8 -*-\n# @generated by tool\nx = 1\n"))
+        self.assertTrue(is_generated(b"<!--\n  This file is generated by xsd2html.\n-->\n<html></html>\n"))
+        self.assertTrue(is_generated(b"/*\n * Copyright 2024\n * @generated\n */\nint x;\n"))
+        # 본문에 마커 문자열이 있는 직접 작성한 파일
+        self.assertFalse(is_generated(b'import re\n\nMARKERS = ("@generated", "DO NOT EDIT")\n'))
+        self.assertFalse(is_generated(b"package gen\n\n// writes \"Code generated by gen. DO NOT EDIT.\"\nfunc Header() {}\n"))
+        self.assertFalse(is_generated(b'"""Skips files with the @generated marker."""\ndef check():\n    pass\n'))
+
+
+
+class TestPathSuffixIndex(unittest.TestCase):
+    def test_component_suffix_matching(self):
+        index = PathSuffixIndex({
+            "/abs/repo/pkg/a.py": 0.9,
+            "/abs/other/pkg/a.py": 0.1,
+            "C:\\repo\\lib\\b.py": 0.4,
+            "util.py": 0.7,
+            "ab.py": 0.3,
+        })
+        # 조회 경로 전체가 키의 접미사 (여러 개면 짧은 키, 그다음 사전순)
+        self.assertEqual(index.lookup("pkg/a.py"), 0.1)
+        self.assertEqual(index.lookup("repo/pkg/a.py"), 0.9)
+        self.assertEqual(index.lookup("lib/b.py"), 0.4)
+        # 키 전체가 조회 경로의 접미사
+        self.assertEqual(index.lookup("src/deep/util.py"), 0.7)
+        # 컴포넌트 단위 비교 ("b.py"는 "ab.py"와 매칭되지 않음)
+        self.assertEqual(index.lookup("x/b.py", 0.5), 0.5)
+        self.assertEqual(index.lookup("a.py::func", 0.5), 0.5)
+
+
+
+class TestDirectoryTree(unittest.TestCase):
+    def test_hierarchy_and_aggregates(self):
+        tree = DirectoryTree("ROOT")
+        self.assertEqual(tree.add_file("main.py", 10, 0.5, "Core"), "ROOT")
+        self.assertEqual(tree.add_file("pkg/a.py", 20, 0.25, "Core"), "pkg")
+        self.assertEqual(tree.add_file("pkg/sub/b.py", 30, 0.5, "API"), "pkg/sub")
+        self.assertEqual(tree.add_file("pkg/sub/c.py", 40, 0.25, "API"), "pkg/sub")
+
+        result = tree.aggregate()
+        ids = [d.id for d, _ in result]
+        self.assertEqual(ids, ["ROOT", "pkg", "pkg/sub"])  # 부모가 먼저
+        by_id = {d.id: (d, agg) for d, agg in result}
+        self.assertEqual(by_id["pkg/sub"][0].parent, "pkg")
+        self.assertEqual(by_id["pkg/sub"][0].label, "sub")
+        self.assertEqual(by_id["pkg"][1], {"file_count": 3, "loc": 90, "importance_sum": 1.0, "dominant_domain": "API"})
+        self.assertEqual(by_id["ROOT"][1]["file_count"], 4)
+        self.assertEqual(by_id["ROOT"][1]["dominant_domain"], "API")  # 동률(2:2)이면 사전순
+
+    def test_count_lines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "a.py"
+            path.write_bytes(b"a\nb\nc")
+            self.assertEqual(count_lines(path), 3)
+            path.write_bytes(b"a\nb\n")
+            self.assertEqual(count_lines(path), 2)
+            self.assertEqual(count_lines(Path(tmp) / "missing.py"), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import sys
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Mock dotenv before importing config-dependent modules
+sys.modules.setdefault('dotenv', MagicMock())
+
+import shutil
+from collections import namedtuple
+
+from mcp.graph_analysis.cache import GraphCache, build_manifest, repo_identity
+
+try:
+    import networkx as nx
+    NETWORKX_AVAILABLE = True
+except ImportError:
+    NETWORKX_AVAILABLE = False
+
+Tag = namedtuple("Tag", "rel_fname fname line name kind")
+
+
+class TestGraphCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.repo = os.path.join(self.tmp.name, "repo")
+        os.makedirs(os.path.join(self.repo, "pkg"))
+        self.files = []
+        for name, body in (("pkg/a.py", "def a(): pass\n"), ("b.py", "import pkg.a\n")):
+            path = os.path.join(self.repo, name)
+            with open(path, "w") as f:
+                f.write(body)
+            self.files.append(path)
+        self.cache = GraphCache(path=os.path.join(self.tmp.name, "graph.sqlite"), max_entries=100)
+
+    def tearDown(self):
+        self.cache.store._conn.close()
+        self.tmp.cleanup()
+
+    def test_manifest_key_tracks_content(self):
+        manifest = build_manifest(self.files, self.repo)
+        self.assertEqual([rel for rel, _ in manifest], ["b.py", "pkg/a.py"])
+        key = GraphCache.manifest_key(self.repo, manifest)
+        self.cache.put_result(key, {"file_importance": {"b.py": 1.0}})
+
+        with open(self.files[0], "a") as f:
+            f.write("def c(): pass\n")
+        changed = build_manifest(self.files, self.repo)
+        self.assertNotEqual(GraphCache.manifest_key(self.repo, changed), key)
+        self.assertEqual(self.cache.get_result(key)["file_importance"], {"b.py": 1.0})
+
+        # 바뀌지 않은 파일의 태그는 그대로 재사용
+        digests = dict(changed)
+        self.cache.put_tags(self.repo, "b.py", dict(manifest)["b.py"], [("b.py", "import")])
+        self.assertEqual(self.cache.get_tags(self.repo, "b.py", digests["b.py"]), [("b.py", "import")])
+        self.assertIsNone(self.cache.get_tags(self.repo, "pkg/a.py", digests["pkg/a.py"]))
+
+
+    def test_reuse_across_run_folders(self):
+        # ingest는 실행마다 새 임시 폴더에 복사하므로 repo_id 기준으로 재사용되어야 함
+        run2 = os.path.join(self.tmp.name, "run2")
+        shutil.copytree(self.repo, run2)
+        first, second = repo_identity(self.repo, "owner/name"), repo_identity(run2, "owner/name")
+        self.assertEqual(first, second)
+
+        manifest = dict(build_manifest(self.files, self.repo))
+        tag = Tag("pkg/a.py", os.path.join(self.repo, "pkg/a.py"), 1, "a", "def")
+        self.cache.put_tags(first, "pkg/a.py", manifest["pkg/a.py"], [tag])
+
+        run2_manifest = dict(build_manifest([os.path.join(run2, "pkg/a.py")], run2))
+        self.assertEqual(run2_manifest["pkg/a.py"], manifest["pkg/a.py"])
+        tags = self.cache.get_tags(second, "pkg/a.py", run2_manifest["pkg/a.py"], run2)
+        self.assertEqual(tags, [tag._replace(fname=os.path.join(run2, "pkg/a.py"))])
+
+    @unittest.skipUnless(NETWORKX_AVAILABLE, "networkx not installed")
+    def test_code_graph_reused_across_run_folders(self):
+        repo = repo_identity(self.repo, "owner/name")
+        manifest = build_manifest(self.files, self.repo)
+        G = nx.MultiDiGraph()
+        G.add_node("a", fname=os.path.join(self.repo, "pkg/a.py"), line=[1])
+        G.add_node("b", fname=os.path.join(self.repo, "b.py"))
+        G.add_edge("b", "a", weight=2)
+        self.cache.put_graph(repo, manifest, G, self.repo)
+        self.assertEqual(G.nodes["a"]["fname"], os.path.join(self.repo, "pkg/a.py"))  # 원본은 그대로
+
+        run2 = os.path.join(self.tmp.name, "run2")
+        cached = self.cache.get_graph(repo, manifest, run2)
+        self.assertEqual(cached.nodes["a"]["fname"], os.path.join(run2, "pkg/a.py"))
+        self.assertEqual(list(cached.edges(data=True)), [("b", "a", {"weight": 2})])
+
+        # PageRank 설정(variant)과 무관, 매니페스트가 바뀌면 미스
+        with open(self.files[1], "a") as f:
+            f.write("import os\n")
+        self.assertIsNone(self.cache.get_graph(repo, build_manifest(self.files, self.repo), run2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import sys
+import os
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared.graph_utils import CompactGraph, EdgeMerger
+
+
+class TestCompactGraph(unittest.TestCase):
+    def _graph(self):
+        graph = CompactGraph()
+        graph.add_node("a.py", "file", label="a.py", language="Python", complexity=3)
+        graph.add_node("a.py::f", "function", label="f", language="Python", docstring="doc", args=["x"])
+        graph.add_edge("a.py", "a.py::f", "defines")
+        graph.add_edge("a.py::f", "b.py::g", "calls", 2)
+        return graph
+
+    def test_records_are_dict_compatible_and_interned(self):
+        graph = self._graph()
+        node = graph.node("a.py::f")
+        self.assertEqual(node["label"], "f")
+        self.assertEqual(node.get("args"), ["x"])
+        self.assertEqual(node.get("complexity", 1), 1)
+        self.assertIsNone(node.get("missing"))
+        with self.assertRaises(KeyError):
+            node["missing"]
+        self.assertIs(graph.node("a.py").language, node.language)
+
+        self.assertEqual(list(graph.edges), [
+            ("a.py", "a.py::f", "defines", 1.0),
+            ("a.py::f", "b.py::g", "calls", 2.0),
+        ])
+        # 같은 문자열은 풀에 한 번만 저장
+        self.assertEqual(len(graph.pool), len(set(graph.pool.strings)))
+
+    def test_dict_round_trip(self):
+        data = self._graph().to_dict()
+        self.assertEqual(data["nodes"][1], {
+            "id": "a.py::f", "type": "function", "label": "f", "language": "Python",
+            "docstring": "doc", "args": ["x"],
+        })
+        self.assertEqual(data["edges"][1]["relation"], "calls")
+        self.assertEqual(CompactGraph.from_dict(data).to_dict(), data)
+        self.assertEqual(self._graph().to_dict(relation_key="type")["edges"][0]["type"], "defines")
+
+
+
+class TestEdgeMerger(unittest.TestCase):
+    def test_one_edge_per_pair(self):
+        merger = EdgeMerger()
+        merger.add("a.py", "a.py::f", "defines", 1.0)
+        merger.add("a.py", "b.py", "imports", 1.0)
+        merger.add("a.py", "b.py", "calls", 3.0)
+        merger.add("a.py", "b.py", "imports", 1.0)
+        merger.add("a.py", "b.py", "logical", None)
+        merger.add("a.py", "a.py::f", "structure")
+        merger.add("ROOT", "a.py", "structure")
+
+        edges = {(e["source"], e["target"]): e for e in merger.to_dicts()}
+        self.assertEqual(len(merger), 3)
+        self.assertEqual(edges[("a.py", "b.py")], {
+            "source": "a.py", "target": "b.py", "type": "calls",
+            "relations": ["calls", "imports", "logical"], "weight": 6.0,
+        })
+        self.assertEqual(edges[("a.py", "a.py::f")]["type"], "defines")
+        self.assertEqual(edges[("a.py", "a.py::f")]["relations"], ["defines", "structure"])
+        self.assertEqual(edges[("a.py", "a.py::f")]["weight"], 1.0)
+        self.assertEqual(edges[("ROOT", "a.py")], {"source": "ROOT", "target": "a.py", "type": "structure"})
+
+
+if __name__ == '__main__':
+    unittest.main()
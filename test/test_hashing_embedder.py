@@ -0,0 +1,36 @@
+import sys
+import os
+import math
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from mcp.semantic_embedding.hashing import hashed_embedding
+
+
+def _cos(a, b):
+    return sum(x * y for x, y in zip(a, b))
+
+
+class TestHashedEmbedding(unittest.TestCase):
+    def test_deterministic_and_normalized(self):
+        text = "def get_user(id): return db.find(id) <SEP> (function_definition (identifier))"
+        a = hashed_embedding(text)
+        b = hashed_embedding(text)
+        self.assertEqual(a, b)
+        self.assertEqual(len(a), 768)
+        self.assertAlmostEqual(math.sqrt(sum(v * v for v in a)), 1.0, places=6)
+
+    def test_similar_code_is_closer(self):
+        base = hashed_embedding("def load_user(user_id): return repo.get_user(user_id)")
+        near = hashed_embedding("def load_user(uid): return repo.get_user(uid)")
+        far = hashed_embedding("class Renderer: draw canvas pixels color")
+        self.assertGreater(_cos(base, near), _cos(base, far))
+
+    def test_empty_input(self):
+        self.assertEqual(hashed_embedding("", dim=16), [0.0] * 16)
+
+
+if __name__ == '__main__':
+    unittest.main()
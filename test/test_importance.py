@@ -0,0 +1,40 @@
+import sys
+import os
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from mcp.graph_analysis.importance import compute_importance
+
+
+class TestBuiltinImportance(unittest.TestCase):
+    def test_imports_and_calls_drive_scores(self):
+        nodes = [
+            "app/main.py", "app/views.py", "core/db.py", "core/unused.py",
+            "core/db.py::query", "app/views.py::index", "app/main.py::run",
+        ]
+        edges = [
+            ("app/main.py", "views.py", "imports", 1.0),     # 파일명 힌트 -> app/views.py
+            ("app/views.py", "db.py", "imports", 1.0),
+            ("app/main.py", "/core/db.py", "imports", 1.0),
+            ("app/views.py::index", "core/db.py::query", "calls", 3.0),
+            ("app/main.py::run", "app/views.py::index", "calls", 1.0),
+            ("app/main.py", "app/main.py::run", "defines", 1.0),  # 중요도에는 사용하지 않음
+            ("app/main.py", "requests.py", "imports", 1.0),   # 외부 라이브러리
+        ]
+        scores = compute_importance(nodes, edges)
+
+        self.assertEqual(scores["core/db.py"], 1.0)
+        self.assertGreater(scores["app/views.py"], scores["app/main.py"])
+        self.assertEqual(scores["core/unused.py"], scores["app/main.py"])
+        self.assertEqual(scores["core/db.py::query"], 1.0)
+        self.assertGreater(scores["app/views.py::index"], scores["app/main.py::run"])
+        self.assertTrue(all(0.0 <= v <= 1.0 for v in scores.values()))
+
+    def test_no_signal_returns_empty(self):
+        self.assertEqual(compute_importance(["a.py", "a.py::f"], [("a.py", "a.py::f", "defines", 1.0)]), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import sys
+import os
+import json
+import tempfile
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from mcp.repository_analysis.layer_rules import LayerRules
+
+
+def _processed(rules, ids):
+    # 규칙 기반 분석과 같은 입력: 계층은 소문자 ID, stem은 원래 ID
+    return [{"id": nid, "stem": rules.stem(nid), "layer": rules.classify(nid.lower())} for nid in ids]
+
+
+# --- 이전 구현 (RepositoryAnalyzer._extract_stem / 계층 판별 / _detect_logical_edges) 그대로 ---
+def _legacy_extract_stem(filename):
+    base = filename.split('/')[-1].replace('.py', '').lower()
+    suffixes = ['_service', '_controller', '_repository', '_repo', '_model', '_dto', '_view', 'service', 'controller']
+    for suffix in suffixes:
+        if base.endswith(suffix):
+            return base.replace(suffix, '')
+    return base
+
+
+def _legacy_layer(node_id):
+    layer = "Other"
+    if any(k in node_id for k in ["service", "manager", "business"]):
+        layer = "ServiceLayer"
+    elif any(k in node_id for k in ["repo", "dao", "store", "db"]):
+        layer = "RepositoryLayer"
+    elif any(k in node_id for k in ["controller", "route", "view", "api"]):
+        layer = "PresentationLayer"
+    elif any(k in node_id for k in ["model", "dto", "schema"]):
+        layer = "DomainLayer"
+    return layer
+
+
+def _legacy_edges(ids):
+    nodes = [{"id": nid, "stem": _legacy_extract_stem(nid), "layer": _legacy_layer(nid.lower())} for nid in ids]
+    edges = []
+    for i, src in enumerate(nodes):
+        for j, tgt in enumerate(nodes):
+            if i == j: continue
+
+            if src['stem'] == tgt['stem'] and len(src['stem']) > 2:
+                if src['layer'] == "PresentationLayer" and tgt['layer'] == "ServiceLayer":
+                    edges.append((src['id'], tgt['id'], "architectural_flow"))
+                elif src['layer'] == "ServiceLayer" and tgt['layer'] == "RepositoryLayer":
+                    edges.append((src['id'], tgt['id'], "data_access"))
+                elif src['layer'] == "ServiceLayer" and tgt['layer'] == "DomainLayer":
+                    edges.append((src['id'], tgt['id'], "uses_model"))
+    return edges
+
+
+class TestLayerRules(unittest.TestCase):
+    def test_default_preset_matches_legacy_loop(self):
+        rules = LayerRules.from_presets(["default"])
+        ids = [
+            "app/user_controller.py", "app/user_service.py", "app/user_repo.py", "app/user_model.py",
+            "app/UserService.py", "app/UserController.py", "web/user_view.py", "db/user_store.py",
+            "app/order_service.py", "app/order_dto.py", "app/service.py", "app/db.py",
+            "app/identity.py", "app/heatmapper.py", "app/entity_model.py", "app/entity_service.py",
+            "src/user_service.js", "src/user_controller.js", "src/user_service.ts",
+            "app/user_service.py::create", "app/user_controller.py::create", "app/x.py::get_service",
+            "api/service_user_service.py", "api/service_user_controller.py",
+        ]
+        legacy = _legacy_edges(ids)
+        self.assertGreater(len(legacy), 5)
+        self.assertEqual(sorted(rules.detect_edges(_processed(rules, ids))), sorted(legacy))
+        for nid in ids:
+            self.assertEqual(rules.stem(nid), _legacy_extract_stem(nid))
+            self.assertEqual(rules.classify(nid.lower()), _legacy_layer(nid.lower()))
+
+    def test_spring_conventions_and_rules_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "rules.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"layers": {"PresentationLayer": ["handler"]}, "stem_suffixes": ["handler"]}, f)
+            rules = LayerRules.from_presets(["default", "spring"], path)
+
+        base = "src/main/java/com/shop/"
+        ids = [
+            base + "web/UserController.java", base + "service/UserServiceImpl.java",
+            base + "repository/UserRepository.java", base + "mapper/UserMapper.java",
+            base + "entity/UserEntity.java", base + "web/UserHandler.java",
+        ]
+        self.assertEqual({rules.stem(nid) for nid in ids}, {"user"})
+        edges = set(rules.detect_edges(_processed(rules, ids)))
+        self.assertIn((ids[0], ids[1], "architectural_flow"), edges)
+        self.assertIn((ids[1], ids[2], "data_access"), edges)
+        self.assertIn((ids[1], ids[3], "data_access"), edges)
+        self.assertIn((ids[2], ids[4], "persists"), edges)
+        self.assertIn((ids[5], ids[1], "architectural_flow"), edges)
+
+        # 패턴은 JVM 파일명 끝/디렉토리 구간에만 고정 ("identity.py", "heatmapper.py"는 그대로)
+        self.assertEqual(rules.classify("app/identity.py"), "Other")
+        self.assertEqual(rules.classify("app/heatmapper.py"), "Other")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import sys
+import os
+import math
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from mcp.graph_analysis.layout import NUMPY_AVAILABLE, compute_layout, tree_layout
+
+
+def _sample_graph():
+    nodes = [{"id": "ROOT", "parent": None, "type": "directory"}]
+    nodes += [{"id": f"d{d}", "parent": "ROOT", "type": "directory"} for d in range(3)]
+    nodes += [{"id": f"d{f % 3}/f{f}.py", "parent": f"d{f % 3}", "type": "file"} for f in range(12)]
+    nodes += [
+        {"id": f"d{f % 3}/f{f}.py::g{g}", "parent": f"d{f % 3}/f{f}.py", "type": "function"}
+        for f in range(12) for g in range(4)
+    ]
+    edges = [{"source": n["parent"], "target": n["id"], "type": "structure"} for n in nodes if n["parent"]]
+    edges.append({"source": "d0/f0.py", "target": "d1/f1.py", "type": "imports", "weight": 2.0})
+    return nodes, edges
+
+
+class TestLayout(unittest.TestCase):
+    def test_tree_layout_is_radial_and_deterministic(self):
+        nodes, _ = _sample_graph()
+        tree_nodes = [n for n in nodes if n["type"] != "function"]
+        positions = tree_layout(tree_nodes)
+
+        self.assertEqual(positions["ROOT"], (0.0, 0.0))
+        dir_radius = math.hypot(*positions["d0"])
+        file_radius = math.hypot(*positions["d0/f0.py"])
+        self.assertGreater(file_radius, dir_radius)
+        self.assertEqual(positions, tree_layout(list(reversed(tree_nodes))))
+
+    def test_compute_layout_places_definitions_near_file_and_reuses_previous(self):
+        nodes, edges = _sample_graph()
+        layout = compute_layout(nodes, edges)
+
+        self.assertEqual(set(layout), {n["id"] for n in nodes})
+        self.assertLess(math.dist(layout["d0/f0.py::g0"], layout["d0/f0.py"]), 60)
+
+        # 새 노드만 추가: 기존 좌표는 그대로, 새 노드는 parent 근처
+        nodes.append({"id": "d0/f0.py::new", "parent": "d0/f0.py", "type": "function"})
+        updated = compute_layout(nodes, edges, previous=layout)
+        for nid, xy in layout.items():
+            self.assertEqual(updated[nid], xy)
+        self.assertLess(math.dist(updated["d0/f0.py::new"], layout["d0/f0.py"]), 60)
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "numpy not installed")
+    def test_force_refinement_keeps_nodes_apart(self):
+        nodes, edges = _sample_graph()
+        layout = compute_layout(nodes, edges)
+        points = list(layout.values())
+        closest = min(math.dist(a, b) for i, a in enumerate(points) for b in points[i + 1:])
+        self.assertGreater(closest, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
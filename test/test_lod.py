@@ -0,0 +1,75 @@
+import sys
+import os
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from mcp.graph_analysis.lod import GraphLOD
+
+
+def _graph():
+    nodes = [
+        {"id": "ROOT", "parent": None, "type": "directory"},
+        {"id": "a", "parent": "ROOT", "type": "directory"},
+        {"id": "b", "parent": "ROOT", "type": "directory",
+         "file_count": 1, "loc": 120, "importance_sum": 0.5, "dominant_domain": "API"},
+        {"id": "a/x.py", "parent": "a", "type": "file", "importance": 0.9, "complexity": 3},
+        {"id": "a/y.py", "parent": "a", "type": "file", "importance": 0.2, "complexity": 1},
+        {"id": "b/z.py", "parent": "b", "type": "file", "importance": 0.5},
+        {"id": "a/x.py::f", "parent": "a/x.py", "type": "function", "complexity": 2},
+        {"id": "b/z.py::g", "parent": "b/z.py", "type": "function"},
+    ]
+    edges = [{"source": n["parent"], "target": n["id"], "type": "structure"} for n in nodes if n["parent"]]
+    edges += [
+        {"source": "a/x.py", "target": "b/z.py", "type": "imports", "weight": 1.0},
+        {"source": "a/y.py", "target": "b/z.py", "type": "imports", "weight": 1.0},
+        {"source": "a/x.py::f", "target": "b/z.py::g", "type": "calls", "weight": 2.0},
+        {"source": "a/x.py", "target": "a/y.py", "type": "imports", "weight": 1.0},
+    ]
+    return {"nodes": nodes, "edges": edges}
+
+
+class TestGraphLOD(unittest.TestCase):
+    def test_coarse_view_aggregates_clusters_and_edges(self):
+        lod = GraphLOD(_graph(), max_nodes=3)
+        self.assertEqual(lod.level_sizes, [1, 3, 6, 8])
+        self.assertEqual(lod.coarse_level, 1)
+
+        view = lod.view()
+        nodes = {n["id"]: n for n in view["nodes"]}
+        self.assertEqual(set(nodes), {"ROOT", "a", "b"})
+        self.assertTrue(nodes["a"]["collapsed"])
+        self.assertEqual(nodes["a"]["member_count"], 3)
+        self.assertEqual(nodes["a"]["file_count"], 2)
+        self.assertEqual(nodes["a"]["importance"], 0.9)
+        self.assertEqual(nodes["a"]["complexity"], 6)
+        self.assertEqual(nodes["a"]["importance_sum"], 1.1)
+        # GraphBuilder가 미리 계산한 디렉토리 집계가 있으면 그대로 사용
+        self.assertEqual(nodes["b"]["loc"], 120)
+        self.assertEqual(nodes["b"]["dominant_domain"], "API")
+
+        code_edges = [e for e in view["edges"] if e["type"] != "structure"]
+        self.assertEqual(len(code_edges), 1)  # a 내부 엣지는 사라지고 a -> b 하나로 합쳐짐
+        self.assertEqual((code_edges[0]["source"], code_edges[0]["target"]), ("a", "b"))
+        self.assertEqual(code_edges[0]["weight"], 4.0)
+        self.assertEqual(code_edges[0]["relation_counts"], {"imports": 2, "calls": 1})
+        self.assertEqual(code_edges[0]["relations"], ["calls", "imports"])
+
+        full = lod.view(10)
+        self.assertEqual(len(full["nodes"]), 8)
+        self.assertFalse(any(n["collapsed"] for n in full["nodes"]))
+
+    def test_expand_cluster(self):
+        lod = GraphLOD(_graph(), max_nodes=3)
+        expanded = lod.expand("a", level=1)
+        self.assertEqual([n["id"] for n in expanded["nodes"]], ["a/x.py", "a/y.py"])
+        pairs = {(e["source"], e["target"]): e for e in expanded["edges"] if e["type"] != "structure"}
+        self.assertEqual(set(pairs), {("a/x.py", "b"), ("a/y.py", "b"), ("a/x.py", "a/y.py")})
+        self.assertEqual(pairs[("a/x.py", "b")]["count"], 2)
+        with self.assertRaises(KeyError):
+            lod.expand("missing")
+
+
+if __name__ == '__main__':
+    unittest.main()
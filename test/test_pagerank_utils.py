@@ -0,0 +1,72 @@
+import sys
+import os
+import random
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared.pagerank_utils import SCIPY_AVAILABLE, PageRankEngine, entry_point_seeds
+
+try:
+    import networkx as nx
+except ImportError:
+    nx = None
+
+
+def _random_edges(n=60, m=240, seed=7):
+    rng = random.Random(seed)
+    # 일부 노드는 나가는 엣지가 없도록 (dangling), 중복 엣지 포함
+    return [(rng.randrange(n), rng.randrange(n - 10), rng.choice([1, 2, 5])) for _ in range(m)]
+
+
+class TestPageRankEngine(unittest.TestCase):
+    def _engines(self):
+        engines = [PageRankEngine(use_scipy=False)]
+        if SCIPY_AVAILABLE:
+            engines.append(PageRankEngine(use_scipy=True))
+        return engines
+
+    def test_basic_properties(self):
+        for engine in self._engines():
+            scores = engine.build(["a", "b", "c", "d"], [("a", "b", 1), ("b", "c", 1), ("c", "a", 1)]).run()
+            self.assertAlmostEqual(sum(scores.values()), 1.0, places=6)
+            self.assertAlmostEqual(scores["a"], scores["b"], places=6)
+            self.assertLess(scores["d"], scores["a"])  # 들어오는 엣지 없음
+            self.assertTrue(engine.converged)
+
+    def test_warm_start_and_personalization(self):
+        edges = _random_edges()
+        for engine in self._engines():
+            engine.build(range(60), edges)
+            cold = engine.run()
+            cold_iterations = engine.iterations
+            warm = engine.run(warm_start=cold)
+            self.assertLess(engine.iterations, cold_iterations)
+            for node in cold:
+                self.assertAlmostEqual(cold[node], warm[node], places=5)
+
+            seeded = engine.run(personalization={0: 1.0})
+            self.assertGreater(seeded[0], cold[0])
+
+    @unittest.skipUnless(nx is not None and SCIPY_AVAILABLE, "networkx/scipy not installed")
+    def test_matches_networkx(self):
+        G = nx.MultiDiGraph()
+        G.add_nodes_from(range(60))
+        for u, v, w in _random_edges():
+            G.add_edge(u, v, weight=w)
+        expected = nx.pagerank(G, weight="weight", personalization={0: 1.0, 5: 2.0})
+        for engine in self._engines():
+            scores = engine.build(G.nodes, ((u, v, d["weight"]) for u, v, d in G.edges(data=True))).run(
+                personalization={0: 1.0, 5: 2.0}
+            )
+            for node, value in expected.items():
+                self.assertAlmostEqual(scores[node], value, places=5)
+
+    def test_entry_point_seeds(self):
+        seeds = entry_point_seeds({"run": "/repo/app/main.py", "helper": "/repo/app/util.py", "x": None})
+        self.assertEqual(seeds, {"run": 1.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,275 @@
+import sys
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Mock dotenv before importing config-dependent modules
+sys.modules.setdefault('dotenv', MagicMock())
+
+from mcp.structural_analysis.analyzer import PolyglotParser, StructuralAnalyzer, TreeSitterParser
+from shared.tree_sitter_utils import get_language
+
+
+class TestPolyglotParser(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def parse(self, name, code):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(code)
+        return PolyglotParser(path).parse(name)
+
+    def labels(self, result, kind=None):
+        return [n["label"] for n in result["nodes"] if kind is None or n["type"] == kind]
+
+    def imports(self, result):
+        return [e["target"] for e in result["edges"] if e["relation"] == "imports"]
+
+    def test_python(self):
+        result = self.parse("svc.py", (
+            "import os\n"
+            "from app.models import User\n"
+            "\n"
+            "class UserService:\n"
+            "    def get(self, uid):\n"
+            "        return uid\n"
+            "\n"
+            "    async def load(self):\n"
+            "        pass\n"
+            "\n"
+            "def helper():\n"
+            "    pass\n"
+        ))
+        self.assertEqual(self.labels(result, "class"), ["UserService"])
+        self.assertEqual(self.labels(result, "function"), ["get", "load", "helper"])
+        self.assertEqual(self.imports(result), ["os.py", "models.py"])
+
+    def test_javascript_and_minified_bundle(self):
+        result = self.parse("app.js", (
+            "import React from 'react';\n"
+            "const util = require('./util');\n"
+            "export default function App(props) {\n"
+            "  if (props.x) { return null; }\n"
+            "}\n"
+            "const add = (a, b) => a + b;\n"
+            "export const load = async (id) => fetch(id);\n"
+            "class Store {\n"
+            "  get(key) {\n"
+            "    return key;\n"
+            "  }\n"
+            "}\n"
+        ))
+        self.assertEqual(self.labels(result), ["App", "add", "load", "Store", "get"])
+        self.assertEqual(self.imports(result), ["react.js", "/util.js"])
+
+        bundle = self.parse("bundle.min.js", (
+            "function a(b){if(b){return 1}}var c=function(d){return d};"
+            "const f=(g)=>g*2;class H{m(n){return n}}\n"
+        ))
+        self.assertEqual(self.labels(bundle), ["a", "c", "f", "H", "m"])
+
+    def test_typescript(self):
+        result = self.parse("api.ts", (
+            "import { Repo } from './repo';\n"
+            "export const f = (a: number): number => a;\n"
+            "const g = async (x: string): Promise<void> => {};\n"
+            "export interface Shape { area(): number; }\n"
+            "export class Svc {\n"
+            "  constructor(private repo: Repo) {}\n"
+            "  public async find<T>(id: string): Promise<T> {\n"
+            "    return this.repo.get(id);\n"
+            "  }\n"
+            "}\n"
+        ))
+        self.assertEqual(self.labels(result, "function"), ["f", "g", "constructor", "find"])
+        self.assertEqual(self.labels(result, "class"), ["Shape", "Svc"])
+        self.assertEqual(self.imports(result), ["/repo.ts"])
+
+    def test_wrapped_arrow_function_parameters(self):
+        # 포매터가 인자 목록을 줄바꿈한 화살표 함수
+        result = self.parse("auth.ts", (
+            "export const requireAuth = async (\n"
+            "  req: Request,\n"
+            "  res: Response,\n"
+            "  next: NextFunction\n"
+            ") => {\n"
+            "  if (!req.user) { return next(); }\n"
+            "};\n"
+            "export const getFiles = async (owner: string,\n"
+            "  repo: string): Promise<string[]> => {\n"
+            "  return [];\n"
+            "};\n"
+            "const total = (a + b) * 2;\n"
+        ))
+        self.assertEqual(self.labels(result, "function"), ["requireAuth", "getFiles"])
+        nodes = {n["label"]: n for n in result["nodes"]}
+        self.assertEqual(nodes["requireAuth"]["complexity"], 2)
+
+    def test_java_constructors_and_methods(self):
+        result = self.parse("Svc.java", (
+            "package shop;\n"
+            "import java.util.List;\n"
+            "public class Svc {\n"
+            "    private final Repo repo;\n"
+            "    public Svc(Repo r) {\n"
+            "        this.repo = r;\n"
+            "    }\n"
+            "    @Override\n"
+            "    public List<String> names() {\n"
+            "        return repo.all();\n"
+            "    }\n"
+            "    static <T> T first(List<T> items) { return items.get(0); }\n"
+            "}\n"
+            "class Helper {\n"
+            "    Helper() { }\n"
+            "}\n"
+        ))
+        ids = [n["id"] for n in result["nodes"]]
+        self.assertEqual(ids, [
+            "Svc.java::Svc", "Svc.java::Svc.Svc", "Svc.java::names", "Svc.java::first",
+            "Svc.java::Helper", "Svc.java::Helper.Helper",
+        ])
+        self.assertEqual(self.imports(result), ["List.java"])
+
+    def test_go_and_cpp(self):
+        go = self.parse("main.go", (
+            "package main\n"
+            "import (\n"
+            "    \"fmt\"\n"
+            "    str \"strings\"\n"
+            ")\n"
+            "type Server struct {\n"
+            "}\n"
+            "func (s *Server) Run() error {\n"
+            "    return nil\n"
+            "}\n"
+            "func main() {\n"
+            "    fmt.Println(str.ToUpper(\"x\"))\n"
+            "}\n"
+        ))
+        self.assertEqual(self.labels(go), ["Server", "Run", "main"])
+        self.assertEqual(self.imports(go), ["fmt.go", "strings.go"])
+
+        cpp = self.parse("engine.cpp", (
+            "#include <vector>\n"
+            "#include \"engine.h\"\n"
+            "class Engine : public Base {\n"
+            "};\n"
+            "int Engine::start(int n) {\n"
+            "    return helper(n);\n"
+            "}\n"
+            "static void helper(int n) {\n"
+            "    if (n) { return; }\n"
+            "}\n"
+        ))
+        self.assertEqual(self.labels(cpp), ["Engine", "start", "helper"])
+        self.assertEqual(self.imports(cpp), ["vector.cpp", "h.cpp"])
+
+    def test_branch_tokens_on_definition_like_lines(self):
+        # "if (a && b) {"는 메서드 패턴에도 걸리지만 정의가 아니며, if와 &&가 모두 분기로 집계됨
+        result = self.parse("guard.js", (
+            "function check(a, b) {\n"
+            "  if (a && b) {\n"
+            "    return a || b;\n"
+            "  }\n"
+            "}\n"
+            "function plain() {\n"
+            "  return 1;\n"
+            "}\n"
+        ))
+        nodes = {n["label"]: n for n in result["nodes"]}
+        self.assertEqual(list(nodes), ["check", "plain"])
+        self.assertEqual(nodes["check"]["complexity"], 4)  # 1 + if + && + ||
+        self.assertEqual(nodes["plain"]["complexity"], 1)
+        self.assertEqual(result["complexity"], 4)
+
+        branchless = self.parse("const.js", "export const X = 1;\n")
+        self.assertEqual(branchless["complexity"], 1)
+
+
+
+class TestTreeSitterLanguages(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, rel, code):
+        path = os.path.join(self.tmp.name, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(code)
+        return path
+
+    def test_registry_extensions_reach_analyzer(self):
+        self.write("ui/App.jsx", "export default function App(props) {\n  return null;\n}\n")
+        self.write("core/lib.rs", "pub struct Engine {}\nfn start(e: &Engine) -> i32 {\n    0\n}\n")
+        graph = StructuralAnalyzer().analyze_repository(self.tmp.name)
+
+        # .jsx는 문법이 없어도 JS 정규식 규칙으로 분석
+        self.assertIn("ui/App.jsx::App", graph)
+        self.assertEqual(graph.node("ui/App.jsx").language, "JavaScript")
+        # 정규식 규칙이 없는 언어는 문법을 불러올 수 있을 때만 분석 대상
+        if get_language(".rs") is not None:
+            self.assertIn("core/lib.rs::start", graph)
+            self.assertEqual(graph.node("core/lib.rs").language, "rust")
+        else:
+            self.assertNotIn("core/lib.rs", graph)
+
+    @unittest.skipUnless(get_language(".rs") is not None, "tree-sitter rust grammar not installed")
+    def test_rust(self):
+        path = self.write("lib.rs", (
+            "use std::collections::HashMap;\n"
+            "pub struct Engine { n: i32 }\n"
+            "trait Run { fn run(&self); }\n"
+            "fn start(e: &Engine) -> i32 {\n"
+            "    if e.n > 0 && e.n < 9 { 1 } else { 0 }\n"
+            "}\n"
+        ))
+        result = TreeSitterParser(path).parse("lib.rs")
+        labels = {n["label"]: n for n in result["nodes"]}
+        self.assertTrue({"Engine", "Run", "start"} <= set(labels))
+        self.assertEqual(labels["start"]["complexity"], 3)
+        self.assertEqual(labels["start"]["language"], "rust")
+
+    @unittest.skipUnless(get_language(".c") is not None, "tree-sitter c grammar not installed")
+    def test_c(self):
+        path = self.write("main.c", (
+            "#include <stdio.h>\n"
+            "struct point { int x; };\n"
+            "static int *find(int n) {\n"
+            "    for (int i = 0; i < n; i++) { if (i) return 0; }\n"
+            "    return 0;\n"
+            "}\n"
+        ))
+        result = TreeSitterParser(path).parse("main.c")
+        labels = {n["label"]: n for n in result["nodes"]}
+        self.assertTrue({"point", "find"} <= set(labels))
+        self.assertEqual(labels["find"]["complexity"], 3)
+        self.assertIn("h.c", [e["target"] for e in result["edges"] if e["relation"] == "imports"])
+
+    @unittest.skipUnless(get_language(".cs") is not None, "tree-sitter c# grammar not installed")
+    def test_csharp(self):
+        path = self.write("Svc.cs", (
+            "using System.Linq;\n"
+            "public class Svc {\n"
+            "    public Svc() { }\n"
+            "    public int Count(int[] xs) { return xs.Count(); }\n"
+            "}\n"
+        ))
+        result = TreeSitterParser(path).parse("Svc.cs")
+        ids = [n["id"] for n in result["nodes"]]
+        self.assertEqual(ids, ["Svc.cs::Svc", "Svc.cs::Svc.Svc", "Svc.cs::Count"])
+
+
+if __name__ == '__main__':
+    unittest.main()
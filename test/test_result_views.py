@@ -0,0 +1,62 @@
+import sys
+import os
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent.result_views import (
+    InvalidCursor, edges_for_nodes, etag_matches, filter_nodes, make_etag, paginate
+)
+
+GRAPH = {
+    "nodes": [
+        {"id": "ROOT", "type": "directory"},
+        {"id": "agent", "type": "directory"},
+        {"id": "agent/main.py", "type": "file"},
+        {"id": "agent/main.py::get_result", "type": "function"},
+        {"id": "agents/other.py", "type": "file"},
+    ],
+    "edges": [
+        {"source": "agent/main.py", "target": "agent/main.py::get_result", "type": "defines"},
+        {"source": "agent/main.py", "target": "agents/other.py", "type": "imports"},
+        {"source": "ROOT", "target": "agent", "type": "structure"},
+    ],
+}
+
+
+class TestResultViews(unittest.TestCase):
+    def test_filter_nodes_by_directory_and_type(self):
+        ids = [n["id"] for n in filter_nodes(GRAPH, directory="agent/")]
+        self.assertEqual(ids, ["agent", "agent/main.py", "agent/main.py::get_result"])  # "agents/"는 제외
+        ids = [n["id"] for n in filter_nodes(GRAPH, directory="agent", node_type="function")]
+        self.assertEqual(ids, ["agent/main.py::get_result"])
+
+    def test_edges_for_node_set(self):
+        self.assertEqual(len(edges_for_nodes(GRAPH, ["agent/main.py"])), 2)
+        self.assertEqual(len(edges_for_nodes(GRAPH, ["agent/main.py"], both_ends=True)), 0)
+        self.assertEqual(len(edges_for_nodes(GRAPH, relation="structure")), 1)
+
+    def test_cursor_pagination(self):
+        items = list(range(7))
+        page = paginate(items, limit=3)
+        self.assertEqual(page["items"], [0, 1, 2])
+        self.assertEqual(page["total"], 7)
+        collected = list(page["items"])
+        while page["next_cursor"]:
+            page = paginate(items, page["next_cursor"], limit=3)
+            collected += page["items"]
+        self.assertEqual(collected, items)
+        with self.assertRaises(InvalidCursor):
+            paginate(items, "not-a-cursor")
+
+    def test_etag(self):
+        etag = make_etag("run", "completed", "2025-01-01", "/result/run/nodes", [("type", "file")])
+        self.assertTrue(etag_matches(f'"x", {etag}', etag))
+        self.assertTrue(etag_matches(f"W/{etag}", etag))
+        self.assertFalse(etag_matches(None, etag))
+        self.assertNotEqual(etag, make_etag("run", "completed", "2025-01-02", "/result/run/nodes", [("type", "file")]))
+
+
+if __name__ == '__main__':
+    unittest.main()
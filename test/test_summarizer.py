@@ -0,0 +1,50 @@
+import sys
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Mock dotenv / HF client before importing config-dependent modules
+sys.modules.setdefault('dotenv', MagicMock())
+sys.modules.setdefault('huggingface_hub', MagicMock())
+
+from mcp.summarization.cache import SummaryCache
+from mcp.summarization.summarizer import CodeSummarizer
+
+
+class TestEnsembleCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.summarizer = CodeSummarizer()
+        self.summarizer.cache = SummaryCache(os.path.join(self.tmp.name, "summaries.sqlite"))
+        self.calls = []
+
+        def fake_summary(code, model_id, prompt_type="general"):
+            self.calls.append((model_id, prompt_type))
+            return f"{prompt_type} summary by {model_id}"
+
+        self.summarizer.summarize_code_local = lambda code: "logic summary"
+        self.summarizer._generate_summary = fake_summary
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_cache_key_covers_every_expert_model(self):
+        first = self.summarizer._generate_ensemble_summary("def f():\n    return 1\n", "a.py")
+        again = self.summarizer._generate_ensemble_summary("def f():\n    return 1\n", "b.py")
+        self.assertEqual(len(self.calls), 2)  # 두 번째 호출은 캐시 적중
+        self.assertEqual(again["code_id"], "b.py")
+        self.assertEqual(again["unified_summary"], first["unified_summary"])
+
+        # 구조 모델이 아닌 모델만 바뀌어도 이전 앙상블 결과를 쓰지 않음
+        self.summarizer.model_intent = "other/intent-model"
+        changed = self.summarizer._generate_ensemble_summary("def f():\n    return 1\n", "a.py")
+        self.assertEqual(len(self.calls), 4)
+        self.assertIn("other/intent-model", changed["expert_views"]["intent"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -95,5 +95,16 @@ class TestTaskRecommender(unittest.TestCase):
                 # Verify confidence is preserved (if we kept it in output, but currently we don't strictly need to assert it in final output unless we added it)
                 # The key is that others are gone.
 
+    def test_empty_implementation_uses_branchless_complexity(self):
+        # 복잡도는 1 + 분기 수: 분기 없는 짧은 파일(complexity 1)이 최소 구현으로 잡혀야 함
+        analysis = {"graph": {"nodes": [
+            {"id": "stub.py", "complexity": 1, "loc": 3, "summary_text": "stub"},
+            {"id": "branchy.py", "complexity": 2, "loc": 3, "summary_text": "branchy"},
+            {"id": "long.py", "complexity": 1, "loc": 40, "summary_text": "long"},
+        ], "edges": []}}
+        recs = self.recommender._get_rule_based_recommendations(analysis)
+        empty = [r["target"] for r in recs if r["type"] == "empty_implementation"]
+        self.assertEqual(empty, ["stub.py"])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,93 @@
+import sys
+import os
+import threading
+import unittest
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared import tree_sitter_utils
+from shared.tree_sitter_utils import get_language, get_parser, parse_code, linearize_tree
+
+
+class FakeNode:
+    def __init__(self, type, children=(), text=b"", is_named=True):
+        self.type = type
+        self.children = list(children)
+        self.text = text
+        self.is_named = is_named
+
+
+class TestTreeSitterRegistry(unittest.TestCase):
+    def test_unknown_extension(self):
+        self.assertIsNone(get_language(".unknown"))
+        self.assertIsNone(get_parser(".unknown"))
+        self.assertIsNone(parse_code("x", ".unknown"))
+
+    @unittest.skipUnless(get_language(".js") is not None, "tree-sitter grammar not installed")
+    def test_language_and_parser_reuse(self):
+        self.assertIs(get_language(".js"), get_language(".mjs"))
+        parser = get_parser(".js")
+        self.assertIs(parser, get_parser(".js"))
+
+        other = []
+        t = threading.Thread(target=lambda: other.append(get_parser(".js")))
+        t.start()
+        t.join()
+        self.assertIsNot(parser, other[0])
+
+        tree = parse_code("function f() { return 1; }", ".js")
+        self.assertEqual(tree.root_node.type, "program")
+
+
+class LegacyParser:
+    """tree-sitter < 0.22: 생성자 인자를 무시하고 set_language로만 언어를 지정"""
+
+    def __init__(self, *args):
+        self.assigned = None
+
+    def set_language(self, language):
+        self.assigned = language
+
+
+class ModernParser:
+    """tree-sitter >= 0.22: set_language 없이 language 속성 사용"""
+
+    def __init__(self, language=None):
+        self.language = language
+
+
+class TestParserConstruction(unittest.TestCase):
+    def test_legacy_binding_uses_set_language(self):
+        with patch.object(tree_sitter_utils, "Parser", LegacyParser):
+            parser = tree_sitter_utils._new_parser("js-language")
+        self.assertEqual(parser.assigned, "js-language")
+
+    def test_modern_binding_sets_language_attribute(self):
+        with patch.object(tree_sitter_utils, "Parser", ModernParser):
+            parser = tree_sitter_utils._new_parser("js-language")
+        self.assertEqual(parser.language, "js-language")
+
+
+class TestLinearizeTree(unittest.TestCase):
+    def test_format_and_filters(self):
+        tree = FakeNode("module", [
+            FakeNode("comment", text=b"# note"),
+            FakeNode("call", [FakeNode("identifier", text=b"f"), FakeNode("(", text=b"(", is_named=False)]),
+        ])
+        self.assertEqual(linearize_tree(tree), "(module (call f ())")
+        self.assertEqual(linearize_tree(tree, named_only=True), "(module (call f))")
+        self.assertEqual(linearize_tree(tree, skip_types=()), "(module # note (call f ())")
+
+    def test_budget_and_deep_tree(self):
+        node = FakeNode("leaf", text=b"x")
+        for _ in range(5000):  # 재귀 구현이면 RecursionError
+            node = FakeNode("block", [node])
+        out = linearize_tree(node, max_chars=64)
+        self.assertEqual(len(out), 64)
+        self.assertTrue(out.startswith("(block (block"))
+
+
+if __name__ == '__main__':
+    unittest.main()